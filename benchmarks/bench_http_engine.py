@@ -0,0 +1,59 @@
+"""
+Benchmark silnika HTTP na lokalnym serwerze z nagranymi stronami eKW.
+
+Uruchamia ekw_standin_server w tle i pobiera --count KW (numery nagranych
+ksiąg powtarzane w kółko) przy zadanej współbieżności.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarks/bench_http_engine.py nagrania/ --count 2000 --concurrency 300 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from ekw_standin_server import serve, SECTION_FILES  # noqa: E402
+from src.core.scraping.http_scraper import HttpScrapingEngine  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", type=Path)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    recorded = sorted(p.name.replace(".", "/") for p in args.recordings.iterdir() if p.is_dir())
+    if not recorded:
+        sys.exit("Brak nagranych KW w katalogu")
+
+    server = serve(args.recordings, latency=args.latency)
+    engine = HttpScrapingEngine(
+        base_url=server.base_url,
+        max_connections=args.concurrency,
+        max_concurrency=args.concurrency
+    )
+    sections = {file.removesuffix(".html"): label for label, file in SECTION_FILES.items()}
+    kw_numbers = list(itertools.islice(itertools.cycle(recorded), args.count))
+
+    start = time.perf_counter()
+    results = asyncio.run_coroutine_threadsafe(
+        engine.scrape_many(kw_numbers, sections), engine._ensure_loop()
+    ).result()
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in results if isinstance(r, Exception))
+    print(f"{args.count} KW w {elapsed:.2f} s - {args.count / elapsed:.1f} KW/s, błędów: {failed}")
+    engine.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark parsowania treści KW: osobny BeautifulSoup dla każdego ekstraktora
+vs jedno drzewo strony we wspólnym backendzie (selectolax, lxml, bs4).
+
+Stary sposób: każda metoda LandRegisterParser (podstawowe informacje i pięć
+działów) budowała własny BeautifulSoup(html, "html.parser"). Nowy: strona
+jest parsowana raz, a ekstraktory odpytują to samo drzewo. Dla porównania
+także parsowanie strumieniowe (stream_parser) - bez drzewa strony.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarks/bench_parser.py --entries 500 --repeat 5
+    python benchmarks/bench_parser.py --file zapisana_strona.html
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from ekw_sample_pages import sample_page, SECTION_TITLES  # noqa: E402
+from src.core.scraping.html_backends import available_backends, parse_html  # noqa: E402
+from src.core.scraping.stream_parser import iter_events  # noqa: E402
+
+
+def parse_old(html: str):
+    """Stary sposób - osobne drzewo dla podstawowych informacji i każdego działu"""
+    soup = BeautifulSoup(html, "html.parser")
+    basic = [e.get_text(strip=True) for e in soup.find_all("div", class_="left")]
+    sections = []
+    for _ in SECTION_TITLES:
+        soup = BeautifulSoup(html, "html.parser")
+        sections.append([
+            [cell.get_text(strip=True) for cell in row.find_all("td", recursive=False)]
+            for row in soup.find_all("tr")
+        ])
+    return basic, sections
+
+
+def parse_new(html: str, backend: str):
+    """Nowy sposób - jedno drzewo, wszystkie ekstraktory na nim"""
+    page = parse_html(html, backend)
+    basic = page.texts("div", "left")
+    rows = page.rows()
+    return basic, [rows for _ in SECTION_TITLES]
+
+
+def parse_stream(html: str, backend: str):
+    """Parsowanie strumieniowe - zdarzenia w trakcie czytania, bez drzewa"""
+    basic, rows = [], []
+    for kind, value in iter_events(html, backend=backend):
+        (rows if kind == "row" else basic).append(value)
+    return basic, [rows for _ in SECTION_TITLES]
+
+
+def measure(label: str, function, repeat: int, baseline: float = None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    speedup = f"  x{baseline / best:.1f}" if baseline else ""
+    print(f"{label:<24} {best * 1000:9.1f} ms{speedup}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=500, help="liczba wpisów w każdym dziale")
+    parser.add_argument("--file", type=Path, help="zapisana strona zamiast strony syntetycznej")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    html = args.file.read_text(encoding="utf-8") if args.file else sample_page(args.entries)
+    print(f"Strona: {len(html) / 1024 / 1024:.2f} MB, backendy: {', '.join(available_backends())}")
+
+    baseline = measure("bs4 x6 (stary)", lambda: parse_old(html), args.repeat)
+    expected = parse_new(html, "bs4")
+    for backend in available_backends():
+        if parse_new(html, backend) != expected:
+            print(f"{backend}: wynik różni się od bs4!")
+        measure(f"{backend} x1", lambda: parse_new(html, backend), args.repeat, baseline)
+    stream_backends = ("lxml", "html.parser") if "lxml" in available_backends() else ("html.parser",)
+    for backend in stream_backends:
+        if parse_stream(html, backend) != expected:
+            print(f"strumień {backend}: wynik różni się od bs4!")
+        measure(f"strumień {backend}", lambda: parse_stream(html, backend), args.repeat, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark pamięci paczki rekordów KW: zagnieżdżone słowniki vs krotki (records.py).
+
+Paczka składa się z rekordów sparsowanych z syntetycznej strony - każdy ma
+podstawowe informacje i po `--entries` wpisów w każdym dziale. Teksty są
+kopiowane dla każdego rekordu, jak przy parsowaniu osobnych stron.
+Mierzona jest pamięć zajęta przez paczkę (tracemalloc) i czas konwersji
+do wierszy CSV oraz do układu kolumnowego.
+
+Paczka jest budowana i mierzona po `--chunk` rekordów, a wyniki części są
+sumowane - milion rekordów w słownikach nie mieści się w pamięci zwykłej
+maszyny, a pamięć paczki rośnie liniowo z liczbą rekordów. --chunk 0 buduje
+całą paczkę naraz.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarks/bench_records.py --records 1000000
+    python benchmarks/bench_records.py --records 100000 --entries 5 --chunk 0
+"""
+
+import argparse
+from collections import defaultdict
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from ekw_sample_pages import sample_page  # noqa: E402
+from src.core.scraping.data_parser import LandRegisterParser  # noqa: E402
+from src.core.scraping.records import KWRecord, RecordBatch  # noqa: E402
+from src.core.scraping.section_parser import SECTION_KEYS  # noqa: E402
+
+
+def _copy(value):
+    """Kopia danych z osobnymi obiektami tekstów (jak po parsowaniu osobnej strony)"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, str):
+        return "".join(list(value)) if len(value) > 1 else value
+    return value
+
+
+def build_dicts(template, first, count):
+    return [{"kw": f"WA1M/{i:08d}/1", **_copy(template)} for i in range(first, first + count)]
+
+
+def build_records(template, first, count):
+    return RecordBatch(KWRecord.from_data(f"WA1M/{i:08d}/1", _copy(template)) for i in range(first, first + count))
+
+
+def measure_memory(build):
+    """Zwraca zbudowaną część paczki, zajętą przez nią pamięć i czas budowy"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    batch = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return batch, size, elapsed
+
+
+def measure_time(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000, help="liczba rekordów KW w paczce")
+    parser.add_argument("--entries", type=int, default=1, help="liczba wpisów w każdym dziale rekordu")
+    parser.add_argument("--chunk", type=int, default=100_000, help="rekordów w mierzonej części paczki (0 - cała naraz)")
+    args = parser.parse_args()
+
+    page = LandRegisterParser.parse_page(sample_page(args.entries))
+    template = LandRegisterParser.parse_document(page, SECTION_KEYS)
+    chunk = args.chunk or args.records
+    print(f"Paczka: {args.records} rekordów, {args.entries} wpisów w każdym dziale, części po {chunk}")
+
+    sizes = defaultdict(int)
+    times = defaultdict(float)
+    for first in range(0, args.records, chunk):
+        count = min(chunk, args.records - first)
+
+        dicts, size, elapsed = measure_memory(lambda: build_dicts(template, first, count))
+        del dicts
+        sizes["słowniki"] += size
+        times["słowniki"] += elapsed
+
+        records, size, elapsed = measure_memory(lambda: build_records(template, first, count))
+        sizes["krotki (RecordBatch)"] += size
+        times["krotki (RecordBatch)"] += elapsed
+
+        times["wiersze CSV"] += measure_time(records.entry_rows)
+        times["kolumny wpisów"] += measure_time(records.entry_columns)
+        times["kolumny basic_info"] += measure_time(records.basic_info_columns)
+        del records
+
+    for label, size in sizes.items():
+        print(f"{label:<22} {size / 1024 / 1024:9.1f} MB  (budowa {times[label]:.1f}s)")
+    print(f"Oszczędność pamięci: x{sizes['słowniki'] / sizes['krotki (RecordBatch)']:.1f}")
+    for label in ("wiersze CSV", "kolumny wpisów", "kolumny basic_info"):
+        print(f"{label:<22} {times[label]:9.2f} s")
+
+
+if __name__ == "__main__":
+    main()
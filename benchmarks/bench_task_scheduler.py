@@ -0,0 +1,92 @@
+"""
+Benchmark przydziału zadań: przypinanie KW do agentów vs wspólna kolejka.
+
+Symulacja zdarzeń dyskretnych - czasy obsługi KW losowane z rozkładu
+log-normalnego (duża zmienność: większość KW trwa kilka sekund, część
+kilkadziesiąt), a część agentów jest wolniejsza (np. wolne proxy).
+Wszystkie zadania trafiają do kolejki w chwili 0, a opóźnienie zadania
+to czas od dodania do zakończenia.
+
+Uruchomienie:
+    python benchmarks/bench_task_scheduler.py --tasks 100000 --agents 16
+"""
+
+import argparse
+import heapq
+import random
+import statistics
+
+
+def service_times(count: int, seed: int, sigma: float):
+    """Losuje czasy obsługi (w sekundach) dla kolejnych KW"""
+    rng = random.Random(seed)
+    return [rng.lognormvariate(1.0, sigma) for _ in range(count)]
+
+
+def agent_speeds(agents: int, slow_fraction: float, slowdown: float):
+    """Mnożniki czasu obsługi dla agentów - część agentów jest wolniejsza"""
+    slow = int(agents * slow_fraction)
+    return [slowdown] * slow + [1.0] * (agents - slow)
+
+
+def simulate_pinned(times, speeds):
+    """Stary przydział: KW przypięte do agenta z najkrótszą listą zadań (round-robin)"""
+    agents = len(speeds)
+    clocks = [0.0] * agents
+    latencies = []
+    for i, t in enumerate(times):
+        agent = i % agents
+        clocks[agent] += t * speeds[agent]
+        latencies.append(clocks[agent])
+    return latencies
+
+
+def simulate_shared(times, speeds):
+    """Wspólna kolejka: kolejne KW pobiera pierwszy wolny agent"""
+    free_at = [(0.0, agent) for agent in range(len(speeds))]
+    heapq.heapify(free_at)
+    latencies = []
+    for t in times:
+        start, agent = heapq.heappop(free_at)
+        end = start + t * speeds[agent]
+        latencies.append(end)
+        heapq.heappush(free_at, (end, agent))
+    return latencies
+
+
+def percentile(sorted_values, p: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def report(name: str, latencies):
+    values = sorted(latencies)
+    hours = 3600.0
+    print(
+        f"{name:<10} p50={percentile(values, 50) / hours:8.2f} h  "
+        f"p95={percentile(values, 95) / hours:8.2f} h  "
+        f"p99={percentile(values, 99) / hours:8.2f} h  "
+        f"max={values[-1] / hours:8.2f} h  "
+        f"avg={statistics.fmean(values) / hours:8.2f} h"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--agents", type=int, default=16)
+    parser.add_argument("--sigma", type=float, default=1.2, help="zmienność czasów obsługi")
+    parser.add_argument("--slow-fraction", type=float, default=0.25, help="odsetek wolnych agentów")
+    parser.add_argument("--slowdown", type=float, default=3.0, help="ile razy wolniejsi są wolni agenci")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    times = service_times(args.tasks, args.seed, args.sigma)
+    speeds = agent_speeds(args.agents, args.slow_fraction, args.slowdown)
+    print(f"{args.tasks} KW, {args.agents} agentów, średni czas KW {statistics.fmean(times):.2f} s")
+    report("przypięte", simulate_pinned(times, speeds))
+    report("wspólna", simulate_shared(times, speeds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Generator syntetycznych stron treści KW do benchmarków parsowania.
+
+Układ naśladuje wydruk treści księgi z eKW: nagłówek z polami div.left,
+a dalej działy jako tabele - wiersz tytułu działu, wiersze rubryk
+i podrubryk oraz wiersze pól (numer pola, nazwa pola, treść pola).
+Wielkość strony zależy od liczby wpisów w każdym dziale, co pozwala
+odtworzyć strony treści zupełnej ksiąg z długą historią.
+"""
+
+import random
+
+SECTION_TITLES = {
+    "dzial_1o": "DZIAŁ I-O - OZNACZENIE NIERUCHOMOŚCI",
+    "dzial_1s": "DZIAŁ I-SP - SPIS PRAW ZWIĄZANYCH Z WŁASNOŚCIĄ",
+    "dzial_2": "DZIAŁ II - WŁASNOŚĆ",
+    "dzial_3": "DZIAŁ III - PRAWA, ROSZCZENIA I OGRANICZENIA",
+    "dzial_4": "DZIAŁ IV - HIPOTEKA",
+}
+
+# Podrubryka i pola jednego wpisu w każdym dziale
+SECTION_ENTRIES = {
+    "dzial_1o": ("Podrubryka 1.4.1 - Działka ewidencyjna", [
+        ("Identyfikator działki", lambda r, i: f"146501_1.{r.randint(1, 99):04d}.{i}/{r.randint(1, 9)}"),
+        ("Numer działki", lambda r, i: f"{i}/{r.randint(1, 9)}"),
+        ("Obręb ewidencyjny", lambda r, i: f"{r.randint(1, 99):04d}, Śródmieście"),
+        ("Położenie", lambda r, i: "WOJ. MAZOWIECKIE, POW. WARSZAWA, GM. WARSZAWA"),
+        ("Sposób korzystania", lambda r, i: r.choice(["B - TERENY MIESZKANIOWE", "R - GRUNTY ORNE"])),
+        ("Obszar", lambda r, i: f"{r.randint(1, 9)},{r.randint(0, 9999):04d} HA"),
+    ]),
+    "dzial_1s": ("Rubryka 1.1 - Wzmianki w dziale I-Sp", [
+        ("Rodzaj prawa", lambda r, i: "UDZIAŁ W NIERUCHOMOŚCI WSPÓLNEJ"),
+        ("Treść prawa", lambda r, i: f"UDZIAŁ WYNOSZĄCY {r.randint(1, 999)}/10000 CZĘŚCI"),
+        ("Numer księgi", lambda r, i: f"WA1M/{r.randint(0, 99999999):08d}/{r.randint(0, 9)}"),
+    ]),
+    "dzial_2": ("Podrubryka 2.2.5 - Osoba fizyczna", [
+        ("Lista wskazań udziałów w prawie", lambda r, i: f"{i}"),
+        ("Imię pierwsze", lambda r, i: r.choice(["JAN", "ANNA", "PIOTR", "MARIA"])),
+        ("Imię drugie", lambda r, i: "---"),
+        ("Nazwisko / pierwszy człon nazwiska złożonego", lambda r, i: r.choice(["KOWALSKI", "NOWAK"])),
+        ("Imię ojca", lambda r, i: "JAN"),
+        ("Imię matki", lambda r, i: "ANNA"),
+        ("PESEL", lambda r, i: f"{r.randint(0, 99999999999):011d}"),
+    ]),
+    "dzial_3": ("Podrubryka 3.1.1 - Wpis", [
+        ("Numer wpisu", lambda r, i: f"{i}"),
+        ("Rodzaj wpisu", lambda r, i: r.choice(["OGRANICZONE PRAWO RZECZOWE", "ROSZCZENIE"])),
+        ("Treść wpisu", lambda r, i: "SŁUŻEBNOŚĆ PRZESYŁU NA RZECZ " + "X" * r.randint(20, 200)),
+    ]),
+    "dzial_4": ("Podrubryka 4.4.1 - Hipoteka", [
+        ("Numer hipoteki", lambda r, i: f"{i}"),
+        ("Rodzaj hipoteki", lambda r, i: r.choice(["HIPOTEKA UMOWNA", "HIPOTEKA UMOWNA KAUCYJNA"])),
+        ("Suma", lambda r, i: f"{r.randint(10, 999)} {r.randint(0, 999):03d},00"),
+        ("Waluta", lambda r, i: "PLN"),
+        ("Wierzytelność", lambda r, i: "KREDYT HIPOTECZNY"),
+    ]),
+}
+
+
+def sample_page(entries: int = 100, seed: int = 1) -> str:
+    """Zwraca stronę treści z `entries` wpisami w każdym dziale"""
+    rng = random.Random(seed)
+    parts = ["<html><head><title>Treść księgi</title></head><body>"]
+    for value in ("WA1M/00012345/6", "NIERUCHOMOŚĆ GRUNTOWA", "WARSZAWA", "2005-01-01", "---", "WARSZAWA", "JAN KOWALSKI"):
+        parts.append(f'<div class="left">{value}</div>')
+
+    for key, title in SECTION_TITLES.items():
+        header, fields = SECTION_ENTRIES[key]
+        parts.append(f'<table class="tbOdpis"><tr><td class="csTTytul" colspan="3">{title}</td></tr>')
+        for i in range(1, entries + 1):
+            parts.append(f'<tr><td class="csTTytul" colspan="3">{header}</td></tr>')
+            for number, (label, value) in enumerate(fields, 1):
+                parts.append(
+                    f'<tr><td class="csBDane">{number}.</td><td class="csBDane">{label}</td>'
+                    f'<td class="csDane">{value(rng, i)}</td></tr>'
+                )
+        parts.append("</table>")
+
+    parts.append("</body></html>")
+    return "\n".join(parts)
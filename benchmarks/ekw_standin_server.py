@@ -0,0 +1,142 @@
+"""
+Lokalny serwer zastępujący przeglądarkę eKW - serwuje nagrane strony.
+
+Pozwala uruchamiać silnik HTTP (engine = "http", http_base_url wskazujący
+na ten serwer) bez dostępu do prawdziwej strony. Katalog z nagraniami:
+
+    wyszukiwanie.html                 strona z formularzem wyszukiwania
+    <KOD>.<NUMER>.<CYFRA>/wynik.html  wynik wyszukiwania danej KW
+    <KOD>.<NUMER>.<CYFRA>/tresc.html  treść księgi (po przycisku wydruku)
+    <KOD>.<NUMER>.<CYFRA>/dzial_1o.html, dzial_1s.html, dzial_2.html, ...
+
+Stan (która KW jest wyszukiwana) trzymany jest w sesji po ciasteczku, tak
+jak na prawdziwej stronie. KW bez nagrania dostaje stronę wyszukiwania
+z powrotem, czyli brak przycisków wydruku - "Treść niedostępna".
+
+Uruchomienie:
+    python benchmarks/ekw_standin_server.py nagrania/ --port 8765 --latency 0.05
+"""
+
+import argparse
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+SECTION_FILES = {
+    "Dział I-O": "dzial_1o.html",
+    "Dział I-Sp": "dzial_1s.html",
+    "Dział II": "dzial_2.html",
+    "Dział III": "dzial_3.html",
+    "Dział IV": "dzial_4.html",
+}
+
+COURT_PATTERN = re.compile(r"^[A-Z0-9]{4}$")
+NUMBER_PATTERN = re.compile(r"^\d{8}$")
+CONTROL_PATTERN = re.compile(r"^\d$")
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serwer HTTP z nagranymi stronami eKW"""
+
+    daemon_threads = True
+
+    def __init__(self, address, recordings: Path, latency: float = 0.0):
+        super().__init__(address, StandInHandler)
+        self.recordings = Path(recordings)
+        self.latency = latency
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/eukw_prz/KsiegiWieczyste/wyszukiwanieKW"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _session_id(self) -> str:
+        cookie = self.headers.get("Cookie", "")
+        match = re.search(r"JSESSIONID=([\w-]+)", cookie)
+        return match.group(1) if match else ""
+
+    def _send(self, path: Path, session_id: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", f"JSESSIONID={session_id}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        session_id = str(uuid.uuid4())
+        self._send(self.server.recordings / "wyszukiwanie.html", session_id)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        fields = parse_qsl(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+        values = [value for _, value in fields]
+        session_id = self._session_id() or str(uuid.uuid4())
+
+        court = next((v for v in values if COURT_PATTERN.match(v)), None)
+        number = next((v for v in values if NUMBER_PATTERN.match(v)), None)
+        control = next((v for v in values if CONTROL_PATTERN.match(v)), None)
+
+        with self.server.sessions_lock:
+            if court and number and control:
+                self.server.sessions[session_id] = f"{court}.{number}.{control}"
+            kw_dir = self.server.sessions.get(session_id)
+
+        target = None
+        if kw_dir:
+            kw_path = self.server.recordings / kw_dir
+            section = next((SECTION_FILES[v] for v in values if v in SECTION_FILES), None)
+            if section:
+                target = kw_path / section
+            elif any(name.startswith("przyciskWydruk") for name, _ in fields):
+                target = kw_path / "tresc.html"
+            else:
+                target = kw_path / "wynik.html"
+
+        if target is None or not target.exists():
+            target = self.server.recordings / "wyszukiwanie.html"
+
+        self._send(target, session_id)
+
+
+def serve(recordings: Path, port: int = 0, latency: float = 0.0) -> StandInServer:
+    """Uruchamia serwer w wątku tła i zwraca go (port 0 - dowolny wolny)"""
+    server = StandInServer(("127.0.0.1", port), recordings, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", type=Path, help="katalog z nagranymi stronami")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="sztuczne opóźnienie odpowiedzi (s)")
+    args = parser.parse_args()
+
+    server = StandInServer(("127.0.0.1", args.port), args.recordings, args.latency)
+    print(f"Serwer eKW: {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,12 @@ import json
 from pathlib import Path
 from typing import TextIO
 
+# Typ joba w dzienniku zadań dla zadań zapisanych przez write_unfinished_tasks
+LEGACY_JOB_TYPE = "unfinished_task"
+
+# Plik niezakończonych zadań - używany przy wyłączonym dzienniku zadań
+UNFINISHED_TASKS_PATH = Path(__file__).parent / "unfinished_tasks.json"
+
 def read_settings(logs: bool = False) -> dict:
     path = Path(__file__).parent / "download_config.json"
     jsonloaded = dict()
@@ -25,20 +31,77 @@ def write_settings(params: dict):
         json.dump(params, file, ensure_ascii=False, indent=1)
 
 def write_unfinished_tasks(tasks: dict):
-    path = Path(__file__).parent / "unfinished_tasks.json"
+    """
+    Zapisuje niezakończone zadania (listy) w dzienniku zadań
 
-    with open(path, "w", encoding="utf-8") as file:
-        json.dump(tasks, file, ensure_ascii=False, indent=1)
+    Zadania zapisane wcześniej tą funkcją i nieobecne w słowniku są
+    oznaczane jako zakończone. Joby WorkDistributor nie są zmieniane.
+    Przy wyłączonym dzienniku ("journal": false) zadania trafiają do pliku
+    unfinished_tasks.json.
+    """
+    if not _journal_enabled():
+        with open(UNFINISHED_TASKS_PATH, "w", encoding="utf-8") as file:
+            json.dump(tasks, file, ensure_ascii=False, indent=1)
+        return
+
+    from src.core.storage import get_task_journal
+
+    journal = get_task_journal()
+    tasks = {str(job_id): task for job_id, task in tasks.items()}
+    for job_id, job in journal.get_unfinished_jobs().items():
+        if _is_legacy_job(job) and job_id not in tasks:
+            journal.finish_job(job_id)
+
+    for job_id, task in tasks.items():
+        journal.save_job(job_id, _task_name(task), LEGACY_JOB_TYPE, task)
 
 def read_unfinished_tasks(logs=False):
-    path = Path(__file__).parent / "unfinished_tasks.json"
-    jsonloaded = dict()
+    """Zwraca niezakończone zadania (listy) zapisane przez write_unfinished_tasks"""
+    if _journal_enabled():
+        from src.core.storage import get_task_journal
 
-    with open(path, "r", encoding="utf-8") as file:
-        jsonloaded = json.load(file)
+        journal = get_task_journal()
+        _migrate_unfinished_tasks(journal)
+
+        jsonloaded = {
+            job_id: job["params"]
+            for job_id, job in journal.get_unfinished_jobs().items()
+            if _is_legacy_job(job)
+        }
+    elif UNFINISHED_TASKS_PATH.exists():
+        with open(UNFINISHED_TASKS_PATH, "r", encoding="utf-8") as file:
+            jsonloaded = json.load(file)
+    else:
+        jsonloaded = dict()
 
     if logs:
         for val in jsonloaded.values():
             print(f"{val}")
 
     return jsonloaded
+
+def _journal_enabled() -> bool:
+    """Czy dziennik zadań jest włączony (klucz "journal" w konfiguracji)"""
+    return bool(read_settings().get("journal", True))
+
+def _task_name(task: dict) -> str:
+    value = task.get("value")
+    return value.get("name", "") if isinstance(value, dict) else ""
+
+def _is_legacy_job(job: dict) -> bool:
+    """Czy job dziennika pochodzi z write_unfinished_tasks (także z migracji starszego zapisu)"""
+    return job.get("type") == LEGACY_JOB_TYPE or "ttask" in job.get("params", {})
+
+def _migrate_unfinished_tasks(journal):
+    """Przenosi zadania ze starego pliku unfinished_tasks.json do dziennika zadań"""
+    path = UNFINISHED_TASKS_PATH
+    if not path.exists():
+        return
+
+    with open(path, "r", encoding="utf-8") as file:
+        tasks = json.load(file)
+
+    for job_id, task in tasks.items():
+        journal.save_job(str(job_id), _task_name(task), LEGACY_JOB_TYPE, task)
+
+    path.rename(path.with_suffix(".json.migrated"))
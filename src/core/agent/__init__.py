@@ -2,6 +2,8 @@
 
 from .agent import ScrapingAgent, TaskResult
 from .agent_manager import AgentManager
+from .process_pool import ProcessAgentPool
+from .concurrency_controller import ConcurrencyController, ConcurrencySettings
 from .work_distributor import WorkDistributor
 
-__all__ = ['ScrapingAgent', 'TaskResult', 'AgentManager', 'WorkDistributor']
\ No newline at end of file
+__all__ = ['ScrapingAgent', 'TaskResult', 'AgentManager', 'ProcessAgentPool', 'ConcurrencyController', 'ConcurrencySettings', 'WorkDistributor']
\ No newline at end of file
@@ -2,11 +2,11 @@ from dataclasses import dataclass
 from typing import List, Optional, Dict
 from datetime import datetime
 import threading
-import queue
-import time
 
-from src.core.scraping import LandRegisterScraper, ScrapingResult
-from src.core.storage import StorageManager
+from .task_scheduler import TaskScheduler, ScheduledTask
+from .retry_policy import RetryPolicy
+from src.core.scraping import LandRegisterScraper, ScrapingResult, FailureType, KWRecord
+from src.core.storage import StorageManager, DeadLetterStore, TaskJournal, TaskState
 from src.utils import logger
 from src.config.config_manager import ConfigManager
 
@@ -20,109 +20,225 @@ class TaskResult:
     end_time: datetime
     error: Optional[str] = None
     files: List[str] = None
+    error_type: Optional[str] = None
+    attempt: int = 0
+    retry_delay: Optional[float] = None  # ustawione dla statusu RETRY
+    job_id: Optional[str] = None
+
+def record_task_result(journal: TaskJournal, task_result: TaskResult):
+    """Zapisuje w dzienniku stan KW wynikający z wyniku zadania"""
+    state = {
+        "SUCCESS": TaskState.DONE,
+        "RETRY": TaskState.RETRY,
+    }.get(task_result.status, TaskState.FAILED)
+    journal.record(
+        task_result.job_id, task_result.kw_number, state, task_result.attempt + 1,
+        task_result.error_type, task_result.error
+    )
 
 class ScrapingAgent:
     """
     Agent odpowiedzialny za wykonywanie zadań scrapingu
     """
 
-    def __init__(self, agent_id: str):
+    def __init__(
+        self,
+        agent_id: str,
+        scheduler: Optional[TaskScheduler] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        dead_letters: Optional[DeadLetterStore] = None,
+        journal: Optional[TaskJournal] = None
+    ):
         self.agent_id = agent_id
         self.config = ConfigManager()
         self.scraper = LandRegisterScraper()
         self.storage = StorageManager()
+        self.retry_policy = retry_policy or RetryPolicy.from_config(self.config)
+        self.dead_letters = dead_letters if dead_letters is not None else DeadLetterStore()
+        self.journal = journal  # dziennik stanów KW (None - bez zapisu)
 
-        self.task_queue = queue.Queue()
+        # Kolejka współdzielona z pozostałymi agentami (lub prywatna, gdy agent działa samodzielnie)
+        self.scheduler = scheduler or TaskScheduler()
         self.results = []
         self.is_running = False
         self.current_task = None
+        self.worker_thread = None
+
+        # Sygnały sterujące pętlą roboczą
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
 
         # Statystyki
         self.tasks_completed = 0
         self.tasks_failed = 0
+        self.tasks_retried = 0
         self.start_time = None
 
-    def add_task(self, task_id: str, kw_number: str):
+    def add_task(self, task_id: str, kw_number: str, job_id: Optional[str] = None):
         """Dodaje nowe zadanie do kolejki"""
-        self.task_queue.put((task_id, kw_number))
+        self.scheduler.put(task_id, kw_number, job_id)
         logger.log_info(f"Agent {self.agent_id}: Dodano zadanie {task_id} dla KW {kw_number}")
 
     def start(self):
         """Uruchamia agenta"""
-        if not self.is_running:
-            self.is_running = True
-            self.start_time = datetime.now()
-            self.worker_thread = threading.Thread(target=self._worker)
-            self.worker_thread.start()
-            logger.log_info(f"Agent {self.agent_id}: Uruchomiono")
+        if self.worker_thread and self.worker_thread.is_alive():
+            self.resume()
+            return
+
+        self._stop_event.clear()
+        self._resume_event.set()
+        self.is_running = True
+        self.start_time = datetime.now()
+        self.worker_thread = threading.Thread(target=self._worker, daemon=True)
+        self.worker_thread.start()
+        logger.log_info(f"Agent {self.agent_id}: Uruchomiono")
 
     def stop(self):
-        """Zatrzymuje agenta"""
+        """
+        Zatrzymuje agenta
+
+        Agent oczekujący na zadanie jest budzony natychmiast; jeśli przetwarza
+        KW, metoda czeka tylko na zakończenie bieżącego zadania.
+        """
         self.is_running = False
+        self._stop_event.set()
+        self._resume_event.set()
+        self.scheduler.interrupt()
         if self.worker_thread:
             self.worker_thread.join()
+            self.worker_thread = None
         self.scraper.close()
         logger.log_info(f"Agent {self.agent_id}: Zatrzymano")
 
     def pause(self):
-        """Wstrzymuje pracę agenta"""
+        """Wstrzymuje pracę agenta (bieżące zadanie zostanie dokończone)"""
         self.is_running = False
+        self._resume_event.clear()
+        self.scheduler.interrupt()
         logger.log_info(f"Agent {self.agent_id}: Wstrzymano")
 
     def resume(self):
         """Wznawia pracę agenta"""
-        self.start()
+        self.is_running = True
+        self._resume_event.set()
         logger.log_info(f"Agent {self.agent_id}: Wznowiono")
 
     def _worker(self):
         """Główna pętla robocza agenta"""
-        while self.is_running:
+        while not self._stop_event.is_set():
             try:
-                # Pobranie zadania z kolejki
-                if self.task_queue.empty():
-                    time.sleep(1)
+                # Pauza - czekamy na sygnał wznowienia lub zatrzymania
+                if not self._resume_event.is_set():
+                    self._resume_event.wait()
                     continue
 
-                task_id, kw_number = self.task_queue.get(timeout=1)
-                self.current_task = (task_id, kw_number)
-
-                start_time = datetime.now()
+                # Pobranie zadania ze wspólnej kolejki (blokuje do czasu pojawienia się zadania)
+                task = self.scheduler.get(cancelled=self._should_yield)
+                if task is None:
+                    continue
 
+                status = "FAILED"
                 try:
-                    # Wykonanie zadania
-                    result = self._process_task(kw_number)
-
-                    # Zapisanie wyniku
-                    task_result = TaskResult(
-                        task_id=task_id,
-                        kw_number=kw_number,
-                        status="SUCCESS" if result.success else "FAILED",
-                        start_time=start_time,
-                        end_time=datetime.now(),
-                        error=None if result.success else result.message,
-                        files=[str(f) for f in (result.files or [])]
-                    )
-
-                    self.results.append(task_result)
-
-                    if result.success:
-                        self.tasks_completed += 1
-                    else:
-                        self.tasks_failed += 1
-
-                except Exception as e:
-                    logger.log_error(f"Agent {self.agent_id}: Błąd podczas przetwarzania zadania {task_id}: {e}")
-                    self.tasks_failed += 1
-
+                    result = self.run_task(task.task_id, task.kw_number, task.attempt, task.job_id)
+                    status = result.status
+                    if result.status == "RETRY":
+                        self.scheduler.put_delayed(
+                            ScheduledTask(task.task_id, task.kw_number, task.attempt + 1, task.job_id),
+                            result.retry_delay
+                        )
                 finally:
-                    self.current_task = None
-                    self.task_queue.task_done()
+                    self.scheduler.task_done(task, status)
 
-            except queue.Empty:
-                continue
             except Exception as e:
                 logger.log_error(f"Agent {self.agent_id}: Błąd w pętli roboczej: {e}")
 
+    def run_task(self, task_id: str, kw_number: str, attempt: int = 0, job_id: Optional[str] = None) -> TaskResult:
+        """
+        Wykonuje pojedyncze zadanie i aktualizuje statystyki agenta
+
+        Nieudane zadanie dostaje status RETRY (z opóźnieniem w retry_delay),
+        jeśli polityka ponawiania na to pozwala. W przeciwnym razie ma status
+        FAILED i trafia do magazynu nieudanych zadań.
+
+        Args:
+            task_id: ID zadania
+            kw_number: Numer księgi wieczystej
+            attempt: Numer próby, licząc od 0
+            job_id: ID joba w dzienniku zadań (None - zadanie spoza joba)
+
+        Returns:
+            Wynik wykonania zadania
+        """
+        self.current_task = (task_id, kw_number)
+        start_time = datetime.now()
+        if self.journal:
+            self.journal.record(job_id, kw_number, TaskState.IN_PROGRESS, attempt)
+
+        try:
+            # Wykonanie zadania
+            result = self._process_task(kw_number)
+
+            task_result = TaskResult(
+                task_id=task_id,
+                kw_number=kw_number,
+                status="SUCCESS" if result.success else "FAILED",
+                start_time=start_time,
+                end_time=datetime.now(),
+                error=None if result.success else result.message,
+                files=[str(f) for f in (result.files or [])],
+                error_type=None if result.success else (result.error_type or FailureType.ERROR),
+                attempt=attempt,
+                job_id=job_id
+            )
+
+        except Exception as e:
+            logger.log_error(f"Agent {self.agent_id}: Błąd podczas przetwarzania zadania {task_id}: {e}")
+            task_result = TaskResult(
+                task_id=task_id,
+                kw_number=kw_number,
+                status="FAILED",
+                start_time=start_time,
+                end_time=datetime.now(),
+                error=str(e),
+                files=[],
+                error_type=FailureType.classify_exception(e),
+                attempt=attempt,
+                job_id=job_id
+            )
+
+        finally:
+            self.current_task = None
+
+        if task_result.status == "FAILED":
+            if self.retry_policy.should_retry(task_result.error_type, attempt):
+                task_result.status = "RETRY"
+                task_result.retry_delay = self.retry_policy.next_delay(attempt)
+                logger.log_info(
+                    f"Agent {self.agent_id}: KW {kw_number} ({task_result.error_type}) - "
+                    f"ponowienie za {task_result.retry_delay:.1f}s, próba {attempt + 2}"
+                )
+            else:
+                self.dead_letters.add(kw_number, task_result.error_type, task_result.error, attempt + 1)
+
+        if self.journal:
+            record_task_result(self.journal, task_result)
+
+        # Zapisanie wyniku
+        self.results.append(task_result)
+        if task_result.status == "SUCCESS":
+            self.tasks_completed += 1
+        elif task_result.status == "RETRY":
+            self.tasks_retried += 1
+        else:
+            self.tasks_failed += 1
+
+        return task_result
+
+    def _should_yield(self) -> bool:
+        """Czy agent powinien przestać czekać na zadanie (pauza lub zatrzymanie)"""
+        return self._stop_event.is_set() or not self._resume_event.is_set()
+
     def _process_task(self, kw_number: str) -> ScrapingResult:
         """Przetwarza pojedyncze zadanie"""
         try:
@@ -130,13 +246,16 @@ class ScrapingAgent:
             result = self.scraper.scrape_register(kw_number)
 
             if result.success and result.data:
+                # CSV - jeden wiersz na wpis działu z podstawowymi informacjami księgi
+                record = KWRecord.from_data(kw_number, result.data)
+
                 # Zapis danych
                 self.storage.save_all_formats(
                     kw_number=kw_number,
                     pdf_data=result.data.get("pdf"),
                     html_content=result.data.get("html"),
                     json_data=result.data,
-                    csv_data=[result.data]
+                    csv_data=record.csv_rows()
                 )
 
             return result
@@ -151,9 +270,10 @@ class ScrapingAgent:
             "agent_id": self.agent_id,
             "is_running": self.is_running,
             "current_task": self.current_task,
-            "queue_size": self.task_queue.qsize(),
+            "queue_size": self.scheduler.qsize(),
             "tasks_completed": self.tasks_completed,
             "tasks_failed": self.tasks_failed,
+            "tasks_retried": self.tasks_retried,
             "uptime": str(datetime.now() - self.start_time) if self.start_time else "0:00:00",
             "success_rate": f"{(self.tasks_completed / (self.tasks_completed + self.tasks_failed)) * 100:.2f}%"
                            if (self.tasks_completed + self.tasks_failed) > 0 else "N/A"
@@ -3,6 +3,9 @@ import threading
 import uuid
 
 from .agent import ScrapingAgent
+from .task_scheduler import TaskScheduler
+from .retry_policy import RetryPolicy
+from src.core.storage import DeadLetterStore, TaskJournal
 from src.utils import logger
 from src.config.config_manager import ConfigManager
 
@@ -11,10 +14,13 @@ class AgentManager:
     Zarządza pulą agentów scrapujących
     """
 
-    def __init__(self):
+    def __init__(self, journal: Optional[TaskJournal] = None):
         self.config = ConfigManager()
         self.agents: Dict[str, ScrapingAgent] = {}
-        self.tasks: Dict[str, List[str]] = {}  # agent_id -> [task_ids]
+        self.scheduler = TaskScheduler()  # wspólna kolejka wszystkich agentów
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        self.dead_letters = DeadLetterStore()
+        self.journal = journal
         self.lock = threading.Lock()
 
     def create_agent(self) -> str:
@@ -26,19 +32,21 @@ class AgentManager:
         """
         with self.lock:
             agent_id = str(uuid.uuid4())
-            self.agents[agent_id] = ScrapingAgent(agent_id)
-            self.tasks[agent_id] = []
+            self.agents[agent_id] = ScrapingAgent(
+                agent_id, self.scheduler, self.retry_policy, self.dead_letters, self.journal
+            )
             logger.log_info(f"Utworzono nowego agenta: {agent_id}")
             return agent_id
 
     def remove_agent(self, agent_id: str):
         """Usuwa agenta"""
         with self.lock:
-            if agent_id in self.agents:
-                self.agents[agent_id].stop()
-                del self.agents[agent_id]
-                del self.tasks[agent_id]
-                logger.log_info(f"Usunięto agenta: {agent_id}")
+            agent = self.agents.pop(agent_id, None)
+
+        # Zatrzymanie poza blokadą - agent może jeszcze kończyć bieżące zadanie
+        if agent:
+            agent.stop()
+            logger.log_info(f"Usunięto agenta: {agent_id}")
 
     def start_agent(self, agent_id: str):
         """Uruchamia agenta"""
@@ -50,32 +58,33 @@ class AgentManager:
         if agent_id in self.agents:
             self.agents[agent_id].stop()
 
-    def add_task(self, kw_number: str) -> str:
+    def add_task(self, kw_number: str, job_id: Optional[str] = None) -> str:
         """
-        Dodaje nowe zadanie i przydziela je do agenta
+        Dodaje nowe zadanie do wspólnej kolejki agentów
+
+        Zadanie nie jest przypisywane do konkretnego agenta - pobiera je
+        pierwszy wolny agent.
 
         Args:
             kw_number: Numer księgi wieczystej
+            job_id: ID joba w dzienniku zadań
 
         Returns:
             ID zadania
         """
-        with self.lock:
-            task_id = str(uuid.uuid4())
-
-            # Wybierz agenta z najmniejszą liczbą zadań
-            agent_id = min(self.tasks.items(), key=lambda x: len(x[1]))[0]
+        task_id = str(uuid.uuid4())
+        self.scheduler.put(task_id, kw_number, job_id)
 
-            # Dodaj zadanie do agenta
-            self.agents[agent_id].add_task(task_id, kw_number)
-            self.tasks[agent_id].append(task_id)
+        logger.log_info(f"Dodano zadanie {task_id} dla KW {kw_number}")
+        return task_id
 
-            logger.log_info(f"Dodano zadanie {task_id} do agenta {agent_id}")
-            return task_id
-
-    def add_tasks_batch(self, kw_numbers: List[str]) -> List[str]:
+    def add_tasks_batch(self, kw_numbers: List[str], job_id: Optional[str] = None) -> List[str]:
         """Dodaje wiele zadań jednocześnie"""
-        return [self.add_task(kw) for kw in kw_numbers]
+        task_ids = [str(uuid.uuid4()) for _ in kw_numbers]
+        self.scheduler.put_batch(zip(task_ids, kw_numbers), job_id)
+
+        logger.log_info(f"Dodano {len(task_ids)} zadań" + (f" do joba {job_id}" if job_id else ""))
+        return task_ids
 
     def get_agent_status(self, agent_id: str) -> Optional[Dict]:
         """Zwraca status agenta"""
@@ -83,6 +92,10 @@ class AgentManager:
             return self.agents[agent_id].get_status()
         return None
 
+    def get_queue_size(self) -> int:
+        """Zwraca liczbę zadań oczekujących we wspólnej kolejce"""
+        return self.scheduler.qsize()
+
     def get_all_agents_status(self) -> Dict[str, Dict]:
         """Zwraca status wszystkich agentów"""
         return {
@@ -92,10 +105,10 @@ class AgentManager:
 
     def start_all_agents(self):
         """Uruchamia wszystkich agentów"""
-        for agent_id in self.agents:
+        for agent_id in list(self.agents):
             self.start_agent(agent_id)
 
     def stop_all_agents(self):
         """Zatrzymuje wszystkich agentów"""
-        for agent_id in self.agents:
+        for agent_id in list(self.agents):
             self.stop_agent(agent_id)
@@ -0,0 +1,191 @@
+# src/core/agent/concurrency_controller.py
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+import math
+import threading
+
+from .agent_manager import AgentManager
+from src.core.scraping import FailureType
+from src.utils import logger
+
+# Błędy świadczące o przeciążeniu - brak treści czy zły numer KW to poprawne odpowiedzi strony
+OVERLOAD_ERRORS = (FailureType.TIMEOUT, FailureType.BLOCKED, FailureType.ERROR)
+
+
+@dataclass
+class ConcurrencySettings:
+    """Parametry regulatora liczby agentów"""
+    min_agents: int = 1
+    max_agents: int = 32
+    additive_step: int = 1
+    decrease_factor: float = 0.5
+    interval: float = 30.0
+    latency_tolerance: float = 1.5
+    max_error_rate: float = 0.2
+    max_memory_percent: float = 85.0
+    min_samples: int = 5
+    baseline_window: int = 10
+
+
+@dataclass
+class ConcurrencySample:
+    """Pomiar z jednego okresu regulacji"""
+    agents: int
+    tasks: int
+    avg_latency: Optional[float]
+    error_rate: Optional[float]
+    memory_percent: Optional[float]
+
+
+class ConcurrencyController:
+    """
+    Regulator liczby agentów typu AIMD (additive increase / multiplicative decrease)
+
+    Co `interval` sekund zbiera wyniki zadań zakończonych od poprzedniego
+    pomiaru. Jeśli średni czas pobranej KW wyraźnie rośnie względem
+    najlepszego z ostatnich `baseline_window` zdrowych okresów, rośnie odsetek
+    błędów przeciążenia (timeout, blokada, błąd) albo brakuje pamięci - liczba
+    agentów jest mnożona przez `decrease_factor`. W przeciwnym razie, gdy
+    w kolejce czekają zadania, dokładany jest `additive_step` agentów.
+
+    Czas KW liczony jest tylko z zadań zakończonych sukcesem - szybkie
+    odpowiedzi "brak treści" przy przeszukiwaniu generatorem nie zaniżają
+    punktu odniesienia.
+    """
+
+    def __init__(self, agent_manager: AgentManager, settings: ConcurrencySettings):
+        self.agent_manager = agent_manager
+        self.settings = settings
+        self.history: List[ConcurrencySample] = []
+
+        self._healthy_latencies: Deque[float] = deque(maxlen=max(settings.baseline_window, 1))
+        self._seen_results: Dict[str, int] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._memory_warning_logged = False
+
+    def start(self):
+        """Uruchamia regulator w wątku tła"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.log_info("Uruchomiono regulator liczby agentów")
+
+    def stop(self):
+        """Zatrzymuje regulator"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Pętla regulatora"""
+        while not self._stop_event.wait(self.settings.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                logger.log_error(f"Błąd regulatora liczby agentów: {e}")
+
+    def tick(self) -> ConcurrencySample:
+        """Wykonuje jeden krok regulacji i zwraca pomiar"""
+        sample = self._measure()
+        self.history.append(sample)
+
+        current = sample.agents
+        target = current
+
+        if self._is_overloaded(sample):
+            target = max(self.settings.min_agents, math.floor(current * self.settings.decrease_factor))
+        elif sample.tasks >= self.settings.min_samples and self.agent_manager.get_queue_size() > 0:
+            target = min(self.settings.max_agents, current + self.settings.additive_step)
+
+        # Punkt odniesienia to minimum z ostatnich "zdrowych" okresów - stare pomiary wygasają
+        if sample.avg_latency is not None and target >= current:
+            self._healthy_latencies.append(sample.avg_latency)
+
+        if target != current:
+            logger.log_info(
+                f"Regulator: {current} -> {target} agentów "
+                f"(czas KW: {sample.avg_latency}, błędy: {sample.error_rate}, pamięć %: {sample.memory_percent})"
+            )
+            self._resize(current, target)
+
+        return sample
+
+    def _is_overloaded(self, sample: ConcurrencySample) -> bool:
+        """Czy pomiar wskazuje na przeciążenie strony lub maszyny"""
+        if sample.memory_percent is not None and sample.memory_percent > self.settings.max_memory_percent:
+            return True
+        if sample.tasks < self.settings.min_samples:
+            return False
+        if sample.error_rate is not None and sample.error_rate > self.settings.max_error_rate:
+            return True
+        baseline = self.baseline_latency
+        if sample.avg_latency is not None and baseline is not None:
+            return sample.avg_latency > baseline * self.settings.latency_tolerance
+        return False
+
+    @property
+    def baseline_latency(self) -> Optional[float]:
+        """Najlepszy średni czas KW z ostatnich zdrowych okresów"""
+        return min(self._healthy_latencies) if self._healthy_latencies else None
+
+    def _measure(self) -> ConcurrencySample:
+        """Zbiera wyniki zadań zakończonych od poprzedniego pomiaru"""
+        latencies = []
+        tasks = failures = 0
+
+        agents = dict(self.agent_manager.agents)
+        for agent_id, agent in agents.items():
+            seen = self._seen_results.get(agent_id, 0)
+            new_results = agent.results[seen:]
+            self._seen_results[agent_id] = seen + len(new_results)
+
+            for result in new_results:
+                tasks += 1
+                if result.status == "SUCCESS":
+                    latencies.append((result.end_time - result.start_time).total_seconds())
+                elif (result.error_type or FailureType.ERROR) in OVERLOAD_ERRORS:
+                    failures += 1
+
+        # Zapominamy o usuniętych agentach
+        for agent_id in list(self._seen_results):
+            if agent_id not in agents:
+                del self._seen_results[agent_id]
+
+        return ConcurrencySample(
+            agents=len(agents),
+            tasks=tasks,
+            avg_latency=sum(latencies) / len(latencies) if latencies else None,
+            error_rate=failures / tasks if tasks else None,
+            memory_percent=self._memory_percent()
+        )
+
+    def _memory_percent(self) -> Optional[float]:
+        """Zwraca zajętość pamięci maszyny w procentach (None, gdy brak psutil)"""
+        try:
+            import psutil
+            return psutil.virtual_memory().percent
+        except ImportError:
+            if not self._memory_warning_logged:
+                logger.log_info("Brak pakietu psutil - regulator pomija zajętość pamięci")
+                self._memory_warning_logged = True
+            return None
+
+    def _resize(self, current: int, target: int):
+        """Dodaje lub usuwa agentów, aby osiągnąć docelową liczbę"""
+        if target > current:
+            for _ in range(target - current):
+                agent_id = self.agent_manager.create_agent()
+                self.agent_manager.start_agent(agent_id)
+            return
+
+        # Najpierw usuwamy agentów bez bieżącego zadania
+        statuses = self.agent_manager.get_all_agents_status()
+        candidates = sorted(statuses, key=lambda agent_id: statuses[agent_id]["current_task"] is not None)
+        for agent_id in candidates[:current - target]:
+            self.agent_manager.remove_agent(agent_id)
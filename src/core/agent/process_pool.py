@@ -0,0 +1,392 @@
+# src/core/agent/process_pool.py
+
+from typing import Dict, List, Optional
+from datetime import datetime
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+
+from .agent import TaskResult, record_task_result
+from .retry_policy import RetryPolicy
+from .task_scheduler import TaskScheduler, ScheduledTask
+from src.core.scraping import FailureType
+from src.core.storage import DeadLetterStore, TaskJournal, TaskState
+from src.utils import logger
+from src.utils.metrics import TimingHistogram
+
+# Wiadomości wysyłane przez procesy robocze do procesu głównego
+MSG_READY = "ready"
+MSG_STARTED = "started"
+MSG_FINISHED = "finished"
+MSG_EXITED = "exited"
+MSG_STATS = "stats"
+
+# Co ile sekund wątek odbierający wyniki sprawdza, czy procesy robocze żyją
+LIVENESS_INTERVAL = 1.0
+
+
+def _process_worker(worker_id: str, task_queue, result_queue):
+    """
+    Pętla robocza procesu potomnego
+
+    Każdy proces ma własnego agenta, a więc jedną przeglądarkę. Zadania
+    przychodzą z kolejki międzyprocesowej, a wyniki wracają jako TaskResult.
+    Wartość None w kolejce zadań kończy pracę procesu. Dziennik zadań
+    prowadzi proces główny, więc procesy potomne go nie otwierają.
+    Po każdym zadaniu proces odsyła statystyki swojego limitera zapytań.
+    """
+    from .agent import ScrapingAgent
+    from src.core.scraping.rate_limiter import get_rate_limiter
+
+    agent = ScrapingAgent(worker_id)
+    rate_limiter = get_rate_limiter()
+    result_queue.put((MSG_READY, worker_id, None))
+
+    try:
+        while True:
+            item = task_queue.get()
+            if item is None:
+                break
+
+            task_id, kw_number, attempt, job_id = item
+            result_queue.put((MSG_STARTED, worker_id, (task_id, kw_number, attempt, job_id)))
+            task_result = agent.run_task(task_id, kw_number, attempt, job_id)
+            result_queue.put((MSG_FINISHED, worker_id, task_result))
+            if rate_limiter:
+                result_queue.put((MSG_STATS, worker_id, rate_limiter.get_stats()))
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.scraper.close()
+        result_queue.put((MSG_EXITED, worker_id, None))
+
+
+class ProcessAgentPool:
+    """
+    Pula agentów uruchomionych w osobnych procesach
+
+    Omija GIL przy parsowaniu HTML i zapisie plików - każdy proces ma
+    własnego agenta i jedną przeglądarkę. Statusy procesów mają ten sam
+    format co ScrapingAgent.get_status(), więc WorkDistributor raportuje
+    postęp identycznie w obu trybach.
+
+    Zadania czekają w TaskScheduler procesu głównego (z podziałem na joby),
+    a wątek rozdzielający przekazuje je do procesów dopiero, gdy któryś
+    z nich jest wolny - kolejność obsługi jobów jest więc taka sama jak
+    w trybie wątków.
+
+    Każdy proces ma własną kolejkę zadań, więc wiadomo, które zadanie
+    dostał. Proces zakończony bez wiadomości MSG_EXITED (np. zabity przez
+    system) jest zastępowany nowym (najwyżej `max_restarts` razy), a jego
+    zadanie jest traktowane jak nieudana próba (FailureType.ERROR) -
+    wraca do kolejki zgodnie z RetryPolicy albo trafia do dead letters.
+    """
+
+    def __init__(self, num_processes: int, journal: Optional[TaskJournal] = None, max_restarts: int = 10):
+        self.num_processes = max(1, num_processes)
+        self.journal = journal
+        self.max_restarts = max_restarts
+        self.retry_policy = RetryPolicy.from_config()
+        self.dead_letters = DeadLetterStore()
+        self.scheduler = TaskScheduler()
+        self._context = multiprocessing.get_context("spawn")
+        self._result_queue = None
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._task_queues: Dict = {}
+        self._statuses: Dict[str, Dict] = {}
+        self._collector: Optional[threading.Thread] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        # Wolne procesy (ID) czekające na zadanie
+        self._idle_workers: "queue.Queue[str]" = queue.Queue()
+        # Zadanie przekazane każdemu procesowi, do czasu jego wyniku
+        self._assigned: Dict[str, ScheduledTask] = {}
+        # Ostatnie statystyki limitera zapytań każdego procesu (także zakończonych)
+        self._rate_limiter_stats: Dict[str, Dict] = {}
+        self._restarts = 0
+        self._lock = threading.Lock()
+        self.results: List[TaskResult] = []
+        self.is_running = False
+
+    def start(self):
+        """Uruchamia procesy robocze"""
+        if self.is_running:
+            return
+
+        self._result_queue = self._context.Queue()
+        self._idle_workers = queue.Queue()
+        self._restarts = 0
+        self.is_running = True
+
+        with self._lock:
+            for _ in range(self.num_processes):
+                self._start_worker()
+
+        self._collector = threading.Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+        self._dispatcher = threading.Thread(target=self._dispatch_tasks, daemon=True)
+        self._dispatcher.start()
+        logger.log_info(f"Uruchomiono {self.num_processes} procesów roboczych")
+
+    def _start_worker(self):
+        """Uruchamia nowy proces roboczy z własną kolejką zadań (wywoływane pod blokadą)"""
+        worker_id = str(uuid.uuid4())
+        task_queue = self._context.Queue()
+        process = self._context.Process(
+            target=_process_worker,
+            args=(worker_id, task_queue, self._result_queue),
+            daemon=True
+        )
+        self._processes[worker_id] = process
+        self._task_queues[worker_id] = task_queue
+        self._statuses[worker_id] = {
+            "agent_id": worker_id,
+            "is_running": False,
+            "alive": True,
+            "current_task": None,
+            "queue_size": 0,
+            "tasks_completed": 0,
+            "tasks_failed": 0,
+            "tasks_retried": 0,
+            "start_time": datetime.now(),
+        }
+        process.start()
+
+    def add_tasks(self, kw_numbers: List[str], job_id: Optional[str] = None) -> List[str]:
+        """
+        Dodaje zadania do kolejki procesów roboczych
+
+        Args:
+            kw_numbers: Lista numerów KW
+            job_id: ID joba
+
+        Returns:
+            Lista ID zadań
+        """
+        task_ids = [str(uuid.uuid4()) for _ in kw_numbers]
+        self.scheduler.put_batch(zip(task_ids, kw_numbers), job_id)
+        return task_ids
+
+    def stop(self, timeout: float = 30):
+        """Zatrzymuje procesy robocze po dokończeniu bieżących zadań"""
+        if not self.is_running:
+            return
+
+        # Zadania, których nie przekazano do procesów, zostają w kolejce
+        self.is_running = False
+        self.scheduler.interrupt()
+        if self._dispatcher:
+            self._dispatcher.join()
+
+        for worker_id, process in self._processes.items():
+            if process.is_alive():
+                self._task_queues[worker_id].put(None)
+
+        for worker_id, process in self._processes.items():
+            process.join(timeout)
+            if process.is_alive():
+                logger.log_error(f"Proces {worker_id} nie zakończył się w czasie {timeout}s - wymuszono zakończenie")
+                process.terminate()
+
+        self._result_queue.put(None)
+        if self._collector:
+            self._collector.join()
+
+        with self._lock:
+            # Zadania procesów zakończonych bez wyniku (wymuszone zakończenie) wracają do kolejki
+            for task in self._assigned.values():
+                self._requeue(task)
+            self._assigned.clear()
+            self._processes.clear()
+            self._task_queues.clear()
+            self._statuses.clear()
+        self._collector = self._dispatcher = None
+        logger.log_info("Zatrzymano procesy robocze")
+
+    def _dispatch_tasks(self):
+        """Przekazuje kolejne zadania do wolnych procesów"""
+        while self.is_running:
+            try:
+                worker_id = self._idle_workers.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            with self._lock:
+                if not self._statuses.get(worker_id, {}).get("alive"):
+                    continue
+
+            task = self.scheduler.get(cancelled=lambda: not self.is_running)
+            if task is None:
+                self._idle_workers.put(worker_id)
+                continue
+
+            with self._lock:
+                if not self._statuses[worker_id]["alive"]:
+                    # Proces zakończył się w czasie oczekiwania na zadanie
+                    self._requeue(task)
+                    continue
+                self._assigned[worker_id] = task
+                self._task_queues[worker_id].put((task.task_id, task.kw_number, task.attempt, task.job_id))
+
+    def _collect_results(self):
+        """Odbiera wiadomości od procesów roboczych, aktualizuje statusy i pilnuje, czy procesy żyją"""
+        next_check = time.monotonic() + LIVENESS_INTERVAL
+        while True:
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + LIVENESS_INTERVAL
+
+            try:
+                message = self._result_queue.get(timeout=LIVENESS_INTERVAL)
+            except queue.Empty:
+                continue
+            if message is None:
+                break
+
+            kind, worker_id, payload = message
+            with self._lock:
+                status = self._statuses.get(worker_id)
+                if status is None:
+                    continue
+
+                if kind == MSG_READY:
+                    status["is_running"] = True
+                    self._idle_workers.put(worker_id)
+                elif kind == MSG_STARTED:
+                    task_id, kw_number, attempt, job_id = payload
+                    status["current_task"] = (task_id, kw_number)
+                    if self.journal:
+                        self.journal.record(job_id, kw_number, TaskState.IN_PROGRESS, attempt)
+                elif kind == MSG_FINISHED:
+                    status["current_task"] = None
+                    self._record_result(worker_id, payload)
+                    self._idle_workers.put(worker_id)
+                elif kind == MSG_STATS:
+                    self._rate_limiter_stats[worker_id] = payload
+                elif kind == MSG_EXITED:
+                    status["is_running"] = False
+                    status["alive"] = False
+                    status["current_task"] = None
+
+    def _record_result(self, worker_id: str, task_result: TaskResult):
+        """Zapisuje wynik zadania procesu i ponawia je w razie potrzeby (wywoływane pod blokadą)"""
+        status = self._statuses[worker_id]
+        self.results.append(task_result)
+        if self.journal:
+            record_task_result(self.journal, task_result)
+        if task_result.status == "SUCCESS":
+            status["tasks_completed"] += 1
+        elif task_result.status == "RETRY":
+            status["tasks_retried"] += 1
+            self.scheduler.put_delayed(
+                ScheduledTask(task_result.task_id, task_result.kw_number, task_result.attempt + 1, task_result.job_id),
+                task_result.retry_delay or 0
+            )
+        else:
+            status["tasks_failed"] += 1
+        self.scheduler.task_done(self._assigned.pop(worker_id, None), task_result.status)
+
+    def _check_workers(self):
+        """Wykrywa procesy zakończone bez MSG_EXITED - zwraca ich zadanie do kolejki i uruchamia następcę"""
+        if not self.is_running:
+            return
+
+        with self._lock:
+            for worker_id, process in list(self._processes.items()):
+                status = self._statuses[worker_id]
+                if not status["alive"] or process.is_alive():
+                    continue
+
+                status["alive"] = status["is_running"] = False
+                status["current_task"] = None
+                error = f"Proces {worker_id} zakończył się nieoczekiwanie (kod {process.exitcode})"
+                logger.log_error(error)
+
+                task = self._assigned.get(worker_id)
+                if task is not None:
+                    self._record_result(worker_id, self._crash_result(task, error))
+
+                # Martwy proces nie dostanie już zadania - jego miejsce zajmuje następca (po MSG_READY)
+                del self._processes[worker_id]
+                self._task_queues.pop(worker_id).close()
+                if self._restarts < self.max_restarts:
+                    self._restarts += 1
+                    self._start_worker()
+                else:
+                    logger.log_error(f"Przekroczono limit {self.max_restarts} ponownych uruchomień procesów roboczych")
+
+    def _crash_result(self, task: ScheduledTask, error: str) -> TaskResult:
+        """Wynik zadania przerwanego awarią procesu - nieudana próba typu ERROR"""
+        now = datetime.now()
+        task_result = TaskResult(
+            task_id=task.task_id,
+            kw_number=task.kw_number,
+            status="FAILED",
+            start_time=now,
+            end_time=now,
+            error=error,
+            files=[],
+            error_type=FailureType.ERROR,
+            attempt=task.attempt,
+            job_id=task.job_id
+        )
+        if self.retry_policy.should_retry(FailureType.ERROR, task.attempt):
+            task_result.status = "RETRY"
+            task_result.retry_delay = self.retry_policy.next_delay(task.attempt)
+        else:
+            self.dead_letters.add(task.kw_number, FailureType.ERROR, error, task.attempt + 1)
+        return task_result
+
+    def _requeue(self, task: ScheduledTask):
+        """Zwraca do kolejki zadanie przerwane zatrzymaniem puli (wywoływane pod blokadą)"""
+        if self.journal:
+            self.journal.record(task.job_id, task.kw_number, TaskState.RETRY, task.attempt)
+        self.scheduler.put_delayed(task, 0)
+        self.scheduler.task_done(task, "RETRY")
+
+    def get_queue_size(self) -> int:
+        """Zwraca liczbę zadań, których nie rozpoczął jeszcze żaden proces"""
+        with self._lock:
+            waiting = sum(1 for worker_id in self._assigned if not self._statuses[worker_id]["current_task"])
+            return self.scheduler.qsize() + waiting
+
+    def get_rate_limiter_stats(self) -> Optional[Dict]:
+        """
+        Zwraca statystyki limiterów zapytań procesów roboczych, połączone w jedne
+
+        Limitery działają w procesach potomnych, więc limiter procesu głównego
+        nie ma żadnych pomiarów. Histogram oczekiwania łączy pomiary wszystkich
+        procesów; "rate" i "burst" to ustawienia limitera jednego procesu.
+        """
+        with self._lock:
+            stats = list(self._rate_limiter_stats.values())
+        if not stats:
+            return None
+        return {
+            "rate": stats[0]["rate"],
+            "burst": stats[0]["burst"],
+            "processes": len(stats),
+            "wait_times": TimingHistogram.merged([s["wait_times"] for s in stats]),
+        }
+
+    def get_all_statuses(self) -> Dict[str, Dict]:
+        """Zwraca statusy procesów w formacie ScrapingAgent.get_status()"""
+        queue_size = self.get_queue_size()
+        with self._lock:
+            statuses = {}
+            for worker_id, s in self._statuses.items():
+                done = s["tasks_completed"] + s["tasks_failed"]
+                statuses[worker_id] = {
+                    "agent_id": worker_id,
+                    "is_running": s["is_running"],
+                    "current_task": s["current_task"],
+                    "queue_size": queue_size,
+                    "tasks_completed": s["tasks_completed"],
+                    "tasks_failed": s["tasks_failed"],
+                    "tasks_retried": s["tasks_retried"],
+                    "uptime": str(datetime.now() - s["start_time"]),
+                    "success_rate": f"{(s['tasks_completed'] / done) * 100:.2f}%" if done > 0 else "N/A"
+                }
+            return statuses
@@ -0,0 +1,59 @@
+# src/core/agent/retry_policy.py
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+import random
+
+from src.core.scraping import FailureType
+from src.config.config_manager import ConfigManager
+
+# Odpowiedzi strony, których ponowienie nic nie zmieni
+FINAL_ERRORS = (FailureType.NO_CONTENT, FailureType.INVALID_NUMBER)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Polityka ponawiania nieudanych zadań
+
+    Opóźnienie rośnie wykładniczo z każdą próbą i jest losowane z przedziału
+    [0, min(max_delay, base_delay * 2^próba)] ("full jitter"), żeby agenci
+    nie wracali do strony jednocześnie. Liczba prób zależy od rodzaju błędu -
+    timeout czy blokada zwykle mijają, a brak treści i błędny numer KW to
+    poprawne odpowiedzi strony (FINAL_ERRORS), których nie ma sensu ponawiać.
+    """
+    base_delay: float = 5.0
+    max_delay: float = 300.0
+    max_attempts: Dict[str, int] = field(default_factory=lambda: {
+        FailureType.TIMEOUT: 5,
+        FailureType.BLOCKED: 3,
+        FailureType.ERROR: 3,
+    })
+
+    @classmethod
+    def from_config(cls, config: Optional[ConfigManager] = None) -> "RetryPolicy":
+        """Tworzy politykę na podstawie konfiguracji (klucze retry_*)"""
+        config = config or ConfigManager()
+        policy = cls(
+            base_delay=float(config.get("retry_base_delay", 5)),
+            max_delay=float(config.get("retry_max_delay", 300))
+        )
+        policy.max_attempts.update(config.get("retry_max_attempts") or {})
+        return policy
+
+    def should_retry(self, error_type: Optional[str], attempt: int) -> bool:
+        """
+        Czy zadanie należy ponowić
+
+        Args:
+            error_type: Rodzaj błędu (FailureType)
+            attempt: Numer nieudanej próby, licząc od 0
+        """
+        if error_type in FINAL_ERRORS:
+            return False
+        limit = self.max_attempts.get(error_type or FailureType.ERROR, 1)
+        return attempt + 1 < limit
+
+    def next_delay(self, attempt: int) -> float:
+        """Zwraca losowe opóźnienie przed kolejną próbą"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
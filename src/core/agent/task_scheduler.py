@@ -0,0 +1,358 @@
+# src/core/agent/task_scheduler.py
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import itertools
+import threading
+import time
+
+
+@dataclass
+class ScheduledTask:
+    """Zadanie oczekujące w kolejce harmonogramu"""
+    task_id: str
+    kw_number: str
+    attempt: int = 0
+    job_id: Optional[str] = None
+
+
+@dataclass
+class JobQueue:
+    """Kolejka zadań jednego joba wraz z licznikami postępu"""
+    job_id: Optional[str]
+    weight: float = 1.0
+    priority: int = 0
+    paused: bool = False
+    tasks: Deque[ScheduledTask] = field(default_factory=deque)
+
+    # Czas wirtualny szeregowania (stride scheduling) - rośnie o 1/weight z każdym pobranym zadaniem
+    pass_value: float = 0.0
+
+    # Postęp
+    total: int = 0
+    in_flight: int = 0
+    delayed: int = 0
+    completed: int = 0
+    failed: int = 0
+    retried: int = 0
+
+    def get_progress(self) -> Dict:
+        """Zwraca liczniki postępu joba"""
+        return {
+            "job_id": self.job_id,
+            "total": self.total,
+            "queued": len(self.tasks) + self.delayed,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "paused": self.paused,
+        }
+
+
+class TaskScheduler:
+    """
+    Wspólna kolejka zadań dla wszystkich agentów.
+
+    Zamiast przypinać numer KW do prywatnej kolejki jednego agenta, każdy
+    wolny agent pobiera kolejne zadanie z jednej wspólnej kolejki. Dzięki
+    temu wolny agent nigdy nie czeka, gdy inni mają zaległości.
+
+    Zadania każdego joba (listy z pliku, schowka, generatora) czekają w osobnej
+    podkolejce. Agent dostaje zadanie z joba o najwyższym priorytecie, a przy
+    równych priorytetach - z joba o najmniejszym czasie wirtualnym (stride
+    scheduling). Joby dzielą więc agentów proporcjonalnie do wag i mała lista
+    nie czeka na koniec wielomilionowego generatora.
+
+    Pobieranie zadań jest blokujące - agent śpi na zmiennej warunkowej i jest
+    budzony natychmiast po dodaniu zadania albo przez interrupt().
+
+    Zadania ponawiane po błędzie czekają w kopcu odroczonych zadań i trafiają
+    do kolejki swojego joba dopiero po upływie swojego opóźnienia.
+
+    Anulowany job (remove_job) nie wraca - zadania dodawane później do tego
+    joba (np. ponowienie zadania, które było w trakcie) są odrzucane.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[Optional[str], JobQueue] = {}
+        self._cancelled: Set[str] = set()
+        self._delayed: List[Tuple[float, int, ScheduledTask]] = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._unfinished = 0
+
+    def set_job(self, job_id: Optional[str], weight: float = 1.0, priority: int = 0):
+        """
+        Ustawia parametry szeregowania joba
+
+        Args:
+            job_id: ID joba
+            weight: Udział w agentach względem innych jobów o tym samym priorytecie
+            priority: Joby o wyższym priorytecie są obsługiwane w pierwszej kolejności
+        """
+        with self._lock:
+            if job_id in self._cancelled:
+                return
+            job = self._get_job(job_id)
+            job.weight = max(weight, 0.01)
+            job.priority = priority
+
+    def _get_job(self, job_id: Optional[str]) -> JobQueue:
+        """Zwraca kolejkę joba, tworząc ją w razie potrzeby (wywoływane pod blokadą)"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self._jobs[job_id] = JobQueue(job_id, pass_value=self._virtual_time)
+        return job
+
+    def _append(self, job: JobQueue, task: ScheduledTask):
+        """Dodaje zadanie do kolejki joba (wywoływane pod blokadą)"""
+        if not job.tasks:
+            # Job wraca do rywalizacji - nie może nadrabiać czasu, w którym był pusty
+            job.pass_value = max(job.pass_value, self._virtual_time)
+        job.tasks.append(task)
+        self._queued += 1
+
+    def put(self, task_id: str, kw_number: str, job_id: Optional[str] = None):
+        """Dodaje zadanie na koniec kolejki joba"""
+        self.put_batch([(task_id, kw_number)], job_id)
+
+    def put_batch(self, tasks: Iterable[Tuple[str, str]], job_id: Optional[str] = None) -> int:
+        """
+        Dodaje wiele zadań joba jedną operacją
+
+        Args:
+            tasks: Pary (ID zadania, numer KW)
+            job_id: ID joba
+
+        Returns:
+            Liczba dodanych zadań (0 dla anulowanego joba)
+        """
+        with self._lock:
+            if job_id in self._cancelled:
+                return 0
+            job = self._get_job(job_id)
+            added = 0
+            for task_id, kw_number in tasks:
+                self._append(job, ScheduledTask(task_id, kw_number, job_id=job_id))
+                added += 1
+            job.total += added
+            self._unfinished += added
+            if added == 1:
+                self._not_empty.notify()
+            elif added:
+                self._not_empty.notify_all()
+            return added
+
+    def put_delayed(self, task: ScheduledTask, delay: float) -> bool:
+        """
+        Dodaje zadanie, które stanie się dostępne po `delay` sekundach
+
+        Zadanie jest traktowane jak nowe - wymaga osobnego task_done().
+
+        Returns:
+            False, jeśli job zadania został anulowany i zadanie odrzucono
+        """
+        with self._lock:
+            if task.job_id in self._cancelled:
+                return False
+            heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._sequence), task))
+            self._get_job(task.job_id).delayed += 1
+            self._unfinished += 1
+            # Budzimy czekających, żeby przeliczyli czas oczekiwania
+            self._not_empty.notify_all()
+            return True
+
+    def _promote_due(self) -> Optional[float]:
+        """
+        Przenosi do kolejek jobów odroczone zadania, których czas minął
+
+        Returns:
+            Czas (w sekundach) do najbliższego odroczonego zadania lub None
+        """
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            task = heapq.heappop(self._delayed)[2]
+            job = self._get_job(task.job_id)
+            job.delayed -= 1
+            self._append(job, task)
+        return self._delayed[0][0] - now if self._delayed else None
+
+    def _pop_next(self) -> Optional[ScheduledTask]:
+        """Wybiera zadanie z joba o najwyższym priorytecie i najmniejszym czasie wirtualnym"""
+        best = None
+        for job in self._jobs.values():
+            if not job.tasks or job.paused:
+                continue
+            if best is None or (-job.priority, job.pass_value) < (-best.priority, best.pass_value):
+                best = job
+
+        if best is None:
+            return None
+
+        self._virtual_time = best.pass_value
+        best.pass_value += 1.0 / best.weight
+        best.in_flight += 1
+        self._queued -= 1
+        return best.tasks.popleft()
+
+    def get(
+        self,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        cancelled: Optional[Callable[[], bool]] = None
+    ) -> Optional[ScheduledTask]:
+        """
+        Pobiera kolejne zadanie z kolejki
+
+        Args:
+            block: Czy czekać na zadanie, gdy kolejka jest pusta
+            timeout: Maksymalny czas oczekiwania w sekundach (None - bez limitu)
+            cancelled: Warunek przerwania oczekiwania, sprawdzany po każdym interrupt()
+
+        Returns:
+            Zadanie lub None, jeśli kolejka jest pusta, minął czas oczekiwania
+            albo oczekiwanie zostało przerwane
+        """
+        is_cancelled = cancelled or (lambda: False)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._not_empty:
+            while True:
+                next_due = self._promote_due()
+                if is_cancelled():
+                    return None
+                if self._queued:
+                    task = self._pop_next()
+                    if task is not None:
+                        return task
+                if not block:
+                    return None
+
+                # Czekamy na nowe zadanie, najbliższe odroczone albo koniec limitu czasu
+                wait = next_due
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._not_empty.wait(wait)
+
+    def interrupt(self):
+        """Budzi agentów czekających w get(), aby ponownie sprawdzili warunek przerwania"""
+        with self._lock:
+            self._not_empty.notify_all()
+
+    def task_done(self, task: Optional[ScheduledTask] = None, status: Optional[str] = None):
+        """
+        Oznacza pobrane zadanie jako zakończone
+
+        Args:
+            task: Zakończone zadanie (aktualizuje postęp jego joba)
+            status: Status wyniku - SUCCESS, RETRY lub FAILED
+        """
+        with self._lock:
+            if self._unfinished > 0:
+                self._unfinished -= 1
+
+            job = self._jobs.get(task.job_id) if task else None
+            if job is None:
+                return
+
+            job.in_flight = max(0, job.in_flight - 1)
+            if status == "SUCCESS":
+                job.completed += 1
+            elif status == "RETRY":
+                job.retried += 1
+            else:
+                job.failed += 1
+
+    def pause_job(self, job_id: Optional[str]):
+        """Wstrzymuje wydawanie zadań joba (zadania w trakcie zostaną dokończone)"""
+        with self._lock:
+            if job_id not in self._cancelled:
+                self._get_job(job_id).paused = True
+
+    def resume_job(self, job_id: Optional[str]):
+        """Wznawia wydawanie zadań joba"""
+        with self._lock:
+            if job_id in self._cancelled:
+                return
+            job = self._get_job(job_id)
+            job.paused = False
+            job.pass_value = max(job.pass_value, self._virtual_time)
+            self._not_empty.notify_all()
+
+    def remove_job(self, job_id: Optional[str]) -> int:
+        """
+        Usuwa oczekujące zadania joba (także odroczone) i oznacza job jako anulowany
+
+        Returns:
+            Liczba usuniętych zadań
+        """
+        with self._lock:
+            if job_id is not None:
+                self._cancelled.add(job_id)
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return 0
+
+            delayed = [entry for entry in self._delayed if entry[2].job_id != job_id]
+            removed_delayed = len(self._delayed) - len(delayed)
+            if removed_delayed:
+                self._delayed = delayed
+                heapq.heapify(self._delayed)
+
+            removed = len(job.tasks) + removed_delayed
+            self._queued -= len(job.tasks)
+            self._unfinished -= removed
+            return removed
+
+    def clear(self) -> int:
+        """
+        Usuwa wszystkie oczekujące zadania
+
+        Returns:
+            Liczba usuniętych zadań
+        """
+        with self._lock:
+            removed = self._queued + len(self._delayed)
+            for job in self._jobs.values():
+                job.tasks.clear()
+                job.delayed = 0
+            self._delayed.clear()
+            self._queued = 0
+            self._unfinished -= removed
+            return removed
+
+    def qsize(self) -> int:
+        """Zwraca liczbę zadań oczekujących w kolejce (także odroczonych)"""
+        with self._lock:
+            return self._queued + len(self._delayed)
+
+    def delayed_count(self) -> int:
+        """Zwraca liczbę zadań czekających na ponowienie"""
+        with self._lock:
+            return len(self._delayed)
+
+    def get_job_progress(self, job_id: Optional[str]) -> Optional[Dict]:
+        """Zwraca postęp joba lub None, jeśli job nie istnieje"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.get_progress() if job else None
+
+    def get_jobs_progress(self) -> Dict[Optional[str], Dict]:
+        """Zwraca postęp wszystkich jobów"""
+        with self._lock:
+            return {job_id: job.get_progress() for job_id, job in self._jobs.items()}
+
+    @property
+    def unfinished(self) -> int:
+        """Liczba zadań oczekujących lub w trakcie przetwarzania"""
+        with self._lock:
+            return self._unfinished
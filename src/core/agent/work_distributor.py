@@ -1,73 +1,334 @@
 # src/core/agent/work_distributor.py
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 import threading
 import time
+import uuid
 
 from .agent_manager import AgentManager
-from src.utils import logger
+from .concurrency_controller import ConcurrencyController, ConcurrencySettings
+from .process_pool import ProcessAgentPool
+from src.core.scraping import LandRegisterScraper
+from src.core.scraping.rate_limiter import get_rate_limiter
+from src.core.scraping.proxy_pool import get_proxy_pool
+from src.core.drivers import get_driver_pool, SeleniumAdapter
+from src.core.storage import get_task_journal, get_download_index, enabled_extensions, TaskState
+from src.utils import logger, KWNumberHelper
 from src.config.config_manager import ConfigManager
 
+
+def _corrected_kw_number(kw_number: str) -> str:
+    """Numer KW z poprawioną cyfrą kontrolną - pod nim scraper zapisuje pliki"""
+    try:
+        court, number, _ = kw_number.split("/")
+        return KWNumberHelper.correct_kw_number(court, number)
+    except ValueError:
+        return kw_number
+
+
 class WorkDistributor:
     """
     Klasa odpowiedzialna za dystrybucję pracy między agentami
+
+    Obsługuje dwa tryby wykonania (klucz "execution_mode" w konfiguracji):
+    "thread" - agenci jako wątki jednego procesu (domyślnie),
+    "process" - agenci w osobnych procesach, każdy z własną przeglądarką.
+
+    Stan każdego numeru KW jest zapisywany w dzienniku zadań (SQLite), więc
+    po awarii resume() dodaje do kolejki tylko numery jeszcze nieprzetworzone.
+    Dziennik można wyłączyć kluczem "journal".
     """
 
     def __init__(self):
         self.config = ConfigManager()
-        self.agent_manager = AgentManager()
+        self.journal = get_task_journal() if self.config.get("journal", True) else None
+        self.agent_manager = AgentManager(self.journal)
+        self.process_pool: Optional[ProcessAgentPool] = None
+        self.concurrency_controller: Optional[ConcurrencyController] = None
+        self.execution_mode = self.config.get("execution_mode", "thread")
         self.is_running = False
         self.lock = threading.Lock()
 
         # Utworzenie początkowej puli agentów
         self._initialize_agents()
 
+    def _get_thread_count(self) -> int:
+        """
+        Zwraca liczbę agentów z konfiguracji (wartość może być zapisana jako tekst)
+
+        W silniku HTTP agent-wątek tylko czeka na wynik KW pobieranej we wspólnej
+        pętli asyncio, więc liczba agentów to liczba KW pobieranych jednocześnie.
+        W trybie wątkowym agentów jest wtedy co najmniej "http_agents" (domyślnie 100).
+        """
+        count = self._config_int("threads", 1)
+        if self.config.get("engine", "selenium") == "http" and self.execution_mode == "thread":
+            count = max(count, self._config_int("http_agents", 100))
+        return count
+
+    def _config_int(self, key: str, default: int) -> int:
+        """Liczba dodatnia z konfiguracji (wartość może być zapisana jako tekst)"""
+        value = self.config.get(key, default)
+        try:
+            return max(1, int(float(value)))
+        except (TypeError, ValueError):
+            return default
+
     def _initialize_agents(self):
         """Inicjalizuje początkową pulę agentów"""
-        num_agents = self.config.get("threads", 1)
+        num_agents = self._get_thread_count()
+        if self.execution_mode == "process":
+            self.process_pool = ProcessAgentPool(num_agents, self.journal)
+            return
+
+        if self.config.get("adaptive_threads", False):
+            settings = ConcurrencySettings(
+                min_agents=int(self.config.get("min_threads", 1)),
+                max_agents=int(self.config.get("max_threads", 32)),
+                interval=float(self.config.get("adaptive_interval", 30))
+            )
+            num_agents = min(max(num_agents, settings.min_agents), settings.max_agents)
+            self.concurrency_controller = ConcurrencyController(self.agent_manager, settings)
+
         for _ in range(num_agents):
             self.agent_manager.create_agent()
 
-    def start_processing(self, kw_numbers: List[str]):
+        # Przeglądarki uruchamiają się w tle, zanim agenci dostaną pierwsze zadania
+        if self.config.get("engine", "selenium") == "selenium":
+            if self.config.get("browser", "chrome") in ("chrome", "edge") and self.config.get("shared_driver_service", True):
+                SeleniumAdapter.prepare_profiles(num_agents)
+            pool = get_driver_pool(LandRegisterScraper.create_driver)
+            if pool:
+                pool.warm_up(num_agents)
+
+    def start_processing(
+        self,
+        kw_numbers: List[str],
+        job_id: Optional[str] = None,
+        name: str = "",
+        weight: float = 1.0,
+        priority: int = 0
+    ):
         """
-        Rozpoczyna przetwarzanie listy numerów KW
+        Rozpoczyna przetwarzanie listy numerów KW jako osobnego joba
 
         Args:
             kw_numbers: Lista numerów KW do przetworzenia
+            job_id: ID joba (None - nowy job)
+            name: Nazwa joba wyświetlana przy wznawianiu
+            weight: Udział joba w agentach względem innych jobów
+            priority: Joby o wyższym priorytecie są obsługiwane w pierwszej kolejności
+
+        Returns:
+            Lista ID zadań
         """
+        kw_numbers = self._skip_downloaded(kw_numbers)
+        job_id = job_id or str(uuid.uuid4())
+
         with self.lock:
-            self.is_running = True
+            if self.journal:
+                self.journal.add_job(job_id, kw_numbers, name, params={"weight": weight, "priority": priority})
 
-            # Uruchom wszystkich agentów
-            self.agent_manager.start_all_agents()
+            self._get_scheduler().set_job(job_id, weight, priority)
+            task_ids = self._enqueue(kw_numbers, job_id)
+            logger.log_info(f"Rozpoczęto przetwarzanie {len(kw_numbers)} numerów KW")
 
-            # Dodaj zadania do kolejki
-            task_ids = self.agent_manager.add_tasks_batch(kw_numbers)
+            return task_ids
 
-            logger.log_info(f"Rozpoczęto przetwarzanie {len(kw_numbers)} numerów KW")
+    def resume(self, job_id: Optional[str] = None) -> List[str]:
+        """
+        Wznawia przerwane joby z dziennika zadań
+
+        Do kolejki trafiają tylko numery KW, które nie zostały jeszcze pobrane
+        ani ostatecznie odrzucone.
+
+        Args:
+            job_id: ID joba do wznowienia (None - wszystkie niezakończone)
+
+        Returns:
+            Lista ID zadań
+        """
+        if not self.journal:
+            logger.log_error("Dziennik zadań jest wyłączony - nie można wznowić pracy")
+            return []
+
+        jobs = self.journal.get_unfinished_jobs()
+        job_ids = [job_id] if job_id else list(jobs)
+
+        with self.lock:
+            task_ids = []
+            for pending_job_id in job_ids:
+                kw_numbers = self._skip_downloaded(self.journal.iter_pending(pending_job_id))
+                if kw_numbers:
+                    params = jobs.get(pending_job_id, {}).get("params", {})
+                    self._get_scheduler().set_job(
+                        pending_job_id, params.get("weight", 1.0), params.get("priority", 0)
+                    )
+                    task_ids.extend(self._enqueue(kw_numbers, pending_job_id))
+                    logger.log_info(f"Wznowiono job {pending_job_id}: {len(kw_numbers)} numerów KW do pobrania")
 
             return task_ids
 
+    def get_interrupted_jobs(self) -> Dict[str, dict]:
+        """
+        Zwraca przerwane joby z dziennika zadań, które mają numery KW do pobrania
+
+        Returns:
+            Słownik job_id -> opis joba (name, type, params) z liczbą KW do pobrania (pending)
+        """
+        if not self.journal:
+            return {}
+
+        jobs = {}
+        for job_id, job in self.journal.get_unfinished_jobs().items():
+            counts = self.journal.get_job_counts(job_id)
+            pending = sum(count for state, count in counts.items() if state not in TaskState.TERMINAL)
+            if pending:
+                jobs[job_id] = {**job, "pending": pending}
+        return jobs
+
+    def get_job_progress(self, job_id: str) -> Optional[dict]:
+        """
+        Zwraca postęp joba
+
+        Returns:
+            Słownik z licznikami total, queued, in_flight, completed, failed,
+            retried lub None, jeśli job nie istnieje
+        """
+        return self._get_scheduler().get_job_progress(job_id)
+
+    def set_job(self, job_id: str, weight: float = 1.0, priority: int = 0):
+        """Zmienia wagę i priorytet działającego joba"""
+        self._get_scheduler().set_job(job_id, weight, priority)
+        logger.log_info(f"Job {job_id}: waga {weight}, priorytet {priority}")
+
+    def pause_job(self, job_id: str):
+        """Wstrzymuje wydawanie zadań joba - pozostałe joby działają dalej"""
+        self._get_scheduler().pause_job(job_id)
+        logger.log_info(f"Wstrzymano job {job_id}")
+
+    def resume_job(self, job_id: str):
+        """Wznawia wstrzymany job"""
+        self._get_scheduler().resume_job(job_id)
+        logger.log_info(f"Wznowiono job {job_id}")
+
+    def cancel_job(self, job_id: str) -> int:
+        """
+        Anuluje job - usuwa jego oczekujące zadania (bieżące zostaną dokończone)
+
+        Returns:
+            Liczba usuniętych zadań
+        """
+        removed = self._get_scheduler().remove_job(job_id)
+        if self.journal:
+            self.journal.finish_job(job_id)
+        logger.log_info(f"Anulowano job {job_id}: usunięto {removed} zadań")
+        return removed
+
+    def _get_scheduler(self):
+        """Zwraca kolejkę zadań aktywnego trybu wykonania"""
+        if self.process_pool:
+            return self.process_pool.scheduler
+        return self.agent_manager.scheduler
+
+    def _skip_downloaded(self, kw_numbers) -> List[str]:
+        """Pomija numery KW, które są już pobrane (przy włączonej opcji already_exist)"""
+        kw_numbers = list(kw_numbers)
+        if not self.config.get("already_exist", False):
+            return kw_numbers
+
+        missing = get_download_index().filter_missing(
+            kw_numbers, enabled_extensions(self.config), key=_corrected_kw_number
+        )
+        skipped = len(kw_numbers) - len(missing)
+        if skipped:
+            logger.log_info(f"Pominięto {skipped} już pobranych numerów KW")
+        return missing
+
+    def _enqueue(self, kw_numbers: List[str], job_id: Optional[str]) -> List[str]:
+        """Uruchamia agentów (jeśli trzeba) i dodaje zadania do kolejki"""
+        self.is_running = True
+
+        if self.process_pool:
+            self.process_pool.start()
+            return self.process_pool.add_tasks(kw_numbers, job_id)
+
+        # Uruchom wszystkich agentów
+        self.agent_manager.start_all_agents()
+
+        # Dodaj zadania do kolejki
+        task_ids = self.agent_manager.add_tasks_batch(kw_numbers, job_id)
+
+        if self.concurrency_controller:
+            self.concurrency_controller.start()
+
+        return task_ids
+
     def stop_processing(self):
         """Zatrzymuje przetwarzanie"""
         with self.lock:
             self.is_running = False
-            self.agent_manager.stop_all_agents()
+            if self.process_pool:
+                self.process_pool.stop()
+            else:
+                if self.concurrency_controller:
+                    self.concurrency_controller.stop()
+                self.agent_manager.stop_all_agents()
+            if self.journal:
+                self.journal.flush()
             logger.log_info("Zatrzymano przetwarzanie")
 
+    def replay_dead_letters(self, error_types: Optional[List[str]] = None) -> List[str]:
+        """
+        Ponownie przetwarza zadania z magazynu nieudanych zadań
+
+        Args:
+            error_types: Tylko zadania z tymi rodzajami błędów (None - wszystkie)
+
+        Returns:
+            Lista ID nowych zadań
+        """
+        kw_numbers = self.agent_manager.dead_letters.replay(error_types)
+        if not kw_numbers:
+            return []
+
+        logger.log_info(f"Ponowne przetwarzanie {len(kw_numbers)} nieudanych KW")
+        return self.start_processing(kw_numbers)
+
+    def _get_rate_limiter_stats(self) -> Optional[dict]:
+        """Statystyki limitera zapytań - w trybie procesowym zebrane z procesów roboczych"""
+        if self.process_pool:
+            return self.process_pool.get_rate_limiter_stats()
+        rate_limiter = get_rate_limiter()
+        return rate_limiter.get_stats() if rate_limiter else None
+
     def get_progress(self) -> dict:
         """Zwraca postęp przetwarzania"""
-        statuses = self.agent_manager.get_all_agents_status()
+        if self.process_pool:
+            statuses = self.process_pool.get_all_statuses()
+            queue_size = self.process_pool.get_queue_size()
+        else:
+            statuses = self.agent_manager.get_all_agents_status()
+            queue_size = self.agent_manager.get_queue_size()
 
         total_completed = sum(s["tasks_completed"] for s in statuses.values())
         total_failed = sum(s["tasks_failed"] for s in statuses.values())
-        total_tasks = sum(s["queue_size"] for s in statuses.values()) + total_completed + total_failed
+        total_retried = sum(s["tasks_retried"] for s in statuses.values())
+        in_flight = sum(1 for s in statuses.values() if s["current_task"])
+        total_tasks = queue_size + in_flight + total_completed + total_failed
+
+        proxy_pool = get_proxy_pool()
 
         return {
             "total_tasks": total_tasks,
             "completed": total_completed,
             "failed": total_failed,
+            "retried": total_retried,
             "in_progress": total_tasks - (total_completed + total_failed),
             "success_rate": f"{(total_completed / total_tasks * 100):.2f}%" if total_tasks > 0 else "N/A",
-            "agent_statuses": statuses
+            "agent_statuses": statuses,
+            "rate_limiter": self._get_rate_limiter_stats(),
+            "proxies": proxy_pool.get_stats() if proxy_pool and not self.process_pool else None,
+            "network": SeleniumAdapter.get_total_network_stats() if not self.process_pool else None,
+            "waits": LandRegisterScraper.get_wait_stats() if not self.process_pool else None,
+            "startup": SeleniumAdapter.get_startup_stats() if not self.process_pool else None
         }
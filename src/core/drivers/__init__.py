@@ -1,5 +1,11 @@
-from .webdriver_adapter import WebDriverAdapter, WebDriverOptions
+from .webdriver_adapter import WebDriverAdapter, WebDriverOptions, NetworkStats, DEFAULT_BLOCKED_URLS
 from .selenium_adapter import SeleniumAdapter
+from .playwright_adapter import PlaywrightAdapter
+from .replay_adapter import FixtureStore, RecordingAdapter, ReplayAdapter
 from .driver_factory import DriverFactory
+from .driver_pool import DriverPool, get_driver_pool, close_driver_pool
 
-__all__ = ['WebDriverAdapter', 'WebDriverOptions', 'SeleniumAdapter', 'DriverFactory']
+__all__ = ['WebDriverAdapter', 'WebDriverOptions', 'NetworkStats', 'DEFAULT_BLOCKED_URLS',
+           'SeleniumAdapter', 'PlaywrightAdapter', 'FixtureStore', 'RecordingAdapter',
+           'ReplayAdapter', 'DriverFactory', 'DriverPool',
+           'get_driver_pool', 'close_driver_pool']
\ No newline at end of file
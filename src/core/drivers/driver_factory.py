@@ -1,6 +1,12 @@
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 from .webdriver_adapter import WebDriverAdapter, WebDriverOptions
 from .selenium_adapter import SeleniumAdapter
+from .playwright_adapter import PlaywrightAdapter
+from .replay_adapter import create_recording_driver, create_replay_driver
+
+# Domyślny katalog nagranych sesji (tryby 'record' i 'replay')
+DEFAULT_FIXTURE_PATH = Path("resources/fixtures")
 
 class DriverFactory:
     """Fabryka do tworzenia instancji WebDrivera"""
@@ -11,17 +17,30 @@ class DriverFactory:
         headless: bool = False,
         proxy: Optional[str] = None,
         load_images: bool = True,
-        user_agent: Optional[str] = None
+        user_agent: Optional[str] = None,
+        blocked_urls: Optional[List[str]] = None,
+        network_stats: bool = False,
+        fixture_path: Optional[Path] = None,
+        replay_latency: float = 0.0,
+        shared_service: bool = True
     ) -> WebDriverAdapter:
         """
         Tworzy i konfiguruje instancję WebDrivera
 
         Args:
-            browser_type: Typ przeglądarki ('chrome', 'firefox', 'edge')
+            browser_type: Typ przeglądarki ('chrome', 'firefox', 'edge') albo 'playwright'
+                          ('playwright-firefox', 'playwright-webkit') - kontekst we wspólnej
+                          przeglądarce Playwright, 'record' ('record-firefox' itd.) - nagrywanie
+                          sesji przeglądarki, 'replay' - odtwarzanie nagrania bez przeglądarki
             headless: Czy uruchomić w trybie headless
             proxy: Adres proxy (opcjonalnie)
             load_images: Czy ładować obrazy
             user_agent: Własny user agent (opcjonalnie)
+            blocked_urls: Wzorce adresów blokowanych zasobów (opcjonalnie)
+            network_stats: Czy zliczać ruch sieciowy
+            fixture_path: Katalog nagranych sesji (tryby 'record' i 'replay')
+            replay_latency: Sztuczne opóźnienie każdej nawigacji przy odtwarzaniu (sekundy)
+            shared_service: Czy przeglądarki Chrome/Edge mają być sesjami jednego sterownika
 
         Returns:
             Skonfigurowana instancja WebDriverAdapter
@@ -30,9 +49,30 @@ class DriverFactory:
             headless=headless,
             proxy=proxy,
             load_images=load_images,
-            user_agent=user_agent
+            user_agent=user_agent,
+            blocked_urls=blocked_urls or [],
+            network_stats=network_stats,
+            shared_service=shared_service
         )
 
-        driver = SeleniumAdapter(browser_type)
+        fixture_path = Path(fixture_path or DEFAULT_FIXTURE_PATH)
+        if browser_type == "replay":
+            driver = create_replay_driver(fixture_path, replay_latency)
+        elif browser_type.startswith("record"):
+            _, _, browser = browser_type.partition("-")
+            driver = create_recording_driver(
+                DriverFactory.create_driver(browser or "chrome", headless, proxy, load_images,
+                                            user_agent, blocked_urls, network_stats,
+                                            shared_service=shared_service),
+                fixture_path
+            )
+            driver.proxy = proxy
+            return driver
+        elif browser_type.startswith("playwright"):
+            _, _, engine = browser_type.partition("-")
+            driver = PlaywrightAdapter(engine or "chromium")
+        else:
+            driver = SeleniumAdapter(browser_type)
         driver.initialize(options)
+        driver.proxy = proxy
         return driver
@@ -0,0 +1,301 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+import atexit
+import threading
+import time
+
+from .webdriver_adapter import WebDriverAdapter
+from src.utils import logger
+from src.utils.metrics import TimingHistogram
+
+
+class DriverPool:
+    """
+    Pula uruchomionych wcześniej przeglądarek
+
+    Uruchomienie Chrome trwa kilka sekund, a długo działająca przeglądarka
+    zużywa coraz więcej pamięci. Pula trzyma zapas gotowych przeglądarek
+    uruchamianych w tle, sprawdza ich stan przy wydawaniu i wymienia
+    przeglądarkę po obsłużeniu `max_pages` KW albo po przekroczeniu
+    `max_rss_mb` MB pamięci. Agent dostaje wtedy od razu przeglądarkę
+    z zapasu, a stara jest zamykana w tle.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], WebDriverAdapter],
+        spare: int = 1,
+        max_pages: int = 500,
+        max_rss_mb: float = 0,
+        max_launching: int = 8
+    ):
+        """
+        Args:
+            factory: Funkcja tworząca nową przeglądarkę
+            spare: Liczba gotowych przeglądarek trzymanych w zapasie
+            max_pages: Liczba KW, po której przeglądarka jest wymieniana (0 - bez limitu)
+            max_rss_mb: Limit pamięci przeglądarki w MB (0 - bez limitu, wymaga psutil)
+            max_launching: Maksymalna liczba przeglądarek uruchamianych jednocześnie
+        """
+        self.factory = factory
+        self.spare = max(0, spare)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+
+        self._idle: List[WebDriverAdapter] = []
+        self._pages: Dict[int, int] = {}
+        self._launching = 0
+        self._waiting = 0
+        self._closed = False
+        self._launch_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_launching), thread_name_prefix="driver-pool")
+
+        # Statystyki
+        self.launched = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.launch_time = 0.0
+        self.launch_times = TimingHistogram()
+
+        # Rozgrzewanie - liczba przeglądarek do uruchomienia i czas rozpoczęcia
+        self._warm_pending = 0
+        self._warm_count = 0
+        self._warm_started = 0.0
+        self.warm_up_time: Optional[float] = None
+
+    def warm_up(self, count: int):
+        """Uruchamia równolegle w tle przeglądarki dla `count` agentów (oprócz zapasu)"""
+        with self._lock:
+            missing = max(0, count + self.spare - len(self._idle) - self._launching)
+            if missing and not self._warm_pending:
+                self._warm_started = time.perf_counter()
+                self._warm_count = 0
+            self._warm_pending += missing
+            for _ in range(missing):
+                self._launch()
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriverAdapter:
+        """
+        Wydaje sprawną przeglądarkę (czeka, jeśli żadna nie jest gotowa)
+
+        Raises:
+            TimeoutError: Gdy w czasie `timeout` nie udało się uzyskać przeglądarki
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._available:
+                if self._closed:
+                    raise RuntimeError("Pula przeglądarek została zamknięta")
+
+                self._waiting += 1
+                try:
+                    while not self._idle:
+                        self._top_up()
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError("Brak wolnej przeglądarki w puli")
+                        self._available.wait(remaining)
+                        if self._closed:
+                            raise RuntimeError("Pula przeglądarek została zamknięta")
+                        if self._launch_error and not self._idle and not self._launching:
+                            error, self._launch_error = self._launch_error, None
+                            raise RuntimeError(f"Nie udało się uruchomić przeglądarki: {error}") from error
+                    driver = self._idle.pop()
+                finally:
+                    self._waiting -= 1
+
+                # Uzupełniamy zapas po wydaniu przeglądarki
+                self._top_up()
+
+            if driver.is_alive():
+                return driver
+            self.discard(driver)
+
+    def release(self, driver: WebDriverAdapter):
+        """Zwraca przeglądarkę do puli (np. przy zatrzymaniu agenta)"""
+        if driver is None:
+            return
+        if self._should_recycle(driver):
+            self._retire(driver)
+            return
+
+        with self._available:
+            if not self._closed:
+                self._idle.append(driver)
+                self._available.notify()
+                return
+        driver.quit()
+
+    def checkpoint(self, driver: WebDriverAdapter) -> WebDriverAdapter:
+        """
+        Zalicza obsłużoną KW i wymienia przeglądarkę, jeśli osiągnęła limit
+
+        Returns:
+            Ta sama przeglądarka albo nowa z zapasu
+        """
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+
+        if not self._should_recycle(driver):
+            return driver
+
+        self.recycled += 1
+        self._retire(driver)
+        return self.acquire()
+
+    def discard(self, driver: WebDriverAdapter):
+        """Zamyka uszkodzoną przeglądarkę i uruchamia zastępczą"""
+        self.discarded += 1
+        logger.log_info("Pula przeglądarek: odrzucono niesprawną przeglądarkę")
+        self._retire(driver)
+
+    def _should_recycle(self, driver: WebDriverAdapter) -> bool:
+        """Czy przeglądarka osiągnęła limit stron lub pamięci"""
+        if self.max_pages and self._pages.get(id(driver), 0) >= self.max_pages:
+            return True
+        if self.max_rss_mb:
+            rss = driver.get_memory_usage()
+            if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                return True
+        return False
+
+    def _retire(self, driver: WebDriverAdapter):
+        """Zamyka przeglądarkę w tle i uzupełnia zapas"""
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self._top_up()
+        try:
+            self._executor.submit(driver.quit)
+        except RuntimeError:
+            # Pula jest już zamykana
+            driver.quit()
+
+    def _top_up(self):
+        """Uruchamia przeglądarki brakujące do zapasu (wywoływane pod blokadą)"""
+        if self._closed:
+            return
+        missing = self.spare + self._waiting - len(self._idle) - self._launching
+        for _ in range(max(0, missing)):
+            self._launch()
+
+    def _launch(self):
+        """Zleca uruchomienie przeglądarki w tle (wywoływane pod blokadą)"""
+        self._launching += 1
+        self._executor.submit(self._launch_worker)
+
+    def _launch_worker(self):
+        """Uruchamia przeglądarkę i dodaje ją do puli"""
+        driver = None
+        error = None
+        start = time.perf_counter()
+        try:
+            driver = self.factory()
+        except Exception as e:
+            error = e
+            logger.log_error(f"Pula przeglądarek: błąd podczas uruchamiania przeglądarki: {e}")
+        elapsed = time.perf_counter() - start
+
+        with self._available:
+            self._launching -= 1
+            self._count_warm_up(driver is not None)
+            if driver is None:
+                # Czekający na przeglądarkę dostaną błąd zamiast czekać w nieskończoność
+                self._launch_error = error
+                self._available.notify_all()
+                return
+            if not self._closed:
+                self.launched += 1
+                self.launch_time += elapsed
+                self.launch_times.observe(elapsed)
+                self._launch_error = None
+                self._idle.append(driver)
+                self._available.notify()
+                return
+        driver.quit()
+
+    def _count_warm_up(self, launched: bool):
+        """Zapisuje czas rozgrzewania po uruchomieniu ostatniej przeglądarki (wywoływane pod blokadą)"""
+        if not self._warm_pending:
+            return
+        self._warm_pending -= 1
+        self._warm_count += int(launched)
+        if not self._warm_pending:
+            self.warm_up_time = time.perf_counter() - self._warm_started
+            logger.log_info(
+                f"Pula przeglądarek: uruchomiono {self._warm_count} przeglądarek w {self.warm_up_time:.2f}s"
+            )
+
+    def get_stats(self) -> Dict:
+        """Zwraca statystyki puli"""
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "launching": self._launching,
+                "launched": self.launched,
+                "recycled": self.recycled,
+                "discarded": self.discarded,
+                "avg_launch_time": self.launch_time / self.launched if self.launched else None,
+                "launch_times": self.launch_times.snapshot(),
+                "warm_up_time": self.warm_up_time,
+            }
+
+    def close(self):
+        """Zamyka wszystkie przeglądarki w zapasie"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+
+        for driver in idle:
+            driver.quit()
+        self._executor.shutdown(wait=True)
+        logger.log_info("Zamknięto pulę przeglądarek")
+
+
+_shared_pool: Optional[DriverPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_driver_pool(factory: Callable[[], WebDriverAdapter]) -> Optional[DriverPool]:
+    """
+    Zwraca pulę przeglądarek współdzieloną w procesie (None, gdy pula wyłączona)
+
+    Konfiguracja:
+        driver_pool - czy używać puli (domyślnie tak)
+        driver_pool_spare - liczba gotowych przeglądarek w zapasie
+        driver_recycle_pages - liczba KW, po której przeglądarka jest wymieniana
+        driver_recycle_rss_mb - limit pamięci przeglądarki w MB
+        driver_pool_launching - liczba przeglądarek uruchamianych jednocześnie
+    """
+    global _shared_pool
+    from src.config.config_manager import ConfigManager
+
+    config = ConfigManager()
+    if not config.get("driver_pool", True):
+        return None
+
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool(
+                factory,
+                spare=int(config.get("driver_pool_spare", 1)),
+                max_pages=int(config.get("driver_recycle_pages", 500)),
+                max_rss_mb=float(config.get("driver_recycle_rss_mb", 0)),
+                max_launching=int(config.get("driver_pool_launching", 8))
+            )
+            # Przeglądarki z zapasu nie mogą przeżyć programu
+            atexit.register(close_driver_pool)
+        return _shared_pool
+
+
+def close_driver_pool():
+    """Zamyka współdzieloną pulę przeglądarek"""
+    global _shared_pool
+
+    with _shared_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool:
+        pool.close()
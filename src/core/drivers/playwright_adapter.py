@@ -0,0 +1,318 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import atexit
+import re
+import threading
+import time
+
+from .webdriver_adapter import WebDriverAdapter, WebDriverOptions
+from src.utils import logger
+
+# Zamiana strategii wyszukiwania Selenium na selektory Playwright
+_SELECTORS = {
+    "ID": lambda value: f'[id="{value}"]',
+    "NAME": lambda value: f'[name="{value}"]',
+    "XPATH": lambda value: f"xpath={value}",
+    "CSS_SELECTOR": lambda value: value,
+    "TAG_NAME": lambda value: value,
+    "CLASS_NAME": lambda value: f".{value}",
+}
+
+# Typy zasobów blokowanych przy wyłączonych obrazach
+_IMAGE_RESOURCES = ("image", "media")
+
+# Limit czasu pojedynczej operacji w pętli Playwright (w sekundach) - powyżej
+# domyślnego limitu akcji Playwright (30 s); zawieszona przeglądarka nie blokuje
+# wątku agenta na zawsze
+COMMAND_TIMEOUT = 60
+
+# Zapas ponad limit czasu Playwright, po którym przestajemy czekać na wynik operacji
+TIMEOUT_MARGIN = 5
+
+
+def _to_selector(by: str, value: str) -> str:
+    """Zwraca selektor Playwright odpowiadający wyszukiwaniu Selenium (by, value)"""
+    try:
+        return _SELECTORS[by](value)
+    except KeyError:
+        raise ValueError(f"Nieobsługiwana strategia wyszukiwania: {by}")
+
+
+def _pattern_to_regex(pattern: str) -> "re.Pattern":
+    """Zamienia wzorzec z "*" (jak w Network.setBlockedURLs) na wyrażenie regularne"""
+    return re.compile(".*".join(re.escape(part) for part in pattern.split("*")))
+
+
+class _PlaywrightRuntime:
+    """
+    Przeglądarka Playwright współdzielona przez adaptery w procesie
+
+    API Playwright jest asynchroniczne i przywiązane do jednej pętli asyncio,
+    więc pętla działa w osobnym wątku, a adaptery (wywoływane z wątków agentów)
+    zlecają jej operacje przez run(). Każda para (przeglądarka, tryb headless)
+    ma własną instancję, a przeglądarka, która się zamknęła lub uległa awarii,
+    jest uruchamiana od nowa przy kolejnym shared().
+    """
+
+    _shared: Dict[Tuple[str, bool], "_PlaywrightRuntime"] = {}
+    _shared_lock = threading.Lock()
+    _atexit_registered = False
+
+    def __init__(self, browser_name: str, headless: bool):
+        self.browser_name = browser_name
+        self.headless = headless
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="playwright", daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self.browser = None
+        try:
+            self.run(self._start())
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def shared(cls, browser_name: str, headless: bool) -> "_PlaywrightRuntime":
+        """Zwraca (uruchamiając przy pierwszym użyciu lub po awarii) przeglądarkę współdzieloną"""
+        key = (browser_name, headless)
+        broken = None
+        with cls._shared_lock:
+            runtime = cls._shared.get(key)
+            if runtime is not None and not runtime.is_connected():
+                logger.log_error(f"Przeglądarka Playwright ({browser_name}) przestała działać - uruchamianie od nowa")
+                broken = cls._shared.pop(key)
+                runtime = None
+            if runtime is None:
+                runtime = cls._shared[key] = cls(browser_name, headless)
+                if not cls._atexit_registered:
+                    atexit.register(cls.close_shared)
+                    cls._atexit_registered = True
+
+        if broken:
+            broken.close()
+        return runtime
+
+    @classmethod
+    def close_shared(cls):
+        """Zamyka wszystkie przeglądarki współdzielone"""
+        with cls._shared_lock:
+            runtimes, cls._shared = list(cls._shared.values()), {}
+        for runtime in runtimes:
+            runtime.close()
+
+    def is_connected(self) -> bool:
+        """Czy pętla Playwright działa i przeglądarka jest połączona"""
+        return bool(self._thread.is_alive() and self.browser and self.browser.is_connected())
+
+    async def _start(self):
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError:
+            raise ImportError(
+                "Brak pakietu playwright - zainstaluj: pip install playwright && playwright install chromium"
+            )
+
+        self._playwright = await async_playwright().start()
+        browser_type = getattr(self._playwright, self.browser_name)
+        self.browser = await browser_type.launch(headless=self.headless)
+        logger.log_info(f"Uruchomiono przeglądarkę Playwright ({self.browser_name})")
+
+    def run(self, coroutine, timeout: float = COMMAND_TIMEOUT) -> Any:
+        """
+        Wykonuje korutynę w pętli Playwright i czeka na wynik
+
+        Po `timeout` sekundach operacja jest anulowana i zgłaszany jest TimeoutError.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Przeglądarka Playwright nie odpowiedziała w czasie {timeout}s")
+
+    def close(self):
+        async def stop():
+            if self.browser:
+                await self.browser.close()
+            if self._playwright:
+                await self._playwright.stop()
+
+        try:
+            if self._thread.is_alive():
+                self.run(stop())
+        except Exception as e:
+            logger.log_error(f"Błąd podczas zamykania przeglądarki Playwright: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class PlaywrightElement:
+    """Element strony z synchronicznym API zgodnym z WebElement z Selenium"""
+
+    def __init__(self, runtime: _PlaywrightRuntime, handle):
+        self._runtime = runtime
+        self.handle = handle
+
+    @property
+    def text(self) -> str:
+        return self._runtime.run(self.handle.inner_text())
+
+    def click(self):
+        self._runtime.run(self.handle.click())
+
+    def clear(self):
+        self._runtime.run(self.handle.fill(""))
+
+    def send_keys(self, value: str):
+        self._runtime.run(self.handle.type(str(value)))
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._runtime.run(self.handle.get_attribute(name))
+
+    def is_enabled(self) -> bool:
+        return self._runtime.run(self.handle.is_enabled())
+
+
+class PlaywrightAdapter(WebDriverAdapter):
+    """
+    Implementacja WebDriverAdapter dla Playwright
+
+    Każdy adapter to osobny kontekst (izolowane ciasteczka i pamięć podręczna)
+    w jednej wspólnej przeglądarce, zamiast osobnego procesu Chrome
+    i chromedrivera na agenta. Kontekst zajmuje kilkanaście MB, więc na tej
+    samej pamięci można uruchomić wielokrotnie więcej agentów.
+
+    Wymaga pakietu playwright (pip install playwright && playwright install chromium).
+    """
+
+    def __init__(self, browser_name: str = "chromium"):
+        self.browser_name = browser_name
+        self.runtime: Optional[_PlaywrightRuntime] = None
+        self.context = None
+        self.page = None
+        self.options: Optional[WebDriverOptions] = None
+
+    def initialize(self, options: WebDriverOptions) -> None:
+        try:
+            self.options = options
+            self.runtime = _PlaywrightRuntime.shared(self.browser_name, options.headless)
+            self.context, self.page = self.runtime.run(self._open_context(options))
+        except Exception as e:
+            logger.log_error(f"Błąd podczas inicjalizacji kontekstu Playwright: {e}")
+            raise
+
+    async def _open_context(self, options: WebDriverOptions):
+        """Tworzy kontekst z własnym proxy, user agentem i blokadą zasobów"""
+        context_options = {}
+        if options.user_agent:
+            context_options["user_agent"] = options.user_agent
+        if options.proxy:
+            server = options.proxy if "://" in options.proxy else f"http://{options.proxy}"
+            context_options["proxy"] = {"server": server}
+
+        context = await self.runtime.browser.new_context(**context_options)
+        context.set_default_navigation_timeout(options.page_load_timeout * 1000)
+
+        blocked = [_pattern_to_regex(pattern) for pattern in options.blocked_urls]
+        if blocked or not options.load_images:
+            async def block(route):
+                request = route.request
+                if (not options.load_images and request.resource_type in _IMAGE_RESOURCES) or \
+                        any(regex.fullmatch(request.url) for regex in blocked):
+                    await route.abort("blockedbyclient")
+                else:
+                    await route.continue_()
+
+            await context.route("**/*", block)
+
+        page = await context.new_page()
+        return context, page
+
+    def quit(self) -> None:
+        try:
+            if self.context:
+                self.runtime.run(self.context.close())
+        except Exception as e:
+            logger.log_error(f"Błąd podczas zamykania kontekstu Playwright: {e}")
+        finally:
+            self.context = None
+            self.page = None
+
+    def is_alive(self) -> bool:
+        return bool(self.page and not self.page.is_closed() and self.runtime.is_connected())
+
+    def _navigation_timeout(self) -> float:
+        """Limit czasu oczekiwania na nawigację (Playwright sam przerywa ją po page_load_timeout)"""
+        return self.options.page_load_timeout + TIMEOUT_MARGIN
+
+    def get(self, url: str) -> None:
+        try:
+            self.runtime.run(self.page.goto(url, wait_until="load"), timeout=self._navigation_timeout())
+        except Exception as e:
+            logger.log_error(f"Błąd podczas ładowania strony {url}: {e}")
+            raise
+
+    def find_element(self, by: str, value: str, timeout: int = 10) -> Any:
+        selector = _to_selector(by, value)
+        try:
+            handle = self.runtime.run(
+                self.page.wait_for_selector(selector, state="attached", timeout=timeout * 1000),
+                timeout=timeout + TIMEOUT_MARGIN
+            )
+            return PlaywrightElement(self.runtime, handle)
+        except Exception as e:
+            if "timeout" in type(e).__name__.lower():
+                logger.log_error(f"Timeout podczas szukania elementu {by}={value}")
+                raise TimeoutError(f"Nie znaleziono elementu {by}={value} w czasie {timeout}s") from e
+            logger.log_error(f"Błąd podczas szukania elementu {by}={value}: {e}")
+            raise
+
+    def find_elements(self, by: str, value: str) -> list:
+        handles = self.runtime.run(self.page.query_selector_all(_to_selector(by, value)))
+        return [PlaywrightElement(self.runtime, handle) for handle in handles]
+
+    def get_page_source(self) -> str:
+        return self.runtime.run(self.page.content())
+
+    def execute_script(self, script: str, *args) -> Any:
+        # Skrypty pisane dla Selenium używają `arguments` i `return` - opakowujemy je w funkcję
+        wrapped = f"(args) => (function() {{ {script} }}).apply(null, args)"
+        values = [arg.handle if isinstance(arg, PlaywrightElement) else arg for arg in args]
+        # Skrypt może czekać na zapytania (PARALLEL_SECTIONS_SCRIPT) - limit jak dla nawigacji
+        return self.runtime.run(self.page.evaluate(wrapped, values), timeout=self._navigation_timeout())
+
+    def back(self) -> None:
+        self.runtime.run(self.page.go_back(), timeout=self._navigation_timeout())
+
+    def get_current_url(self) -> str:
+        return self.page.url
+
+    def wait_until(self, condition: Callable[[], Any], timeout: float) -> Any:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                result = condition()
+                if result:
+                    return result
+            except Exception:
+                # Strona może być w trakcie nawigacji - sprawdzamy ponownie
+                pass
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Przekroczono czas oczekiwania ({timeout}s)")
+            time.sleep(0.05)
+
+    def is_stale(self, element: Any) -> bool:
+        try:
+            return not self.runtime.run(element.handle.evaluate("e => e.isConnected"))
+        except Exception:
+            # Kontekst wykonania elementu zniknął razem ze starą stroną
+            return True
+
+    def save_screenshot(self, filename: str) -> None:
+        try:
+            self.runtime.run(self.page.screenshot(path=filename))
+        except Exception as e:
+            logger.log_error(f"Błąd podczas zapisywania zrzutu ekranu: {e}")
+            raise
@@ -0,0 +1,470 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import json
+import threading
+import time
+
+from .webdriver_adapter import WebDriverAdapter, WebDriverOptions
+from src.utils import logger
+
+INITIAL_STATE = "initial"
+
+
+def _lookup_key(by: str, value: str) -> str:
+    return f"{by}={value}"
+
+
+def _script_key(script: str, args) -> str:
+    payload = json.dumps([script, list(args)], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _click_key(element_key: str, inputs: Dict[str, str]) -> str:
+    """Klucz kliknięcia - zależy też od wartości wpisanych w pola (np. numer KW)"""
+    typed = "&".join(f"{key}={value}" for key, value in sorted(inputs.items()))
+    return f"click:{element_key}|{typed}"
+
+
+class FixtureStore:
+    """
+    Magazyn nagranych sesji przeglądarki - graf stanów strony
+
+    Stan to strona (adres i źródło HTML) razem z wynikami wyszukiwania
+    elementów i skryptów wykonanych na tej stronie. Przejścia między stanami
+    to akcje: załadowanie adresu, kliknięcie elementu (z wartościami wpisanymi
+    w pola formularza) i skrypty zmieniające stronę (np. history.go).
+
+    Układ katalogu:
+        graph.json          stany i przejścia
+        pages/<stan>.html   źródła stron
+    """
+
+    _stores: Dict[Path, "FixtureStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.states: Dict[str, Dict] = {}
+        self.transitions: Dict[str, Dict[str, str]] = {}
+        self.gets: Dict[str, str] = {}
+        self._pages: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._load()
+
+    @classmethod
+    def open(cls, path: Path) -> "FixtureStore":
+        """Zwraca magazyn współdzielony przez adaptery w procesie"""
+        key = Path(path).resolve()
+        with cls._stores_lock:
+            if key not in cls._stores:
+                cls._stores[key] = cls(key)
+            return cls._stores[key]
+
+    def _load(self):
+        graph_path = self.path / "graph.json"
+        if not graph_path.exists():
+            return
+
+        with open(graph_path, "r", encoding="utf-8") as f:
+            graph = json.load(f)
+        self.states = graph.get("states", {})
+        self.transitions = graph.get("transitions", {})
+        self.gets = graph.get("gets", {})
+
+    def save(self):
+        """Zapisuje graf i nowe strony na dysk"""
+        with self._lock:
+            pages_dir = self.path / "pages"
+            pages_dir.mkdir(parents=True, exist_ok=True)
+            for state_id, source in self._pages.items():
+                (pages_dir / f"{state_id}.html").write_text(source, encoding="utf-8")
+            self._pages.clear()
+
+            tmp_path = self.path / "graph.json.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"states": self.states, "transitions": self.transitions, "gets": self.gets},
+                    f, ensure_ascii=False, indent=1
+                )
+            tmp_path.replace(self.path / "graph.json")
+
+    # --- Nagrywanie ---
+
+    def add_state(self, url: str, source: str) -> str:
+        """Dodaje stan strony (identyczne strony są jednym stanem)"""
+        state_id = hashlib.sha1(f"{url}\n{source}".encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            if state_id not in self.states:
+                self.states[state_id] = {"url": url, "lookups": {}, "scripts": {}}
+                self._pages[state_id] = source
+        return state_id
+
+    def add_transition(self, from_state: str, action: str, to_state: str):
+        with self._lock:
+            self.transitions.setdefault(from_state, {})[action] = to_state
+            if action.startswith("get:"):
+                self.gets[action[4:]] = to_state
+
+    def add_lookup(self, state_id: str, key: str, elements: List[Dict]):
+        with self._lock:
+            self.states[state_id]["lookups"][key] = elements
+
+    def add_script(self, state_id: str, key: str, result: Any):
+        with self._lock:
+            self.states[state_id]["scripts"][key] = result
+
+    # --- Odtwarzanie ---
+
+    def get_page(self, state_id: str) -> str:
+        with self._lock:
+            if state_id in self._pages:
+                return self._pages[state_id]
+        page_path = self.path / "pages" / f"{state_id}.html"
+        return page_path.read_text(encoding="utf-8") if page_path.exists() else ""
+
+    def next_state(self, state_id: str, action: str) -> Optional[str]:
+        with self._lock:
+            target = self.transitions.get(state_id, {}).get(action)
+            if target is None and action.startswith("get:"):
+                # Załadowanie adresu nie zależy od bieżącej strony
+                target = self.gets.get(action[4:])
+            return target
+
+
+class _RecordedElement:
+    """Element strony z opisem zapisywanym w magazynie (tekst i odczytane atrybuty)"""
+
+    def __init__(self, adapter: "RecordingAdapter", element, key: str, state_id: str, info: Dict):
+        self._adapter = adapter
+        self._element = element
+        self.key = key
+        self.state_id = state_id
+        self._info = info
+
+    @property
+    def text(self) -> str:
+        value = self._element.text
+        self._info["text"] = value
+        return value
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        value = self._element.get_attribute(name)
+        self._info.setdefault("attrs", {})[name] = value
+        return value
+
+    def is_enabled(self) -> bool:
+        return self._element.is_enabled()
+
+    def clear(self):
+        self._element.clear()
+        self._adapter._inputs.pop(self.key, None)
+
+    def send_keys(self, value: str):
+        self._element.send_keys(value)
+        self._adapter._inputs[self.key] = self._adapter._inputs.get(self.key, "") + str(value)
+
+    def click(self):
+        action = _click_key(self.key, self._adapter._inputs)
+        self._element.click()
+        self._adapter._begin_transition(action)
+
+
+class RecordingAdapter(WebDriverAdapter):
+    """
+    Adapter nagrywający sesję prawdziwej przeglądarki do FixtureStore
+
+    Przekazuje wszystkie wywołania do adaptera `delegate` i zapisuje strony,
+    wyniki wyszukiwania elementów i przejścia między stronami. Źródło strony
+    jest pobierane tylko po akcji zmieniającej stronę (kliknięcie, załadowanie
+    adresu, skrypt nawigujący) - kolejne odczyty tej samej strony korzystają
+    z zapisanego stanu. Stan docelowy akcji to strona widoczna przy pierwszym
+    odczycie po akcji, a odczyty wykonane w trakcie wait_until są przypisywane
+    do strony po zakończeniu oczekiwania (jedno pobranie źródła zamiast jednego
+    na każde sprawdzenie warunku).
+    """
+
+    def __init__(self, delegate: WebDriverAdapter, store: FixtureStore):
+        self.delegate = delegate
+        self.store = store
+        self._state = INITIAL_STATE
+        self._pending_action: Optional[str] = None
+        self._pending_from: Optional[str] = None
+        self._inputs: Dict[str, str] = {}
+        self._dirty = True  # strona mogła się zmienić od ostatniego zapisu stanu
+        self._waiting = False
+        self._deferred: List[Callable[[str], None]] = []
+
+    def initialize(self, options: WebDriverOptions) -> None:
+        self.delegate.initialize(options)
+
+    def _begin_transition(self, action: str):
+        """Rozpoczyna przejście - stan docelowy zostanie ustalony przy kolejnym odczycie"""
+        self._pending_from = self._state
+        self._pending_action = action
+        self._inputs = {}
+        self._dirty = True
+
+    def _observe(self, source: Optional[str] = None) -> Optional[str]:
+        """
+        Zapisuje bieżącą stronę jako stan i wiąże z nim trwające przejście
+
+        Bez akcji od ostatniego zapisu zwraca bieżący stan bez pobierania
+        źródła strony. W trakcie wait_until zwraca None - stan zostanie
+        ustalony po zakończeniu oczekiwania.
+        """
+        if self._waiting:
+            return None
+        if not self._dirty:
+            return self._state
+
+        if source is None:
+            source = self.delegate.get_page_source()
+        state_id = self.store.add_state(self.delegate.get_current_url(), source)
+        if self._pending_action:
+            self.store.add_transition(self._pending_from, self._pending_action, state_id)
+            self._pending_action = None
+        self._state = state_id
+        self._dirty = False
+        return state_id
+
+    def _record(self, state_id: Optional[str], write: Callable[[str], None]):
+        """Zapisuje wynik odczytu w stanie (w trakcie wait_until - po ustaleniu stanu)"""
+        if state_id is None:
+            self._deferred.append(write)
+        else:
+            write(state_id)
+
+    def _describe(self, by: str, value: str, elements: list, state_id: Optional[str]) -> List["_RecordedElement"]:
+        key = _lookup_key(by, value)
+        infos = [{} for _ in elements]
+        recorded = [
+            _RecordedElement(self, element, f"{key}#{i}", state_id, info)
+            for i, (element, info) in enumerate(zip(elements, infos))
+        ]
+
+        def write(state: str):
+            self.store.add_lookup(state, key, infos)
+            for element in recorded:
+                element.state_id = state
+
+        self._record(state_id, write)
+        return recorded
+
+    def quit(self) -> None:
+        if self._pending_action:
+            try:
+                # Strona docelowa ostatniej akcji nie została jeszcze odczytana
+                self._observe()
+            except Exception as e:
+                logger.log_error(f"Nie udało się nagrać ostatniej strony: {e}")
+        self.delegate.quit()
+        self.store.save()
+
+    def is_alive(self) -> bool:
+        return self.delegate.is_alive()
+
+    def get(self, url: str) -> None:
+        self.delegate.get(url)
+        self._begin_transition(f"get:{url}")
+        self._observe()
+
+    def find_element(self, by: str, value: str, timeout: int = 10) -> Any:
+        element = self.delegate.find_element(by, value, timeout)
+        return self._describe(by, value, [element], self._observe())[0]
+
+    def find_elements(self, by: str, value: str) -> list:
+        elements = self.delegate.find_elements(by, value)
+        return self._describe(by, value, elements, self._observe())
+
+    def get_page_source(self) -> str:
+        source = self.delegate.get_page_source()
+        self._observe(source)
+        return source
+
+    def save_screenshot(self, filename: str) -> None:
+        self.delegate.save_screenshot(filename)
+
+    def execute_script(self, script: str, *args) -> Any:
+        values = [arg._element if isinstance(arg, _RecordedElement) else arg for arg in args]
+        state_id = self._observe()
+        result = self.delegate.execute_script(script, *values)
+
+        key = _script_key(script, args)
+        if "history" in script or "location" in script:
+            # Skrypt nawigujący - zapisujemy jako przejście
+            self._begin_transition(f"script:{key}")
+        else:
+            try:
+                json.dumps(result)
+            except (TypeError, ValueError):
+                return result
+            self._record(state_id, lambda state: self.store.add_script(state, key, result))
+        return result
+
+    def back(self) -> None:
+        self._observe()
+        self.delegate.back()
+        self._begin_transition("back")
+
+    def get_current_url(self) -> str:
+        return self.delegate.get_current_url()
+
+    def wait_until(self, condition: Callable[[], Any], timeout: float) -> Any:
+        self._waiting = True
+        try:
+            result = self.delegate.wait_until(condition, timeout)
+        except Exception:
+            self._deferred.clear()
+            raise
+        finally:
+            self._waiting = False
+
+        # Wyniki ostatniego sprawdzenia warunku należą do strony po oczekiwaniu
+        deferred, self._deferred = self._deferred, []
+        state_id = self._observe()
+        for write in deferred:
+            write(state_id)
+        return result
+
+    def is_stale(self, element: Any) -> bool:
+        return self.delegate.is_stale(element._element if isinstance(element, _RecordedElement) else element)
+
+
+class _ReplayElement:
+    """Element odtwarzany z nagrania"""
+
+    def __init__(self, adapter: "ReplayAdapter", key: str, state_id: str, info: Dict):
+        self._adapter = adapter
+        self.key = key
+        self.state_id = state_id
+        self._info = info
+
+    @property
+    def text(self) -> str:
+        return self._info.get("text", "")
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._info.get("attrs", {}).get(name)
+
+    def is_enabled(self) -> bool:
+        if self._adapter.is_stale(self):
+            raise RuntimeError("Element nie jest już na stronie")
+        return True
+
+    def clear(self):
+        self._adapter._inputs.pop(self.key, None)
+
+    def send_keys(self, value: str):
+        self._adapter._inputs[self.key] = self._adapter._inputs.get(self.key, "") + str(value)
+
+    def click(self):
+        self._adapter._navigate(_click_key(self.key, self._adapter._inputs))
+
+
+class ReplayAdapter(WebDriverAdapter):
+    """
+    Adapter odtwarzający nagrane sesje bez przeglądarki i sieci
+
+    Akcje przechodzą po grafie stanów z FixtureStore, a wyszukiwania elementów
+    i skrypty zwracają nagrane wyniki, więc przebieg jest deterministyczny.
+    Każda nawigacja trwa `latency` sekund, co pozwala symulować czas
+    odpowiedzi strony w benchmarkach. Akcja bez nagrania zgłasza LookupError.
+    """
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, lookup_latency: float = 0.0):
+        self.store = store
+        self.latency = latency
+        self.lookup_latency = lookup_latency
+        self._state = INITIAL_STATE
+        self._inputs: Dict[str, str] = {}
+        self._history: List[str] = []
+        self._closed = False
+
+    def initialize(self, options: WebDriverOptions) -> None:
+        self._closed = False
+
+    def _navigate(self, action: str):
+        target = self.store.next_state(self._state, action)
+        if target is None:
+            raise LookupError(f"Brak nagrania dla akcji {action} w stanie {self._state}")
+        if self.latency:
+            time.sleep(self.latency)
+        self._history.append(self._state)
+        self._state = target
+        self._inputs = {}
+
+    def _lookup(self, by: str, value: str) -> List[_ReplayElement]:
+        if self.lookup_latency:
+            time.sleep(self.lookup_latency)
+        key = _lookup_key(by, value)
+        infos = self.store.states.get(self._state, {}).get("lookups", {}).get(key, [])
+        return [_ReplayElement(self, f"{key}#{i}", self._state, info) for i, info in enumerate(infos)]
+
+    def quit(self) -> None:
+        self._closed = True
+
+    def is_alive(self) -> bool:
+        return not self._closed
+
+    def get(self, url: str) -> None:
+        self._navigate(f"get:{url}")
+
+    def find_element(self, by: str, value: str, timeout: int = 10) -> Any:
+        elements = self._lookup(by, value)
+        if not elements:
+            raise TimeoutError(f"Brak elementu {by}={value} w nagraniu stanu {self._state}")
+        return elements[0]
+
+    def find_elements(self, by: str, value: str) -> list:
+        return self._lookup(by, value)
+
+    def get_page_source(self) -> str:
+        return self.store.get_page(self._state)
+
+    def save_screenshot(self, filename: str) -> None:
+        logger.log_info(f"Odtwarzanie nagrania - pominięto zrzut ekranu {filename}")
+
+    def execute_script(self, script: str, *args) -> Any:
+        key = _script_key(script, args)
+        scripts = self.store.states.get(self._state, {}).get("scripts", {})
+        if key in scripts:
+            return scripts[key]
+        if self.store.next_state(self._state, f"script:{key}") is not None:
+            self._navigate(f"script:{key}")
+            return None
+        raise LookupError(f"Brak nagrania skryptu w stanie {self._state}")
+
+    def back(self) -> None:
+        # Powrót zużywa wpis historii - kolejny back() cofa się o następną stronę
+        previous = self._history.pop() if self._history else None
+        target = self.store.next_state(self._state, "back") or previous
+        if target is None:
+            raise LookupError(f"Brak poprzedniej strony w stanie {self._state}")
+        if self.latency:
+            time.sleep(self.latency)
+        self._state = target
+        self._inputs = {}
+
+    def get_current_url(self) -> str:
+        return self.store.states.get(self._state, {}).get("url", "about:blank")
+
+    def wait_until(self, condition: Callable[[], Any], timeout: float) -> Any:
+        # Stan zmienia się tylko przez akcje, więc warunek sprawdzamy jednokrotnie
+        result = condition()
+        if not result:
+            raise TimeoutError(f"Warunek niespełniony w nagranym stanie {self._state}")
+        return result
+
+    def is_stale(self, element: Any) -> bool:
+        return element.state_id != self._state
+
+
+def create_recording_driver(delegate: WebDriverAdapter, fixture_path: Path) -> RecordingAdapter:
+    """Opakowuje przeglądarkę adapterem nagrywającym do katalogu `fixture_path`"""
+    return RecordingAdapter(delegate, FixtureStore.open(fixture_path))
+
+
+def create_replay_driver(fixture_path: Path, latency: float = 0.0) -> ReplayAdapter:
+    """Tworzy adapter odtwarzający nagrania z katalogu `fixture_path`"""
+    return ReplayAdapter(FixtureStore.open(fixture_path), latency)
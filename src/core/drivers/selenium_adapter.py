@@ -1,24 +1,202 @@
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import atexit
+import json
+import shutil
+import tempfile
+import threading
+import time
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException
 
-from .webdriver_adapter import WebDriverAdapter, WebDriverOptions
+from .webdriver_adapter import WebDriverAdapter, WebDriverOptions, NetworkStats
 from src.utils import logger
+from src.utils.metrics import TimingHistogram
+
+# Argumenty wyłączające usługi tła Chrome, zbędne przy scrapingu i spowalniające start
+SLIM_ARGUMENTS = [
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--metrics-recording-only",
+    "--mute-audio",
+]
+
+# Parametry sesji dla przeglądarek opartych na Chromium: (nazwa przeglądarki, prefiks komend)
+_CHROMIUM_BROWSERS = {
+    "chrome": ("chrome", "goog"),
+    "edge": ("MicrosoftEdge", "ms"),
+}
+
+
+class _SharedDriverService:
+    """
+    Jeden proces chromedrivera (msedgedriver) dla wszystkich sesji w procesie
+
+    webdriver.Chrome uruchamia osobny sterownik dla każdej przeglądarki.
+    Sterownik obsługuje wiele sesji naraz, więc uruchamiamy go raz,
+    a kolejne przeglądarki są tworzone jako sesje webdriver.Remote.
+    """
+
+    _services: Dict[str, "_SharedDriverService"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, browser_type: str, browser_options):
+        from selenium.webdriver.common.driver_finder import DriverFinder
+
+        start = time.perf_counter()
+        if browser_type == "chrome":
+            from selenium.webdriver.chrome.service import Service
+        else:
+            from selenium.webdriver.edge.service import Service
+
+        self.service = Service()
+        finder = DriverFinder(self.service, browser_options)
+        self.browser_path = finder.get_browser_path()
+        self.service.path = self.service.env_path() or finder.get_driver_path()
+        self.service.start()
+        self.start_time = time.perf_counter() - start
+        logger.log_info(f"Uruchomiono wspólny sterownik {browser_type} w {self.start_time:.2f}s")
+
+    @classmethod
+    def get(cls, browser_type: str, browser_options) -> "_SharedDriverService":
+        """Zwraca (uruchamiając przy pierwszym użyciu) sterownik danej przeglądarki"""
+        with cls._lock:
+            if browser_type not in cls._services:
+                cls._services[browser_type] = cls(browser_type, browser_options)
+                if len(cls._services) == 1:
+                    atexit.register(cls.stop_all)
+            return cls._services[browser_type]
+
+    @classmethod
+    def stop_all(cls):
+        """Zatrzymuje wszystkie wspólne sterowniki"""
+        with cls._lock:
+            services, cls._services = list(cls._services.values()), {}
+        for shared in services:
+            try:
+                shared.service.stop()
+            except Exception as e:
+                logger.log_error(f"Błąd podczas zatrzymywania sterownika: {e}")
+
+    def create_session(self, browser_type: str, browser_options):
+        """Tworzy nową przeglądarkę jako sesję wspólnego sterownika"""
+        from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+        if self.browser_path:
+            browser_options.binary_location = self.browser_path
+            browser_options.browser_version = None
+
+        browser_name, vendor_prefix = _CHROMIUM_BROWSERS[browser_type]
+        executor = ChromiumRemoteConnection(
+            remote_server_addr=self.service.service_url,
+            vendor_prefix=vendor_prefix,
+            browser_name=browser_name,
+            keep_alive=True,
+        )
+        return webdriver.Remote(command_executor=executor, options=browser_options)
+
+
+class _ProfileStore:
+    """
+    Gotowe, odchudzone profile przeglądarki
+
+    Każda przeglądarka potrzebuje własnego katalogu profilu. Profile są
+    tworzone z szablonu z pominiętym ekranem pierwszego uruchomienia
+    (plik "First Run") i usuwane w tle po zamknięciu przeglądarki.
+    Katalog profilu pozwala też znaleźć proces przeglądarki wśród
+    procesów wspólnego sterownika (pomiar pamięci).
+    """
+
+    def __init__(self):
+        self.root = Path(tempfile.mkdtemp(prefix="ekw-profiles-"))
+        self.template = self.root / "template"
+        (self.template / "Default").mkdir(parents=True)
+        (self.template / "First Run").touch()
+        (self.template / "Default" / "Preferences").write_text(json.dumps({
+            "browser": {"has_seen_welcome_page": True, "check_default_browser": False},
+            "distribution": {"skip_first_run_ui": True, "suppress_first_run_default_browser_prompt": True},
+            "translate": {"enabled": False},
+        }), encoding="utf-8")
+
+        self._ready: List[Path] = []
+        self._counter = 0
+        self._lock = threading.Lock()
+        atexit.register(shutil.rmtree, self.root, True)
+
+    def prepare(self, count: int):
+        """Tworzy z wyprzedzeniem `count` profili"""
+        for _ in range(count):
+            profile = self._create()
+            with self._lock:
+                self._ready.append(profile)
+
+    def _create(self) -> Path:
+        with self._lock:
+            self._counter += 1
+            profile = self.root / f"profile-{self._counter}"
+        shutil.copytree(self.template, profile)
+        return profile
+
+    def acquire(self) -> Path:
+        """Wydaje gotowy profil (tworzy nowy, gdy zapas się skończył)"""
+        with self._lock:
+            if self._ready:
+                return self._ready.pop()
+        return self._create()
+
+    def release(self, profile: Path):
+        """Usuwa profil zamkniętej przeglądarki w tle"""
+        threading.Thread(target=shutil.rmtree, args=(profile, True), daemon=True).start()
+
+
+_profiles: Optional[_ProfileStore] = None
+_profiles_lock = threading.Lock()
+
+
+def get_profile_store() -> _ProfileStore:
+    """Zwraca magazyn profili współdzielony w procesie"""
+    global _profiles
+    with _profiles_lock:
+        if _profiles is None:
+            _profiles = _ProfileStore()
+        return _profiles
+
 
 class SeleniumAdapter(WebDriverAdapter):
     """Implementacja WebDriverAdapter dla Selenium"""
 
+    # Suma statystyk ruchu wszystkich przeglądarek w procesie
+    _total_network_stats = NetworkStats()
+    _total_collections = 0
+    _total_lock = threading.Lock()
+
+    # Czasy uruchomienia przeglądarek w procesie
+    startup_times = TimingHistogram()
+
     def __init__(self, browser_type: str = "chrome"):
         self.browser_type = browser_type
         self.driver = None
+        self.profile: Optional[Path] = None
+        self._shared_service: Optional[_SharedDriverService] = None
+        self.network_stats_enabled = False
+        self._request_types: Dict[str, str] = {}
 
     def initialize(self, options: WebDriverOptions) -> None:
+        start = time.perf_counter()
         try:
-            if self.browser_type == "chrome":
+            if self.browser_type in _CHROMIUM_BROWSERS and options.shared_service:
+                self._start_shared_session(options)
+            elif self.browser_type == "chrome":
                 chrome_options = webdriver.ChromeOptions()
                 self._configure_chrome_options(chrome_options, options)
                 self.driver = webdriver.Chrome(options=chrome_options)
@@ -35,11 +213,51 @@ class SeleniumAdapter(WebDriverAdapter):
 
             self.driver.implicitly_wait(options.implicit_wait)
             self.driver.set_page_load_timeout(options.page_load_timeout)
+            self._configure_network(options)
+            self.startup_times.observe(time.perf_counter() - start)
 
         except Exception as e:
             logger.log_error(f"Błąd podczas inicjalizacji drivera: {e}")
+            self.quit()
             raise
 
+    def _start_shared_session(self, options: WebDriverOptions):
+        """Uruchamia przeglądarkę jako sesję wspólnego sterownika, z gotowym profilem"""
+        if self.browser_type == "chrome":
+            browser_options = webdriver.ChromeOptions()
+            self._configure_chrome_options(browser_options, options)
+        else:
+            browser_options = webdriver.EdgeOptions()
+            self._configure_edge_options(browser_options, options)
+
+        self.profile = get_profile_store().acquire()
+        browser_options.add_argument(f"--user-data-dir={self.profile}")
+        for argument in SLIM_ARGUMENTS:
+            browser_options.add_argument(argument)
+
+        self._shared_service = _SharedDriverService.get(self.browser_type, browser_options)
+        self.driver = self._shared_service.create_session(self.browser_type, browser_options)
+
+    @staticmethod
+    def prepare_profiles(count: int):
+        """Tworzy z wyprzedzeniem profile dla `count` przeglądarek"""
+        get_profile_store().prepare(count)
+
+    @classmethod
+    def get_startup_stats(cls) -> Dict:
+        """Zwraca histogram czasów uruchomienia przeglądarek i czasy startu wspólnych sterowników"""
+        with _SharedDriverService._lock:
+            services = {name: round(shared.start_time, 3) for name, shared in _SharedDriverService._services.items()}
+        return {"browsers": cls.startup_times.snapshot(), "driver_services": services}
+
+    def _cdp(self, command: str, params: Dict) -> Any:
+        """Wykonuje komendę Chrome DevTools Protocol (także w sesji webdriver.Remote)"""
+        return self.driver.execute("executeCdpCommand", {"cmd": command, "params": params})["value"]
+
+    def _get_log(self, log_type: str) -> List[Dict]:
+        """Odczytuje log przeglądarki (webdriver.Remote nie ma get_log - komenda getLog działa w obu sesjach)"""
+        return self.driver.execute("getLog", {"type": log_type})["value"]
+
     def _configure_chrome_options(self, chrome_options, options: WebDriverOptions):
         """Konfiguracja opcji dla Chrome"""
         if options.headless:
@@ -64,6 +282,24 @@ class SeleniumAdapter(WebDriverAdapter):
         }
         chrome_options.add_experimental_option("prefs", prefs)
 
+        # Log wydajności - źródło statystyk ruchu sieciowego
+        if options.network_stats:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def _configure_network(self, options: WebDriverOptions):
+        """Blokuje zbędne zasoby przez Chrome DevTools Protocol (tylko Chrome i Edge)"""
+        if self.browser_type not in ("chrome", "edge"):
+            if options.blocked_urls:
+                logger.log_info(f"Blokowanie zasobów nie jest obsługiwane dla {self.browser_type}")
+            return
+
+        self.network_stats_enabled = options.network_stats
+        if not options.blocked_urls:
+            return
+
+        self._cdp("Network.enable", {})
+        self._cdp("Network.setBlockedURLs", {"urls": list(options.blocked_urls)})
+
     def _configure_firefox_options(self, firefox_options, options: WebDriverOptions):
         """Konfiguracja opcji dla Firefox"""
         if options.headless:
@@ -86,6 +322,101 @@ class SeleniumAdapter(WebDriverAdapter):
                 self.driver.quit()
         except Exception as e:
             logger.log_error(f"Błąd podczas zamykania drivera: {e}")
+        finally:
+            self.driver = None
+            if self.profile:
+                get_profile_store().release(self.profile)
+                self.profile = None
+
+    def is_alive(self) -> bool:
+        if not self.driver:
+            return False
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def get_memory_usage(self) -> Optional[int]:
+        """Suma RSS procesu sterownika i wszystkich procesów przeglądarki (wymaga psutil)"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+
+        try:
+            if self._shared_service:
+                # Wspólny sterownik - procesy tej przeglądarki rozpoznajemy po katalogu profilu
+                root = psutil.Process(self._shared_service.service.process.pid)
+                profile_arg = f"--user-data-dir={self.profile}"
+                browsers = [p for p in root.children() if profile_arg in p.cmdline()]
+                processes = [p for browser in browsers for p in [browser] + browser.children(recursive=True)]
+            else:
+                service_process = self.driver.service.process
+                root = psutil.Process(service_process.pid)
+                processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes if p.is_running())
+        except Exception:
+            return None
+
+    def collect_network_stats(self) -> Optional[NetworkStats]:
+        """
+        Odczytuje log wydajności od poprzedniego wywołania
+
+        Zapytania zakończone zdarzeniem Network.loadingFinished są liczone
+        z rzeczywistym rozmiarem transferu, a zablokowane (loadingFailed
+        z blockedReason) według typu zasobu - ich rozmiar jest tylko szacowany.
+        """
+        if not self.network_stats_enabled or not self.driver:
+            return None
+
+        stats = NetworkStats()
+        try:
+            entries = self._get_log("performance")
+        except Exception as e:
+            logger.log_error(f"Błąd podczas odczytu logu wydajności: {e}")
+            return None
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+
+            method = message.get("method")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+
+            if method == "Network.requestWillBeSent":
+                self._request_types[request_id] = params.get("type", "Other")
+            elif method == "Network.loadingFinished":
+                self._request_types.pop(request_id, None)
+                stats.requests += 1
+                stats.bytes_transferred += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed":
+                resource_type = params.get("type") or self._request_types.get(request_id, "Other")
+                self._request_types.pop(request_id, None)
+                if params.get("blockedReason"):
+                    stats.blocked_requests += 1
+                    stats.blocked_by_type[resource_type] = stats.blocked_by_type.get(resource_type, 0) + 1
+
+        with SeleniumAdapter._total_lock:
+            SeleniumAdapter._total_network_stats.merge(stats)
+            SeleniumAdapter._total_collections += 1
+
+        return stats
+
+    @classmethod
+    def get_total_network_stats(cls) -> Dict:
+        """Zwraca sumę statystyk ruchu wszystkich przeglądarek (średnie na jeden odczyt, czyli KW)"""
+        with cls._total_lock:
+            stats = cls._total_network_stats.as_dict()
+            collections = cls._total_collections
+
+        stats["kw_count"] = collections
+        stats["bytes_per_kw"] = stats["bytes_transferred"] / collections if collections else None
+        stats["estimated_bytes_saved_per_kw"] = stats["estimated_bytes_saved"] / collections if collections else None
+        return stats
 
     def get(self, url: str) -> None:
         try:
@@ -113,6 +444,28 @@ class SeleniumAdapter(WebDriverAdapter):
     def get_page_source(self) -> str:
         return self.driver.page_source
 
+    def execute_script(self, script: str, *args) -> Any:
+        return self.driver.execute_script(script, *args)
+
+    def back(self) -> None:
+        self.driver.back()
+
+    def get_current_url(self) -> str:
+        return self.driver.current_url
+
+    def wait_until(self, condition: Callable[[], Any], timeout: float) -> Any:
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(lambda _: condition())
+        except TimeoutException as e:
+            raise TimeoutError(f"Przekroczono czas oczekiwania ({timeout}s)") from e
+
+    def is_stale(self, element: Any) -> bool:
+        try:
+            element.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+
     def save_screenshot(self, filename: str) -> None:
         try:
             self.driver.save_screenshot(filename)
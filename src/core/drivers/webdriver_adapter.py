@@ -1,6 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Callable
+from dataclasses import dataclass, field
+
+# Domyślnie blokowane zasoby - niepotrzebne do odczytu treści księgi
+DEFAULT_BLOCKED_URLS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*hotjar.com*", "*facebook.net*",
+]
+
+# Szacunkowy rozmiar zablokowanego zasobu według typu (w bajtach). Zablokowany
+# zasób nie jest pobierany, więc jego rzeczywistego rozmiaru nie da się poznać.
+BLOCKED_SIZE_ESTIMATES = {
+    "Font": 40_000,
+    "Stylesheet": 30_000,
+    "Script": 50_000,
+    "Image": 20_000,
+    "Media": 200_000,
+}
+DEFAULT_BLOCKED_SIZE = 10_000
 
 @dataclass
 class WebDriverOptions:
@@ -10,11 +29,50 @@ class WebDriverOptions:
     load_images: bool = True
     user_agent: Optional[str] = None
     page_load_timeout: int = 30
-    implicit_wait: int = 10
+    implicit_wait: int = 0  # oczekiwanie na elementy jest jawne (wait_until, find_element z limitem czasu)
+    blocked_urls: List[str] = field(default_factory=list)  # wzorce adresów z "*" (Network.setBlockedURLs)
+    network_stats: bool = False  # zliczanie ruchu sieciowego (log wydajności przeglądarki)
+    shared_service: bool = True  # jeden proces chromedrivera dla wszystkich sesji (Chrome i Edge)
+
+@dataclass
+class NetworkStats:
+    """Statystyki ruchu sieciowego przeglądarki"""
+    requests: int = 0
+    bytes_transferred: int = 0
+    blocked_requests: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: "NetworkStats"):
+        """Dodaje statystyki innego licznika"""
+        self.requests += other.requests
+        self.bytes_transferred += other.bytes_transferred
+        self.blocked_requests += other.blocked_requests
+        for resource_type, count in other.blocked_by_type.items():
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + count
+
+    @property
+    def estimated_bytes_saved(self) -> int:
+        """Szacunek zaoszczędzonych bajtów (na podstawie BLOCKED_SIZE_ESTIMATES)"""
+        return sum(
+            BLOCKED_SIZE_ESTIMATES.get(resource_type, DEFAULT_BLOCKED_SIZE) * count
+            for resource_type, count in self.blocked_by_type.items()
+        )
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "bytes_transferred": self.bytes_transferred,
+            "blocked_requests": self.blocked_requests,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+        }
 
 class WebDriverAdapter(ABC):
     """Abstrakcyjny interfejs dla różnych implementacji WebDrivera"""
 
+    # Proxy, przez które łączy się przeglądarka (ustawiane przez DriverFactory)
+    proxy: Optional[str] = None
+
     @abstractmethod
     def initialize(self, options: WebDriverOptions) -> None:
         """Inicjalizacja drivera"""
@@ -49,3 +107,40 @@ class WebDriverAdapter(ABC):
     def save_screenshot(self, filename: str) -> None:
         """Zapisanie zrzutu ekranu"""
         pass
+
+    @abstractmethod
+    def execute_script(self, script: str, *args) -> Any:
+        """Wykonanie skryptu JavaScript na stronie"""
+        pass
+
+    @abstractmethod
+    def back(self) -> None:
+        """Powrót do poprzedniej strony w historii"""
+        pass
+
+    @abstractmethod
+    def get_current_url(self) -> str:
+        """Adres bieżącej strony"""
+        pass
+
+    @abstractmethod
+    def wait_until(self, condition: Callable[[], Any], timeout: float) -> Any:
+        """Czeka, aż warunek zwróci wartość prawdziwą (zwraca ją); po czasie `timeout` zgłasza TimeoutError"""
+        pass
+
+    @abstractmethod
+    def is_stale(self, element: Any) -> bool:
+        """Czy element zniknął ze strony (np. po przejściu na inną stronę)"""
+        pass
+
+    def is_alive(self) -> bool:
+        """Sprawdzenie, czy przeglądarka odpowiada"""
+        return True
+
+    def get_memory_usage(self) -> Optional[int]:
+        """Pamięć zajęta przez przeglądarkę w bajtach (None - nieznana)"""
+        return None
+
+    def collect_network_stats(self) -> Optional[NetworkStats]:
+        """Statystyki ruchu od poprzedniego wywołania (None - niedostępne)"""
+        return None
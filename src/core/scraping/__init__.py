@@ -1,7 +1,13 @@
 # src/core/scraping/__init__.py
 
-from .land_register_scraper import LandRegisterScraper, ScrapingResult
+from .land_register_scraper import LandRegisterScraper, ScrapingResult, FailureType
 from .data_parser import LandRegisterParser
+from .html_backends import HtmlPage, parse_html, available_backends
+from .section_parser import SectionRowAssembler, assemble_sections
+from .records import BasicInfo, SectionEntry, KWRecord, RecordBatch
+from .stream_parser import StreamingPageParser, iter_events, iter_rows
 from .data_validator import DataValidator
+from .rate_limiter import TokenBucket, FileTokenBucket, get_rate_limiter
+from .proxy_pool import ProxyPool, ProxyStats, get_proxy_pool
 
-__all__ = ['LandRegisterScraper', 'ScrapingResult', 'LandRegisterParser', 'DataValidator']
\ No newline at end of file
+__all__ = ['LandRegisterScraper', 'ScrapingResult', 'FailureType', 'LandRegisterParser', 'HtmlPage', 'parse_html', 'available_backends', 'SectionRowAssembler', 'assemble_sections', 'BasicInfo', 'SectionEntry', 'KWRecord', 'RecordBatch', 'StreamingPageParser', 'iter_events', 'iter_rows', 'DataValidator', 'TokenBucket', 'FileTokenBucket', 'get_rate_limiter', 'ProxyPool', 'ProxyStats', 'get_proxy_pool']
\ No newline at end of file
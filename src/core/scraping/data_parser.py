@@ -1,51 +1,154 @@
-from typing import Dict, List
-from bs4 import BeautifulSoup
+from typing import Dict, Iterable, List, Optional, Union
 import re
 
+from .html_backends import HtmlPage, parse_html
+from .section_parser import assemble_sections, empty_section, flatten_sections
+from .stream_parser import CHUNK_SIZE, StreamSource, should_stream, stream_document
+
 class LandRegisterParser:
-    """Klasa odpowiedzialna za parsowanie danych z księgi wieczystej"""
+    """
+    Klasa odpowiedzialna za parsowanie danych z księgi wieczystej
+
+    Metody parse_* przyjmują źródło strony albo stronę już sparsowaną przez
+    parse_page() - przy kilku ekstraktorach na tej samej stronie (treść
+    zupełna ze wszystkimi działami) strona jest parsowana tylko raz.
+    Strony większe niż próg stream_parse_threshold_mb są parsowane
+    strumieniowo (parse_stream), bez budowy drzewa. Źródło strony pobrane
+    z przeglądarki jest już w całości w pamięci - wtedy oszczędzane jest
+    tylko drzewo strony; pamięć niezależną od wielkości strony daje
+    parse_stream z pliku (Path) lub porcji tekstu.
+    """
+
+    BASIC_INFO_KEYS = ["Numer", "Typ", "Oznaczenie", "Zapis", "Zamknięcie", "Położenie", "Właściciel"]
+
+    @staticmethod
+    def parse_page(html: Union[str, HtmlPage], backend: Optional[str] = None) -> HtmlPage:
+        """Parsuje stronę (backend z konfiguracji parser_backend); strona sparsowana jest zwracana bez zmian"""
+        return html if isinstance(html, HtmlPage) else parse_html(html, backend)
+
+    @staticmethod
+    def parse_document(html: Union[str, HtmlPage], sections: Iterable[str] = ()) -> Dict:
+        """
+        Parsuje podstawowe informacje i podane działy z jednego drzewa strony
+
+        Wiersze tabel wszystkich działów są składane w wpisy jednym przejściem.
+
+        Args:
+            html: Źródło strony lub strona sparsowana
+            sections: Klucze działów (np. "dzial_1o")
+
+        Returns:
+            Słownik z kluczem basic_info i kluczami działów
+        """
+        if should_stream(html):
+            return LandRegisterParser.parse_stream(html, sections)
+
+        page = LandRegisterParser.parse_page(html)
+        data = {"basic_info": LandRegisterParser.parse_basic_info(page)}
+        parsed = assemble_sections(page.rows())
+        for key in sections:
+            data[key] = parsed.get(key) or empty_section(key)
+        return data
 
     @staticmethod
-    def parse_basic_info(html: str) -> Dict:
+    def parse_stream(
+        source: StreamSource,
+        sections: Iterable[str] = (),
+        default_section: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Dict:
+        """
+        Parsuje stronę strumieniowo - wynik jak parse_document, bez drzewa strony
+
+        Wiersze tabel są składane w wpisy w trakcie czytania, więc zużycie
+        pamięci nie zależy od wielkości strony (treść zupełna ksiąg z długą
+        historią).
+
+        Args:
+            source: Tekst strony, ścieżka pliku (Path), plik tekstowy lub porcje tekstu
+            sections: Klucze działów (np. "dzial_1o")
+            default_section: Dział wierszy przed pierwszym tytułem działu
+            chunk_size: Wielkość porcji czytanej ze źródła
+        """
+        texts, parsed = stream_document(source, default_section, chunk_size)
+        data = {"basic_info": LandRegisterParser.basic_info_from_texts(texts)}
+        for key in sections:
+            data[key] = parsed.get(key) or empty_section(key)
+        return data
+
+    @staticmethod
+    def parse_section(key: str, html: Union[str, HtmlPage]) -> Dict:
+        """
+        Parsuje stronę jednego działu
+
+        Args:
+            key: Klucz działu (np. "dzial_2")
+            html: Źródło strony działu lub strona sparsowana
+        """
+        if should_stream(html):
+            return LandRegisterParser.parse_stream(html, (key,), default_section=key)[key]
+        return LandRegisterParser.parse_section_rows(key, LandRegisterParser.parse_page(html).rows())
+
+    @staticmethod
+    def parse_section_rows(key: str, rows: Iterable[List[str]]) -> Dict:
+        """Składa wpisy działu z wierszy tabel (np. zebranych skryptem w przeglądarce)"""
+        return assemble_sections(rows, default_section=key).get(key) or empty_section(key)
+
+    @staticmethod
+    def parse_basic_info(html: Union[str, HtmlPage]) -> Dict:
         """Parsuje podstawowe informacje o księdze"""
-        soup = BeautifulSoup(html, 'html.parser')
-        info = {}
+        if should_stream(html):
+            return LandRegisterParser.parse_stream(html)["basic_info"]
+        page = LandRegisterParser.parse_page(html)
+        return LandRegisterParser.basic_info_from_texts(page.texts("div", "left"))
 
-        elements = soup.find_all("div", class_="left")
-        keys = ["Numer", "Typ", "Oznaczenie", "Zapis", "Zamknięcie", "Położenie", "Właściciel"]
+    @staticmethod
+    def basic_info_from_texts(texts: List[str]) -> Dict:
+        """Układa teksty kolejnych pól div.left w słownik podstawowych informacji"""
+        info = {}
+        keys = LandRegisterParser.BASIC_INFO_KEYS
 
-        for i, element in enumerate(elements):
-            text = element.get_text(strip=True)
+        for i, text in enumerate(texts):
             if i < len(keys):
                 info[keys[i]] = text
             else:
-                if "Właściciel" not in info:
-                    info["Właściciel"] = []
-                info["Właściciel"].append(text)
+                # Kolejni właściciele - pierwszy jest już zapisany jako tekst
+                owners = info.get("Właściciel")
+                if not isinstance(owners, list):
+                    info["Właściciel"] = owners = [] if owners is None else [owners]
+                owners.append(text)
 
         return info
 
     @staticmethod
-    def parse_section_1o(html: str) -> Dict:
-        """Parsuje dane z działu I-O"""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {"działki": []}
+    def parse_section_1o(html: Union[str, HtmlPage]) -> Dict:
+        """Parsuje dane z działu I-O (działki, budynki, lokale)"""
+        return LandRegisterParser.parse_section("dzial_1o", html)
 
-        # Logika parsowania działu I-O
-        # ...
+    @staticmethod
+    def parse_section_1s(html: Union[str, HtmlPage]) -> Dict:
+        """Parsuje dane z działu I-Sp (spis praw związanych z własnością)"""
+        return LandRegisterParser.parse_section("dzial_1s", html)
 
-        return data
+    @staticmethod
+    def parse_section_2(html: Union[str, HtmlPage]) -> Dict:
+        """Parsuje dane z działu II (właściciele i udziały)"""
+        return LandRegisterParser.parse_section("dzial_2", html)
 
     @staticmethod
-    def parse_section_1s(html: str) -> Dict:
-        """Parsuje dane z działu I-Sp"""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {"spis_praw": []}
+    def parse_section_3(html: Union[str, HtmlPage]) -> Dict:
+        """Parsuje dane z działu III (prawa, roszczenia i ograniczenia)"""
+        return LandRegisterParser.parse_section("dzial_3", html)
 
-        # Logika parsowania działu I-Sp
-        # ...
+    @staticmethod
+    def parse_section_4(html: Union[str, HtmlPage]) -> Dict:
+        """Parsuje dane z działu IV (hipoteki)"""
+        return LandRegisterParser.parse_section("dzial_4", html)
 
-        return data
+    @staticmethod
+    def to_rows(data: Dict, kw_number: Optional[str] = None) -> List[Dict]:
+        """Zamienia dane KW na płaskie wiersze (jeden wpis działu - jeden wiersz) do CSV"""
+        return flatten_sections(data, kw_number)
 
     @staticmethod
     def clean_text(text: str) -> str:
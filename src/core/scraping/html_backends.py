@@ -0,0 +1,191 @@
+# src/core/scraping/html_backends.py
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.utils import logger
+
+# Kolejność wyboru backendu w trybie "auto" - od najszybszego
+BACKEND_PREFERENCE = ("selectolax", "lxml", "bs4")
+
+
+def normalize_text(parts: Iterable[str]) -> str:
+    """
+    Tekst elementu z jego fragmentów tekstu
+
+    Fragmenty są łączone spacją, a ciągi białych znaków scalane w jedną spację
+    ("ul. Polna<br>12" -> "ul. Polna 12"). Tak samo liczą tekst skrypty
+    przeglądarki (LandRegisterScraper.EXTRACT_SCRIPT) i parser strumieniowy.
+    """
+    return " ".join(" ".join(parts).split())
+
+
+class HtmlPage(ABC):
+    """
+    Strona HTML sparsowana jeden raz
+
+    Wszystkie ekstraktory (podstawowe informacje, kolejne działy) odpytują to
+    samo drzewo zamiast tokenizować stronę od nowa. Tekst elementu jest
+    liczony przez normalize_text() - tak samo we wszystkich backendach.
+    """
+
+    backend: str = ""
+
+    @abstractmethod
+    def texts(self, tag: str, class_name: Optional[str] = None) -> List[str]:
+        """Teksty elementów `tag` (opcjonalnie z klasą `class_name`) w kolejności dokumentu"""
+
+    @abstractmethod
+    def rows(self) -> List[List[str]]:
+        """Teksty komórek td kolejnych wierszy tr (wiersze bez komórek są pomijane)"""
+
+
+class SelectolaxPage(HtmlPage):
+    """Backend selectolax (parser Lexbor) - najszybszy"""
+
+    backend = "selectolax"
+
+    def __init__(self, html: str):
+        from selectolax.lexbor import LexborHTMLParser
+
+        self.tree = LexborHTMLParser(html)
+        # Tekst skryptów i stylów nie należy do treści elementów
+        self.tree.strip_tags(["script", "style"])
+
+    def texts(self, tag: str, class_name: Optional[str] = None) -> List[str]:
+        selector = f"{tag}.{class_name}" if class_name else tag
+        return [self._text(node) for node in self.tree.css(selector)]
+
+    @staticmethod
+    def _text(node) -> str:
+        return normalize_text([node.text(separator=" ")])
+
+    def rows(self) -> List[List[str]]:
+        rows = []
+        for row in self.tree.css("tr"):
+            cells = [self._text(cell) for cell in row.iter() if cell.tag == "td"]
+            if cells:
+                rows.append(cells)
+        return rows
+
+
+class LxmlPage(HtmlPage):
+    """Backend lxml (parser libxml2)"""
+
+    backend = "lxml"
+
+    def __init__(self, html: str):
+        import lxml.html
+
+        self.root = lxml.html.document_fromstring(html) if html.strip() else lxml.html.Element("html")
+        # Tekst skryptów i stylów nie należy do treści elementów
+        for element in self.root.iter("script", "style"):
+            element.text = None
+
+    @staticmethod
+    def _text(element) -> str:
+        return normalize_text(element.itertext())
+
+    def texts(self, tag: str, class_name: Optional[str] = None) -> List[str]:
+        if class_name:
+            elements = self.root.xpath(
+                f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+            )
+        else:
+            elements = self.root.iter(tag)
+        return [self._text(element) for element in elements]
+
+    def rows(self) -> List[List[str]]:
+        rows = []
+        for row in self.root.iter("tr"):
+            cells = [self._text(cell) for cell in row if cell.tag == "td"]
+            if cells:
+                rows.append(cells)
+        return rows
+
+
+class SoupPage(HtmlPage):
+    """Backend BeautifulSoup z parserem html.parser - bez dodatkowych zależności, najwolniejszy"""
+
+    backend = "bs4"
+
+    def __init__(self, html: str):
+        from bs4 import BeautifulSoup
+
+        self.soup = BeautifulSoup(html, "html.parser")
+
+    def texts(self, tag: str, class_name: Optional[str] = None) -> List[str]:
+        elements = self.soup.find_all(tag, class_=class_name) if class_name else self.soup.find_all(tag)
+        return [normalize_text([element.get_text(" ")]) for element in elements]
+
+    def rows(self) -> List[List[str]]:
+        rows = []
+        for row in self.soup.find_all("tr"):
+            cells = [normalize_text([cell.get_text(" ")]) for cell in row.find_all("td", recursive=False)]
+            if cells:
+                rows.append(cells)
+        return rows
+
+
+BACKENDS: Dict[str, Callable[[str], HtmlPage]] = {
+    "selectolax": SelectolaxPage,
+    "lxml": LxmlPage,
+    "bs4": SoupPage,
+}
+
+# Moduł, którego import decyduje o dostępności backendu
+_BACKEND_MODULES = {
+    "selectolax": "selectolax.lexbor",
+    "lxml": "lxml.html",
+    "bs4": "bs4",
+}
+
+_available: Optional[List[str]] = None
+_default: Optional[str] = None
+
+
+def available_backends() -> List[str]:
+    """Zwraca backendy, których biblioteki są zainstalowane (od najszybszego)"""
+    global _available
+    if _available is None:
+        import importlib
+
+        _available = []
+        for name in BACKEND_PREFERENCE:
+            try:
+                importlib.import_module(_BACKEND_MODULES[name])
+                _available.append(name)
+            except ImportError:
+                continue
+    return _available
+
+
+def get_default_backend() -> str:
+    """
+    Zwraca backend parsowania z konfiguracji
+
+    Konfiguracja:
+        parser_backend - "auto" (najszybszy zainstalowany), "selectolax", "lxml" albo "bs4"
+    """
+    global _default
+    if _default is None:
+        from src.config.config_manager import ConfigManager
+
+        wanted = ConfigManager().get("parser_backend", "auto") or "auto"
+        available = available_backends()
+        if wanted != "auto" and wanted not in available:
+            logger.log_error(f"Backend parsowania {wanted} nie jest dostępny - używam {available[0]}")
+            wanted = "auto"
+        _default = available[0] if wanted == "auto" else wanted
+    return _default
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> HtmlPage:
+    """
+    Parsuje stronę wybranym backendem
+
+    Args:
+        html: Źródło strony
+        backend: Nazwa backendu (None - z konfiguracji)
+    """
+    return BACKENDS[backend or get_default_backend()](html)
@@ -0,0 +1,405 @@
+# src/core/scraping/http_scraper.py
+
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urljoin
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import time
+
+from bs4 import BeautifulSoup
+
+from .data_parser import LandRegisterParser
+from .rate_limiter import get_rate_limiter
+from .proxy_pool import get_proxy_pool
+from src.utils import logger
+from src.config.config_manager import ConfigManager
+
+# Backend stron z formularzami - odczyt pól formularza korzysta z drzewa BeautifulSoup
+FORM_BACKEND = "bs4"
+
+# Kody odpowiedzi, którymi strona odmawia dostępu (blokada proxy)
+BLOCKED_STATUSES = (403, 429)
+
+# Przyciski wydruku treści w kolejności prób
+CONTENT_BUTTONS = ("przyciskWydrukZwykly", "przyciskWydrukZupelny")
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+class ContentUnavailableError(Exception):
+    """Treść księgi nie jest dostępna (brak przycisku wydruku)"""
+
+
+@dataclass
+class HtmlForm:
+    """Formularz HTML gotowy do ponownego wysłania"""
+    action: str
+    method: str = "post"
+    fields: List[Tuple[str, str]] = field(default_factory=list)
+
+    def set(self, name: str, value: str):
+        """Ustawia wartość pola (nadpisuje istniejącą)"""
+        self.fields = [(n, v) for n, v in self.fields if n != name]
+        self.fields.append((name, value))
+
+    def with_button(self, name: Optional[str], value: str) -> List[Tuple[str, str]]:
+        """Zwraca dane formularza wysłanego danym przyciskiem"""
+        if not name:
+            return list(self.fields)
+        return list(self.fields) + [(name, value)]
+
+
+def _extract_form(form_tag, page_url: str) -> HtmlForm:
+    """Buduje HtmlForm z tagu <form> - zbiera pola tak, jak zrobiłaby to przeglądarka"""
+    form = HtmlForm(
+        action=urljoin(page_url, form_tag.get("action") or page_url),
+        method=(form_tag.get("method") or "get").lower()
+    )
+
+    for element in form_tag.find_all(["input", "select", "textarea"]):
+        name = element.get("name")
+        if not name or element.has_attr("disabled"):
+            continue
+
+        if element.name == "input":
+            input_type = (element.get("type") or "text").lower()
+            if input_type in ("submit", "button", "image", "reset", "file"):
+                continue
+            if input_type in ("checkbox", "radio") and not element.has_attr("checked"):
+                continue
+            form.fields.append((name, element.get("value", "")))
+        elif element.name == "select":
+            option = element.find("option", selected=True) or element.find("option")
+            if option is not None:
+                form.fields.append((name, option.get("value", option.get_text(strip=True))))
+        else:
+            form.fields.append((name, element.get_text()))
+
+    return form
+
+
+def _find_form_with(soup: BeautifulSoup, page_url: str, **attrs) -> Tuple[HtmlForm, object]:
+    """
+    Szuka formularza zawierającego element o podanych atrybutach
+
+    Returns:
+        Krotka (formularz, znaleziony element)
+    """
+    element = soup.find(attrs=attrs)
+    if element is None:
+        raise LookupError(f"Nie znaleziono elementu {attrs}")
+
+    form_tag = element.find_parent("form")
+    if form_tag is None:
+        raise LookupError(f"Element {attrs} nie należy do formularza")
+
+    return _extract_form(form_tag, page_url), element
+
+
+# Parsowanie stron - funkcje modułu, bo są wykonywane w puli procesów (poza pętlą asyncio)
+
+def _search_submission(html: str, page_url: str, kw_number: str) -> HtmlForm:
+    """Formularz wyszukiwania wypełniony numerem KW"""
+    page = LandRegisterParser.parse_page(html, FORM_BACKEND).soup
+    court, number, control = kw_number.split('/')
+
+    form, _ = _find_form_with(page, page_url, id="kodWydzialuInput")
+    for element_id, value in (
+        ("kodWydzialuInput", court),
+        ("numerKsiegiWieczystej", number),
+        ("cyfraKontrolna", control),
+    ):
+        element = page.find(id=element_id)
+        if element is None or not element.get("name"):
+            raise LookupError(f"Nie znaleziono pola {element_id} w formularzu wyszukiwania")
+        form.set(element["name"], value)
+
+    button = page.find(id="wyszukaj")
+    button_name = button.get("name") if button is not None else None
+    button_value = button.get("value", "") if button is not None else ""
+    return HtmlForm(form.action, form.method, form.with_button(button_name, button_value))
+
+
+def _result_page(html: str, page_url: str, buttons: Tuple[str, ...]) -> Tuple[Dict, Optional[HtmlForm]]:
+    """
+    Podstawowe informacje ze strony wyniku i formularz wydruku treści
+
+    Returns:
+        Krotka (podstawowe informacje, formularz pierwszego dostępnego
+        przycisku wydruku albo None, gdy treść jest niedostępna)
+    """
+    result_page = LandRegisterParser.parse_page(html, FORM_BACKEND)
+    basic_info = LandRegisterParser.parse_basic_info(result_page)
+
+    for name in buttons:
+        if result_page.soup.find(attrs={"name": name}) is None:
+            continue
+        form, button = _find_form_with(result_page.soup, page_url, name=name)
+        return basic_info, HtmlForm(form.action, form.method, form.with_button(name, button.get("value", "")))
+
+    return basic_info, None
+
+
+def _section_submissions(html: str, page_url: str, sections: Dict[str, str]) -> Dict[str, HtmlForm]:
+    """Formularze przycisków działów ze strony treści (klucz działu -> formularz)"""
+    page = LandRegisterParser.parse_page(html, FORM_BACKEND).soup
+    submissions = {}
+    for key, label in sections.items():
+        form, button = _find_form_with(page, page_url, value=label)
+        submissions[key] = HtmlForm(form.action, form.method, form.with_button(button.get("name"), label))
+    return submissions
+
+
+class HttpScrapingEngine:
+    """
+    Silnik scrapingu bez przeglądarki
+
+    Odtwarza wysyłanie formularzy strony eKW (wyszukiwanie KW, wydruk treści,
+    przyciski działów) bezpośrednio przez HTTP. Wszystkie zapytania idą przez
+    jedną pulę połączeń aiohttp obsługiwaną przez pętlę asyncio w osobnym
+    wątku, więc jeden proces może przetwarzać setki KW jednocześnie. Każda KW
+    ma własny zestaw ciasteczek, bo strona trzyma stan wyszukiwania w sesji.
+
+    Strony są parsowane w puli procesów (klucz "http_parse_processes", domyślnie
+    liczba rdzeni), więc parsowanie jednej KW nie wstrzymuje pętli obsługującej
+    zapytania pozostałych. W procesach roboczych trybu "process" (które nie mogą
+    mieć procesów potomnych) oraz przy "http_parse_processes": 0 parsowanie
+    odbywa się w puli wątków.
+
+    Przy włączonym use_proxy każda KW dostaje proxy z puli proxy (jak
+    przeglądarka w silniku Selenium), a wynik i czas obsługi KW są zgłaszane
+    do puli.
+
+    Adres strony można nadpisać kluczem "http_base_url" (np. lokalny serwer
+    z nagranymi stronami eKW).
+    """
+
+    _shared: Optional["HttpScrapingEngine"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        from .land_register_scraper import LandRegisterScraper
+
+        self.config = ConfigManager()
+        self.base_url = base_url or self.config.get("http_base_url") or LandRegisterScraper.BASE_URL
+        self.max_connections = max_connections or int(self.config.get("http_max_connections", 100))
+        self.max_concurrency = max_concurrency or int(self.config.get("http_concurrency", 200))
+        self.timeout = timeout or float(self.config.get("http_timeout", 30))
+        self.rate_limiter = get_rate_limiter()
+        self.proxy_pool = get_proxy_pool()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._connector = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._parse_executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "HttpScrapingEngine":
+        """Zwraca silnik współdzielony przez wszystkich agentów w procesie"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Uruchamia pętlę asyncio w wątku tła (przy pierwszym użyciu)"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="ekw-http-engine",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _get_parse_executor(self) -> Executor:
+        """Zwraca pulę parsowania stron (tworzoną przy pierwszym użyciu)"""
+        with self._lock:
+            if self._parse_executor is None:
+                workers = int(self.config.get("http_parse_processes", os.cpu_count() or 1))
+                if workers > 0 and not multiprocessing.current_process().daemon:
+                    self._parse_executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._parse_executor = ThreadPoolExecutor(thread_name_prefix="ekw-http-parse")
+            return self._parse_executor
+
+    async def _parse(self, function, *args):
+        """Wykonuje parsowanie strony poza pętlą asyncio"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_parse_executor(), functools.partial(function, *args))
+
+    async def _ensure_pool(self):
+        """Tworzy wspólną pulę połączeń (w wątku pętli)"""
+        import aiohttp
+
+        if self._connector is None:
+            self._connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def scrape_register(self, kw_number: str, sections: Dict[str, str]) -> Tuple[Dict, str]:
+        """
+        Pobiera KW synchronicznie - do użycia z wątków agentów
+
+        Wątek agenta czeka na wynik, więc jednocześnie pobieranych jest tyle KW,
+        ilu jest agentów - WorkDistributor uruchamia w silniku HTTP co najmniej
+        "http_agents" agentów (limit współbieżności pętli to "http_concurrency").
+
+        Args:
+            kw_number: Poprawny numer KW (z cyfrą kontrolną)
+            sections: Klucz działu -> etykieta przycisku działu
+
+        Returns:
+            Krotka (dane, źródło ostatniej pobranej strony)
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self.scrape_register_async(kw_number, sections), loop)
+        return future.result()
+
+    async def scrape_many(self, kw_numbers: List[str], sections: Dict[str, str]) -> List:
+        """
+        Pobiera wiele KW współbieżnie
+
+        Returns:
+            Lista wyników w kolejności numerów - krotka (dane, źródło) albo wyjątek
+        """
+        return await asyncio.gather(
+            *(self.scrape_register_async(kw, sections) for kw in kw_numbers),
+            return_exceptions=True
+        )
+
+    async def scrape_register_async(self, kw_number: str, sections: Dict[str, str]) -> Tuple[Dict, str]:
+        """Pobiera pojedynczą KW przez proxy z puli (jeśli włączone) i zgłasza puli wynik"""
+        import aiohttp
+
+        proxy = self.proxy_pool.acquire() if self.proxy_pool else None
+        start = time.perf_counter()
+        try:
+            result = await self._scrape_register(kw_number, sections, proxy)
+        except ContentUnavailableError:
+            # Brak treści to poprawna odpowiedź strony
+            self._report_proxy(proxy, True, start)
+            raise
+        except Exception as e:
+            blocked = isinstance(e, aiohttp.ClientResponseError) and e.status in BLOCKED_STATUSES
+            self._report_proxy(proxy, False, start, blocked)
+            raise
+        self._report_proxy(proxy, True, start)
+        return result
+
+    def _report_proxy(self, proxy: Optional[str], success: bool, start: float, blocked: bool = False):
+        """Zgłasza puli proxy wynik i czas obsługi KW"""
+        if self.proxy_pool and proxy:
+            self.proxy_pool.report(proxy, success, time.perf_counter() - start, blocked)
+
+    async def _scrape_register(self, kw_number: str, sections: Dict[str, str], proxy: Optional[str]) -> Tuple[Dict, str]:
+        """Pobiera pojedynczą KW - odtwarza kolejne formularze strony eKW"""
+        import aiohttp
+
+        await self._ensure_pool()
+
+        async with self._semaphore:
+            async with aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=False,
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": DEFAULT_USER_AGENT}
+            ) as session:
+                # Strona wyszukiwania i wypełniony formularz wyszukiwania
+                search_url, search_html = await self._request(session, "get", self.base_url, proxy=proxy)
+                search_form = await self._parse(_search_submission, search_html, search_url, kw_number)
+                result_url, result_html = await self._submit(session, search_form, proxy)
+
+                # Podstawowe informacje i formularz wydruku treści (zwykłej lub zupełnej)
+                buttons = CONTENT_BUTTONS if self.config.get("try_zupelna", False) else CONTENT_BUTTONS[:1]
+                basic_info, content_form = await self._parse(_result_page, result_html, result_url, buttons)
+                if content_form is None:
+                    raise ContentUnavailableError("Treść niedostępna")
+                data = {"basic_info": basic_info}
+
+                content_url, content_html = await self._submit(session, content_form, proxy)
+                page_source = content_html
+
+                # Poszczególne działy
+                section_forms = await self._parse(_section_submissions, content_html, content_url, sections)
+                for key, form in section_forms.items():
+                    _, section_html = await self._submit(session, form, proxy)
+                    data[key] = await self._parse(LandRegisterParser.parse_section, key, section_html)
+                    page_source = section_html
+
+                return data, page_source
+
+    async def _submit(self, session, form: HtmlForm, proxy: Optional[str] = None) -> Tuple[str, str]:
+        """Wysyła formularz (pola z przyciskiem są już w form.fields)"""
+        return await self._request(session, form.method, form.action, form.fields, proxy)
+
+    async def _request(
+        self,
+        session,
+        method: str,
+        url: str,
+        fields: Optional[List[Tuple[str, str]]] = None,
+        proxy: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Wykonuje zapytanie i zwraca (adres po przekierowaniach, treść strony)
+
+        Args:
+            proxy: Adres proxy host:port lub z protokołem (None - bez proxy)
+        """
+        # Limit zapytań - czekamy bez blokowania pętli asyncio
+        if self.rate_limiter:
+            wait = await self.rate_limiter.reserve_async()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        if proxy and "://" not in proxy:
+            proxy = f"http://{proxy}"
+
+        if method == "post":
+            request = session.post(url, data=fields or [], proxy=proxy)
+        else:
+            request = session.get(url, params=fields or None, proxy=proxy)
+
+        async with request as response:
+            response.raise_for_status()
+            return str(response.url), await response.text()
+
+    def close(self):
+        """Zamyka pulę połączeń i pętlę asyncio"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        if self._connector is not None:
+            asyncio.run_coroutine_threadsafe(self._connector.close(), loop).result()
+            self._connector = None
+
+        with self._lock:
+            executor, self._parse_executor = self._parse_executor, None
+        if executor is not None:
+            executor.shutdown()
+
+        loop.call_soon_threadsafe(loop.stop)
+        if self._loop_thread:
+            self._loop_thread.join()
+        loop.close()
+        logger.log_info("Zamknięto silnik HTTP")
@@ -1,12 +1,37 @@
 from typing import Optional, Dict, List
 from dataclasses import dataclass
 from pathlib import Path
+from collections import defaultdict
 import time
 
-from src.core.drivers import DriverFactory, WebDriverAdapter
+from .rate_limiter import get_rate_limiter
+from .proxy_pool import get_proxy_pool
+from .data_parser import LandRegisterParser
+from src.core.drivers import DriverFactory, WebDriverAdapter, get_driver_pool, DEFAULT_BLOCKED_URLS
+from src.core.storage import get_download_index
 from src.utils import logger, KWNumberHelper
+from src.utils.metrics import TimingHistogram
 from src.config.config_manager import ConfigManager
 
+class FailureType:
+    """Rodzaje błędów scrapingu - decydują o ponawianiu zadania"""
+    TIMEOUT = "timeout"
+    BLOCKED = "blocked"
+    NO_CONTENT = "no_content"
+    INVALID_NUMBER = "invalid_number"
+    ERROR = "error"
+
+    @staticmethod
+    def classify_exception(error: BaseException) -> str:
+        """Klasyfikuje wyjątek (także opakowany w inny wyjątek) jako TIMEOUT lub ERROR"""
+        seen = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            if isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower():
+                return FailureType.TIMEOUT
+            error = error.__cause__ or error.__context__
+        return FailureType.ERROR
+
 @dataclass
 class ScrapingResult:
     """Klasa przechowująca wyniki scrapingu"""
@@ -14,30 +39,152 @@ class ScrapingResult:
     message: str
     data: Optional[Dict] = None
     files: List[Path] = None
+    error_type: Optional[str] = None
 
 class LandRegisterScraper:
     """Główna klasa odpowiedzialna za scraping ksiąg wieczystych"""
 
     BASE_URL = "https://przegladarka-ekw.ms.gov.pl/eukw_prz/KsiegiWieczyste/wyszukiwanieKW"
 
+    # Klucz konfiguracji działu -> etykieta przycisku działu na stronie
+    SECTIONS = {
+        "dzial_1o": "Dział I-O",
+        "dzial_1s": "Dział I-Sp",
+        "dzial_2": "Dział II",
+        "dzial_3": "Dział III",
+        "dzial_4": "Dział IV",
+    }
+
+    # Tekst elementu liczony jak normalize_text() w parserach HTML: węzły tekstowe
+    # (bez script i style) złączone spacją, ciągi białych znaków scalone w jedną spację
+    TEXT_SCRIPT = """
+        const textNodes = e => Array.from(e.childNodes).flatMap(n =>
+            n.nodeType === 3 ? [n.nodeValue]
+            : n.nodeType === 1 && !['SCRIPT', 'STYLE'].includes(n.nodeName.toUpperCase()) ? textNodes(n)
+            : []);
+        const text = e => textNodes(e).join(' ').replace(/\\s+/g, ' ').trim();
+    """
+
+    # Skrypt zbierający dane strony w jednym wywołaniu zamiast osobnego zapytania
+    # WebDrivera dla każdego elementu: teksty pól div.left i komórki tabel wiersz po wierszu
+    EXTRACT_SCRIPT = TEXT_SCRIPT + """
+        const rows = [];
+        for (const row of document.querySelectorAll('tr')) {
+            const cells = Array.from(row.querySelectorAll(':scope > td'), text);
+            if (cells.length) rows.push(cells);
+        }
+        return {basic_info: Array.from(document.querySelectorAll('div.left'), text), rows: rows};
+    """
+
+    # Skrypt pobierający działy równolegle: wysyła formularz każdego przycisku działu
+    # przez fetch() w sesji przeglądarki (te same ciasteczka), czeka na wszystkie
+    # odpowiedzi (Promise.all) i zwraca komórki tabel oraz źródło każdej strony.
+    # Selenium i Playwright czekają na wynik Promise zwróconego przez skrypt.
+    PARALLEL_SECTIONS_SCRIPT = TEXT_SCRIPT + """
+        const fetchSection = label => {
+            const button = document.querySelector('input[value="' + label + '"]');
+            if (!button || !button.form) return Promise.resolve(null);
+            const form = button.form;
+            const fields = new URLSearchParams(new FormData(form));
+            if (button.name) fields.append(button.name, button.value);
+            const method = (form.method || 'get').toUpperCase();
+            const url = method === 'POST' ? form.action : form.action + '?' + fields;
+            return fetch(url, {method: method, body: method === 'POST' ? fields : undefined, credentials: 'same-origin'})
+                .then(response => response.ok ? response.text() : null)
+                .then(html => {
+                    if (html === null) return null;
+                    const page = new DOMParser().parseFromString(html, 'text/html');
+                    const rows = [];
+                    for (const row of page.querySelectorAll('tr')) {
+                        const cells = Array.from(row.querySelectorAll(':scope > td'), text);
+                        if (cells.length) rows.push(cells);
+                    }
+                    return {rows: rows, html: html};
+                });
+        };
+        return Promise.all(arguments[0].map(fetchSection));
+    """
+
+    # Fragmenty strony z odmową dostępu (blokada adresu IP przez serwer)
+    BLOCK_MARKERS = ("the requested url was rejected", "request rejected", "access denied", "captcha")
+
+    # Domyślne limity czasu oczekiwania poszczególnych kroków (w sekundach)
+    WAIT_BUDGETS = {
+        "search_form": 10,
+        "search_result": 20,
+        "section": 15,
+    }
+
+    # Czasy oczekiwania według kroku - wspólne dla wszystkich scraperów w procesie
+    wait_times: Dict[str, TimingHistogram] = defaultdict(TimingHistogram)
+
     def __init__(self):
         self.config = ConfigManager()
         self.driver: Optional[WebDriverAdapter] = None
+        self.engine = self.config.get("engine", "selenium")
+        self._http_engine = None
+        self._pool = None
+        self.rate_limiter = get_rate_limiter()
+        self.proxy_pool = get_proxy_pool()
+
+        # Tryb pracy na tym samym oknie - powrót do formularza zamiast ładowania strony od nowa
+        self.same_window = self.config.get("same_window", True)
+        # Równoległe pobieranie działów (fetch w sesji przeglądarki zamiast klikania po kolei)
+        self.parallel_sections = self.config.get("parallel_sections", False)
+        self._section_source: Optional[str] = None  # źródło ostatniego działu pobranego równolegle
+        self._form_driver: Optional[WebDriverAdapter] = None  # przeglądarka z załadowanym formularzem
+        self._history_depth = 0  # liczba nawigacji od strony wyszukiwania
+        self.wait_budgets = {**self.WAIT_BUDGETS, **(self.config.get("wait_budgets") or {})}
 
     def initialize(self):
-        """Inicjalizacja scrapera"""
+        """Inicjalizacja scrapera - pobiera przeglądarkę z puli (lub uruchamia nową)"""
         try:
-            self.driver = DriverFactory.create_driver(
-                browser_type=self.config.get("browser", "chrome"),
-                headless=True,
-                proxy=self.config.get("proxy_value") if self.config.get("use_proxy") else None,
-                load_images=self.config.get("page_image", True)
-            )
+            self._pool = get_driver_pool(self.create_driver)
+            timeout = float(self.config.get("driver_pool_timeout", 120))
+            if self._pool:
+                self.driver = self._pool.acquire(timeout=timeout)
+                # Przeglądarki z zapasu mogły dostać proxy wykluczone w międzyczasie
+                for _ in range(3):
+                    if not self.proxy_pool or self.proxy_pool.is_healthy(self.driver.proxy):
+                        break
+                    self._pool.discard(self.driver)
+                    self.driver = self._pool.acquire(timeout=timeout)
+            else:
+                self.driver = self.create_driver()
             logger.log_info("Zainicjalizowano scraper")
         except Exception as e:
             logger.log_error(f"Błąd podczas inicjalizacji scrapera: {e}")
             raise
 
+    @staticmethod
+    def create_driver() -> WebDriverAdapter:
+        """Uruchamia nową przeglądarkę skonfigurowaną według ustawień"""
+        config = ConfigManager()
+        proxy_pool = get_proxy_pool()
+        return DriverFactory.create_driver(
+            browser_type=config.get("browser", "chrome"),
+            headless=True,
+            proxy=proxy_pool.acquire() if proxy_pool else None,
+            load_images=config.get("page_image", True),
+            blocked_urls=LandRegisterScraper._blocked_urls(config),
+            network_stats=config.get("network_stats", True),
+            fixture_path=config.get("fixture_path") or None,
+            replay_latency=float(config.get("replay_latency", 0)),
+            shared_service=config.get("shared_driver_service", True)
+        )
+
+    @staticmethod
+    def _blocked_urls(config: ConfigManager) -> List[str]:
+        """Wzorce blokowanych zasobów: block_urls (None - domyślna lista) i obrazy, gdy wyłączone"""
+        if not config.get("block_resources", True):
+            return []
+
+        patterns = config.get("block_urls")
+        patterns = list(DEFAULT_BLOCKED_URLS if patterns is None else patterns)
+        if not config.get("page_image", True):
+            patterns += ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp"]
+        return patterns
+
     def scrape_register(self, kw_number: str) -> ScrapingResult:
         """
         Pobiera dane dla pojedynczej księgi wieczystej
@@ -48,6 +195,10 @@ class LandRegisterScraper:
         Returns:
             ScrapingResult z wynikami scrapingu
         """
+        if self.engine == "http":
+            return self._scrape_register_http(kw_number)
+
+        start = time.perf_counter()
         try:
             if not self.driver:
                 self.initialize()
@@ -60,30 +211,141 @@ class LandRegisterScraper:
                     logger.log_info(f"Skorygowano numer KW z {kw_number} na {validated_number}")
                     kw_number = validated_number
             except ValueError as e:
-                return ScrapingResult(False, f"Nieprawidłowy format numeru KW: {e}", None)
+                return ScrapingResult(False, f"Nieprawidłowy format numeru KW: {e}", None, error_type=FailureType.INVALID_NUMBER)
 
-            # Ładowanie strony
-            self.driver.get(self.BASE_URL)
-            time.sleep(1)  # Krótkie opóźnienie
+            # Formularz wyszukiwania
+            self._open_search_form()
 
             # Wypełnienie formularza
             self._fill_search_form(kw_number)
 
             # Sprawdzenie dostępności treści
             if not self._check_content_availability():
-                return ScrapingResult(False, "Treść niedostępna", None)
+                self._report_proxy(True, start)
+                return ScrapingResult(False, "Treść niedostępna", None, error_type=FailureType.NO_CONTENT)
 
             # Pobranie danych
             data = self._extract_data()
+            self._report_proxy(True, start)
 
             # Zapis plików
-            saved_files = self._save_files(kw_number, data)
+            saved_files = self._save_files(kw_number, data, self._section_source)
 
             return ScrapingResult(True, "Sukces", data, saved_files)
 
         except Exception as e:
             logger.log_error(f"Błąd podczas scrapowania KW {kw_number}: {e}")
-            return ScrapingResult(False, str(e), None)
+            blocked = self._is_blocked()
+            self._report_proxy(False, start, blocked)
+            self._discard_broken_driver()
+            error_type = FailureType.BLOCKED if blocked else FailureType.classify_exception(e)
+            return ScrapingResult(False, str(e), None, error_type=error_type)
+
+        finally:
+            if self.driver:
+                self.driver.collect_network_stats()
+            # Przeglądarka z wykluczonym proxy jest wymieniana na nową z innym proxy
+            if self.driver and self.proxy_pool and not self.proxy_pool.is_healthy(self.driver.proxy):
+                self._rotate_driver()
+            # Wymiana przeglądarki po osiągnięciu limitu stron lub pamięci
+            if self._pool and self.driver:
+                driver, self.driver = self.driver, None
+                self.driver = self._pool.checkpoint(driver)
+
+    def _is_blocked(self) -> bool:
+        """Czy strona odmówiła dostępu (sprawdzane tylko po błędzie, żeby nie pobierać źródła przy każdej KW)"""
+        try:
+            source = self.driver.get_page_source().lower() if self.driver else ""
+        except Exception:
+            return False
+        return any(marker in source for marker in self.BLOCK_MARKERS)
+
+    def _report_proxy(self, success: bool, start: float, blocked: bool = False):
+        """Zgłasza puli proxy wynik i czas obsługi KW"""
+        if self.proxy_pool and self.driver:
+            self.proxy_pool.report(self.driver.proxy, success, time.perf_counter() - start, blocked)
+
+    def _rotate_driver(self):
+        """Zamyka przeglądarkę z wykluczonym proxy - kolejna KW dostanie przeglądarkę z innym proxy"""
+        logger.log_info(f"Wymiana przeglądarki z wykluczonym proxy {self.driver.proxy}")
+        if self._pool:
+            self._pool.discard(self.driver)
+        else:
+            self.driver.quit()
+        self.driver = None
+
+    def _discard_broken_driver(self):
+        """Odrzuca przeglądarkę, która przestała odpowiadać - kolejna KW dostanie nową"""
+        if self.driver and not self.driver.is_alive():
+            if self._pool:
+                self._pool.discard(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
+
+    def _open_search_form(self):
+        """
+        Przygotowuje formularz wyszukiwania
+
+        W trybie same_window wraca w historii do załadowanej już strony
+        wyszukiwania. Pełne ładowanie strony następuje tylko wtedy, gdy
+        formularza nie da się odzyskać (nowa przeglądarka, błąd, zmieniona strona).
+        """
+        if self.same_window and self._form_driver is self.driver and self._return_to_search_form():
+            return
+
+        self._throttle()
+        self.driver.get(self.BASE_URL)
+        self._wait("search_form", lambda: self.driver.find_elements("ID", "kodWydzialuInput"))
+        self._form_driver = self.driver
+        self._history_depth = 0
+
+    def _return_to_search_form(self) -> bool:
+        """Wraca do formularza wyszukiwania; zwraca False, gdy stan strony jest nieprawidłowy"""
+        try:
+            if self._history_depth:
+                self.driver.execute_script("window.history.go(arguments[0])", -self._history_depth)
+                self._history_depth = 0
+
+            # Formularz musi być na stronie - inaczej przeładowanie
+            self._wait("search_form", lambda: self.driver.find_elements("ID", "kodWydzialuInput"))
+            return True
+
+        except Exception as e:
+            logger.log_info(f"Nie udało się wrócić do formularza wyszukiwania, ładowanie strony od nowa: {e}")
+            self._form_driver = None
+            return False
+
+    def _wait(self, step: str, condition):
+        """
+        Czeka na warunek w limicie czasu kroku i zapisuje czas oczekiwania
+
+        Args:
+            step: Nazwa kroku (klucz WAIT_BUDGETS / wait_budgets w konfiguracji)
+            condition: Funkcja bez argumentów - oczekiwanie kończy się, gdy zwróci prawdę
+        """
+        start = time.perf_counter()
+        try:
+            return self.driver.wait_until(condition, self.wait_budgets.get(step, 10))
+        finally:
+            self.wait_times[step].observe(time.perf_counter() - start)
+
+    def _wait_for_navigation(self, step: str, old_element):
+        """Czeka, aż strona z elementem `old_element` zostanie zastąpiona nową i w pełni załadowana"""
+        self._wait(step, lambda: (
+            self.driver.is_stale(old_element)
+            and self.driver.execute_script("return document.readyState") == "complete"
+        ))
+
+    @classmethod
+    def get_wait_stats(cls) -> Dict[str, Dict]:
+        """Zwraca histogramy czasów oczekiwania według kroku"""
+        return {step: histogram.snapshot() for step, histogram in list(cls.wait_times.items())}
+
+    def _throttle(self):
+        """Czeka na token wspólnego limitu zapytań przed wysłaniem zapytania do strony"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
 
     def _fill_search_form(self, kw_number: str):
         """Wypełnia formularz wyszukiwania"""
@@ -95,29 +357,36 @@ class LandRegisterScraper:
             number_input = self.driver.find_element("ID", "numerKsiegiWieczystej")
             control_input = self.driver.find_element("ID", "cyfraKontrolna")
 
-            court_input.send_keys(court)
-            number_input.send_keys(number)
-            control_input.send_keys(control)
+            # Pola mogą zawierać numer poprzedniej KW (tryb same_window)
+            for element, value in ((court_input, court), (number_input, number), (control_input, control)):
+                element.clear()
+                element.send_keys(value)
 
             # Kliknięcie przycisku wyszukiwania
             search_button = self.driver.find_element("ID", "wyszukaj")
+            self._throttle()
             search_button.click()
+            self._history_depth += 1
+            self._wait_for_navigation("search_result", search_button)
 
         except Exception as e:
             raise Exception(f"Błąd podczas wypełniania formularza: {e}")
 
     def _check_content_availability(self) -> bool:
-        """Sprawdza dostępność treści księgi"""
+        """
+        Sprawdza dostępność treści księgi
+
+        Strona wyniku jest już załadowana (_wait_for_navigation), więc przyciski
+        są sprawdzane bez czekania - brak przycisku nie kosztuje limitu czasu.
+        """
         try:
             # Sprawdzenie czy jest dostępna treść zwykła
-            normal_content = self.driver.find_element("NAME", "przyciskWydrukZwykly")
-            if normal_content:
+            if self.driver.find_elements("NAME", "przyciskWydrukZwykly"):
                 return True
 
             # Jeśli nie ma treści zwykłej, sprawdź czy można pobrać treść zupełną
             if self.config.get("try_zupelna", False):
-                full_content = self.driver.find_element("NAME", "przyciskWydrukZupelny")
-                return bool(full_content)
+                return bool(self.driver.find_elements("NAME", "przyciskWydrukZupelny"))
 
             return False
 
@@ -127,90 +396,128 @@ class LandRegisterScraper:
     def _extract_data(self) -> Dict:
         """Ekstrahuje dane z księgi"""
         data = {}
+        self._section_source = None
         try:
             # Pobieranie podstawowych informacji
             data["basic_info"] = self._get_basic_info()
 
             # Pobieranie poszczególnych działów jeśli są włączone
-            if self.config.get("dzial_1o"):
-                data["dzial_1o"] = self._get_section_data("Dział I-O")
-            if self.config.get("dzial_1s"):
-                data["dzial_1s"] = self._get_section_data("Dział I-Sp")
-            if self.config.get("dzial_2"):
-                data["dzial_2"] = self._get_section_data("Dział II")
-            if self.config.get("dzial_3"):
-                data["dzial_3"] = self._get_section_data("Dział III")
-            if self.config.get("dzial_4"):
-                data["dzial_4"] = self._get_section_data("Dział IV")
+            sections = {key: section for key, section in self.SECTIONS.items() if self.config.get(key)}
+            if self.parallel_sections and len(sections) > 1:
+                data.update(self._get_sections_parallel(sections))
+
+            # Działy pobierane po kolei (także te, których nie udało się pobrać równolegle)
+            for key, section in sections.items():
+                if key not in data:
+                    data[key] = self._get_section_data(key, section)
 
             return data
 
         except Exception as e:
             raise Exception(f"Błąd podczas ekstrakcji danych: {e}")
 
+    def _extract_page(self) -> Dict:
+        """Pobiera dane bieżącej strony jednym wywołaniem EXTRACT_SCRIPT"""
+        return self.driver.execute_script(self.EXTRACT_SCRIPT) or {"basic_info": [], "rows": []}
+
     def _get_basic_info(self) -> Dict:
         """Pobiera podstawowe informacje o księdze"""
         try:
-            info = {}
-            elements = self.driver.find_elements("XPATH", "//div[@class='left']")
-            keys = ["Numer", "Typ", "Oznaczenie", "Zapis", "Zamknięcie", "Położenie", "Właściciel"]
-
-            for i, element in enumerate(elements):
-                if i < len(keys):
-                    info[keys[i]] = element.text.strip()
-                else:
-                    if "Właściciel" not in info:
-                        info["Właściciel"] = []
-                    info["Właściciel"].append(element.text.strip())
-
-            return info
+            return LandRegisterParser.basic_info_from_texts(self._extract_page()["basic_info"])
 
         except Exception as e:
             raise Exception(f"Błąd podczas pobierania podstawowych informacji: {e}")
 
-    def _get_section_data(self, section: str) -> Dict:
+    def _get_section_data(self, key: str, section: str) -> Dict:
         """Pobiera dane z konkretnego działu"""
         try:
             # Kliknięcie w odpowiedni dział
             section_button = self.driver.find_element("XPATH", f"//input[@value='{section}']")
+            self._throttle()
             section_button.click()
-            time.sleep(1)
+            self._history_depth += 1
+            self._wait_for_navigation("section", section_button)
+
+            # Pobranie komórek tabel działu i złożenie ich w wpisy
+            return LandRegisterParser.parse_section_rows(key, self._extract_page()["rows"])
 
-            # Pobranie danych z działu
-            data = {}
-            elements = self.driver.find_elements("XPATH", "//td")
+        except Exception as e:
+            raise Exception(f"Błąd podczas pobierania danych z działu {section}: {e}")
 
-            # Tutaj dokładna logika parsowania zależna od działu
-            # ...
+    def _get_sections_parallel(self, sections: Dict[str, str]) -> Dict[str, Dict]:
+        """
+        Pobiera działy równolegle w sesji przeglądarki (bez opuszczania bieżącej strony)
 
-            return data
+        Czas pobrania KW to czas najwolniejszego działu zamiast sumy wszystkich.
+        Działy, których nie udało się pobrać, są pomijane w wyniku.
+        """
+        for _ in sections:
+            self._throttle()
 
+        try:
+            results = self.driver.execute_script(self.PARALLEL_SECTIONS_SCRIPT, list(sections.values()))
         except Exception as e:
-            raise Exception(f"Błąd podczas pobierania danych z działu {section}: {e}")
+            logger.log_error(f"Błąd podczas równoległego pobierania działów: {e}")
+            return {}
+
+        data = {}
+        for key, result in zip(sections, results or []):
+            if result:
+                data[key] = LandRegisterParser.parse_section_rows(key, result["rows"])
+                self._section_source = result["html"]
+        return data
+
+    def _scrape_register_http(self, kw_number: str) -> ScrapingResult:
+        """Pobiera dane KW silnikiem HTTP (bez przeglądarki)"""
+        from .http_scraper import HttpScrapingEngine, ContentUnavailableError
+
+        try:
+            if self._http_engine is None:
+                self._http_engine = HttpScrapingEngine.shared()
+
+            try:
+                court, number, control = kw_number.split('/')
+                kw_number = KWNumberHelper.correct_kw_number(court, number)
+            except ValueError as e:
+                return ScrapingResult(False, f"Nieprawidłowy format numeru KW: {e}", None, error_type=FailureType.INVALID_NUMBER)
+
+            sections = {key: label for key, label in self.SECTIONS.items() if self.config.get(key)}
+            data, page_source = self._http_engine.scrape_register(kw_number, sections)
+
+            saved_files = self._save_files(kw_number, data, page_source)
+            return ScrapingResult(True, "Sukces", data, saved_files)
 
-    def _save_files(self, kw_number: str, data: Dict) -> List[Path]:
+        except ContentUnavailableError:
+            return ScrapingResult(False, "Treść niedostępna", None, error_type=FailureType.NO_CONTENT)
+        except Exception as e:
+            logger.log_error(f"Błąd podczas scrapowania KW {kw_number} (HTTP): {e}")
+            return ScrapingResult(False, str(e), None, error_type=FailureType.classify_exception(e))
+
+    def _save_files(self, kw_number: str, data: Dict, page_source: Optional[str] = None) -> List[Path]:
         """Zapisuje pliki w wybranych formatach"""
         saved_files = []
         save_path = Path(self.config.get("save_path"))
-        base_filename = save_path / kw_number.replace("/", ".")
+        # Nazwa z pełnym numerem KW - with_suffix obciąłby cyfrę kontrolną po ostatniej kropce
+        filename = kw_number.replace("/", ".")
 
         try:
             # Zapis PDF
             if self.config.get("save_pdf"):
-                pdf_path = base_filename.with_suffix(".pdf")
+                pdf_path = save_path / f"{filename}.pdf"
                 # logika zapisu PDF
                 saved_files.append(pdf_path)
 
             # Zapis HTML
             if self.config.get("save_html"):
-                html_path = base_filename.with_suffix(".html")
+                html_path = save_path / f"{filename}.html"
                 with open(html_path, "w", encoding="utf-8") as f:
-                    f.write(self.driver.get_page_source())
+                    f.write(page_source if page_source is not None else self.driver.get_page_source())
+                get_download_index(save_path).add(filename, ".html")
                 saved_files.append(html_path)
 
             # Zapis JSON
             if self.config.get("save_json"):
-                json_path = base_filename.with_suffix(".json")
+                json_path = save_path / f"{filename}.json"
                 # logika zapisu JSON
                 saved_files.append(json_path)
 
@@ -220,7 +527,10 @@ class LandRegisterScraper:
             raise Exception(f"Błąd podczas zapisywania plików: {e}")
 
     def close(self):
-        """Zamyka scraper i zwalnia zasoby"""
+        """Zamyka scraper i zwalnia zasoby (przeglądarka z puli wraca do puli)"""
         if self.driver:
-            self.driver.quit()
+            if self._pool:
+                self._pool.release(self.driver)
+            else:
+                self.driver.quit()
             self.driver = None
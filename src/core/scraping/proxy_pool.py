@@ -0,0 +1,237 @@
+# src/core/scraping/proxy_pool.py
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import threading
+import time
+
+from src.utils import logger
+from src.utils.metrics import TimingHistogram
+from src.config.config_manager import ConfigManager
+
+
+@dataclass
+class ProxyStats:
+    """Stan i statystyki jednego proxy"""
+    address: str
+    requests: int = 0
+    failures: int = 0
+    blocked: int = 0
+    evictions: int = 0
+
+    # Średnie kroczące (EWMA) czasu obsługi KW i odsetka błędów
+    latency: Optional[float] = None
+    failure_rate: float = 0.0
+
+    # Proxy wykluczone do tego czasu (time.monotonic())
+    evicted_until: float = 0.0
+
+    # Czas wirtualny przydziału - rośnie o koszt proxy z każdym przydziałem
+    pass_value: float = 0.0
+    latencies: TimingHistogram = field(default_factory=TimingHistogram)
+
+    def cost(self, default_latency: float) -> float:
+        """Koszt przydziału - wolne i zawodne proxy dostają mniej agentów"""
+        latency = self.latency if self.latency is not None else default_latency
+        return max(latency, 0.01) * (1.0 + 4.0 * self.failure_rate)
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "blocked": self.blocked,
+            "evictions": self.evictions,
+            "failure_rate": round(self.failure_rate, 3),
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "evicted": self.evicted_until > time.monotonic(),
+        }
+
+
+class ProxyPool:
+    """
+    Pula proxy z oceną stanu każdego serwera
+
+    Lista jest wczytywana raz. Po każdej KW agent zgłasza wynik (report),
+    a pula śledzi średni czas obsługi i odsetek błędów każdego proxy.
+    Nowa przeglądarka dostaje proxy o najmniejszym czasie wirtualnym
+    (jak w TaskScheduler), który rośnie o koszt proxy - szybkie i sprawne
+    proxy obsługują więc więcej agentów. Proxy zablokowane przez stronę
+    albo z odsetkiem błędów powyżej `max_failure_rate` jest wykluczane na
+    `eviction_time` sekund, a agent wymienia przeglądarkę na nową z innym proxy.
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[str],
+        max_failure_rate: float = 0.5,
+        min_requests: int = 5,
+        eviction_time: float = 600.0,
+        smoothing: float = 0.2
+    ):
+        """
+        Args:
+            proxies: Adresy proxy (host:port)
+            max_failure_rate: Odsetek błędów, powyżej którego proxy jest wykluczane
+            min_requests: Liczba zapytań, po której proxy może zostać wykluczone za błędy
+            eviction_time: Czas wykluczenia w sekundach
+            smoothing: Waga nowego pomiaru w średnich kroczących
+        """
+        self._proxies: Dict[str, ProxyStats] = {}
+        for address in proxies:
+            address = address.strip()
+            if address and address not in self._proxies:
+                self._proxies[address] = ProxyStats(address)
+        if not self._proxies:
+            raise ValueError("Lista proxy jest pusta")
+
+        self.max_failure_rate = max_failure_rate
+        self.min_requests = min_requests
+        self.eviction_time = eviction_time
+        self.smoothing = smoothing
+        self._virtual_time = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: Path, **kwargs) -> "ProxyPool":
+        """Wczytuje listę proxy z pliku (jeden adres w linii, linie od "#" to komentarze)"""
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                lines = [line.strip() for line in file]
+            proxies = [line for line in lines if line and not line.startswith("#")]
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Nie znaleziono pliku proxy: {path}")
+        return cls(proxies, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    def _default_latency(self) -> float:
+        """Średni czas obsługi zmierzonych proxy - koszt proxy jeszcze nieużywanych"""
+        measured = [p.latency for p in self._proxies.values() if p.latency is not None]
+        return sum(measured) / len(measured) if measured else 1.0
+
+    def acquire(self) -> str:
+        """
+        Przydziela proxy dla nowej przeglądarki
+
+        Gdy wszystkie proxy są wykluczone, zwraca to, którego wykluczenie
+        kończy się najwcześniej.
+        """
+        with self._lock:
+            now = time.monotonic()
+            healthy = [p for p in self._proxies.values() if p.evicted_until <= now]
+            if healthy:
+                proxy = min(healthy, key=lambda p: p.pass_value)
+            else:
+                proxy = min(self._proxies.values(), key=lambda p: p.evicted_until)
+                logger.log_error(f"Wszystkie proxy są wykluczone - używam {proxy.address}")
+
+            # Proxy wracające do puli nie może nadrabiać czasu, w którym było wykluczone
+            proxy.pass_value = max(proxy.pass_value, self._virtual_time)
+            self._virtual_time = proxy.pass_value
+            proxy.pass_value += proxy.cost(self._default_latency())
+            return proxy.address
+
+    def report(self, address: Optional[str], success: bool, latency: Optional[float] = None, blocked: bool = False):
+        """
+        Zgłasza wynik zapytania wykonanego przez proxy
+
+        Args:
+            address: Adres proxy
+            success: Czy proxy poprawnie obsłużyło zapytanie (brak treści KW to też sukces)
+            latency: Czas obsługi w sekundach
+            blocked: Czy strona zablokowała proxy
+        """
+        with self._lock:
+            proxy = self._proxies.get(address)
+            if proxy is None:
+                return
+
+            proxy.requests += 1
+            if latency is not None and success:
+                proxy.latencies.observe(latency)
+                proxy.latency = latency if proxy.latency is None else \
+                    proxy.latency + self.smoothing * (latency - proxy.latency)
+            if not success:
+                proxy.failures += 1
+            proxy.failure_rate += self.smoothing * ((0.0 if success else 1.0) - proxy.failure_rate)
+
+            if blocked:
+                proxy.blocked += 1
+                self._evict(proxy, "zablokowane przez stronę")
+            elif proxy.requests >= self.min_requests and proxy.failure_rate > self.max_failure_rate:
+                self._evict(proxy, f"odsetek błędów {proxy.failure_rate:.0%}")
+
+    def _evict(self, proxy: ProxyStats, reason: str):
+        """Wyklucza proxy na eviction_time sekund (wywoływane pod blokadą)"""
+        if proxy.evicted_until > time.monotonic():
+            return
+        proxy.evicted_until = time.monotonic() + self.eviction_time
+        proxy.evictions += 1
+        # Po powrocie proxy zaczyna od progu połowy - kolejne błędy szybko je wykluczą
+        proxy.failure_rate = self.max_failure_rate / 2
+        logger.log_info(f"Wykluczono proxy {proxy.address} na {self.eviction_time:.0f}s ({reason})")
+
+    def is_healthy(self, address: Optional[str]) -> bool:
+        """Czy proxy nie jest wykluczone"""
+        with self._lock:
+            proxy = self._proxies.get(address)
+            return proxy is None or proxy.evicted_until <= time.monotonic()
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Zwraca statystyki wszystkich proxy"""
+        with self._lock:
+            return {address: proxy.as_dict() for address, proxy in self._proxies.items()}
+
+
+_shared_pool: Optional[ProxyPool] = None
+_shared_lock = threading.Lock()
+
+# Rozszerzenia plików z listą proxy - odróżniają brakujący plik od adresu proxy
+PROXY_FILE_SUFFIXES = (".txt", ".csv", ".lst", ".list")
+
+
+def _is_proxy_file(value: str) -> bool:
+    """Czy wartość proxy_value to ścieżka pliku (także nieistniejącego), a nie adres host:port"""
+    if Path(value).is_file():
+        return True
+    if "://" in value:
+        return False
+    return "/" in value or "\\" in value or Path(value).suffix.lower() in PROXY_FILE_SUFFIXES
+
+
+def get_proxy_pool() -> Optional[ProxyPool]:
+    """
+    Zwraca pulę proxy współdzieloną w procesie (None, gdy proxy wyłączone)
+
+    Konfiguracja:
+        use_proxy - czy używać proxy
+        proxy_value - plik z listą proxy albo pojedynczy adres host:port
+        proxy_max_failure_rate - odsetek błędów, powyżej którego proxy jest wykluczane
+        proxy_eviction_time - czas wykluczenia proxy w sekundach
+    """
+    global _shared_pool
+
+    config = ConfigManager()
+    if not config.get("use_proxy"):
+        return None
+
+    with _shared_lock:
+        if _shared_pool is None:
+            value = str(config.get("proxy_value") or "")
+            options = {
+                "max_failure_rate": float(config.get("proxy_max_failure_rate", 0.5)),
+                "eviction_time": float(config.get("proxy_eviction_time", 600)),
+            }
+            if _is_proxy_file(value):
+                # Brakujący plik to błąd konfiguracji - jego ścieżka nie może trafić do puli jako adres
+                try:
+                    _shared_pool = ProxyPool.from_file(Path(value), **options)
+                except (FileNotFoundError, ValueError) as e:
+                    logger.log_error(f"Nie można wczytać listy proxy: {e}")
+                    raise
+            else:
+                _shared_pool = ProxyPool([value], **options)
+            logger.log_info(f"Wczytano {len(_shared_pool)} proxy")
+        return _shared_pool
@@ -0,0 +1,154 @@
+# src/core/scraping/rate_limiter.py
+
+from pathlib import Path
+from typing import Dict, Optional
+import asyncio
+import json
+import tempfile
+import threading
+import time
+
+from src.utils import logger
+from src.utils.file_lock import file_lock
+from src.utils.metrics import TimingHistogram
+from src.config.config_manager import ConfigManager
+
+
+class TokenBucket:
+    """
+    Limiter typu token bucket dla wątków jednego procesu
+
+    Tokeny przybywają w tempie `rate` na sekundę, maksymalnie `burst`.
+    reserve() pobiera token od razu (stan może zejść poniżej zera)
+    i zwraca czas, jaki trzeba odczekać - dzięki temu oczekujący nie
+    rywalizują o blokadę, a kolejność obsługi jest zachowana.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("Limit zapytań na sekundę musi być dodatni")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.wait_times = TimingHistogram()
+
+        self._tokens = float(self.burst)
+        self._timestamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Rezerwuje token i zwraca czas oczekiwania w sekundach"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._timestamp) * self.rate)
+            self._timestamp = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        self.wait_times.observe(wait)
+        return wait
+
+    def acquire(self) -> float:
+        """Czeka na token (blokująco) i zwraca czas oczekiwania"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def reserve_async(self) -> float:
+        """reserve() dla pętli asyncio - stan w pamięci, więc bez blokowania pętli"""
+        return self.reserve()
+
+    def get_stats(self) -> Dict:
+        """Zwraca statystyki oczekiwania na tokeny"""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "wait_times": self.wait_times.snapshot(),
+        }
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket współdzielony przez wiele procesów
+
+    Stan kubełka (liczba tokenów i czas ostatniej aktualizacji) jest
+    przechowywany w pliku i modyfikowany pod blokadą pliku, więc wszyscy
+    agenci na maszynie - także w trybie procesowym - dzielą jeden limit.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, state_file: Optional[Path] = None):
+        super().__init__(rate, burst)
+        self.state_file = Path(state_file or Path(tempfile.gettempdir()) / "ekw_rate_limit.json")
+        self.lock_file = self.state_file.with_suffix(".lock")
+
+    def reserve(self) -> float:
+        with self._lock, file_lock(self.lock_file):
+            now = time.time()
+            tokens, timestamp = self._read_state(now)
+            tokens = min(self.burst, tokens + (now - timestamp) * self.rate) - 1
+            self._write_state(tokens, now)
+
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        self.wait_times.observe(wait)
+        return wait
+
+    async def reserve_async(self) -> float:
+        """reserve() w wątku puli - blokada i odczyt pliku nie wstrzymują pętli asyncio"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.reserve)
+
+    def _read_state(self, now: float):
+        """Odczytuje stan kubełka (pełny kubełek, gdy plik nie istnieje)"""
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+            return float(state["tokens"]), float(state["timestamp"])
+        except (OSError, ValueError, KeyError):
+            return float(self.burst), now
+
+    def _write_state(self, tokens: float, timestamp: float):
+        """Zapisuje stan kubełka"""
+        self.state_file.write_text(
+            json.dumps({"tokens": tokens, "timestamp": timestamp}),
+            encoding="utf-8"
+        )
+
+
+_shared_limiter: Optional[TokenBucket] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[TokenBucket]:
+    """
+    Zwraca limiter zapytań współdzielony w procesie (None, gdy limit wyłączony)
+
+    Konfiguracja:
+        rate_limit_rps - zapytań na sekundę dla wszystkich agentów razem (0 - bez limitu)
+        rate_limit_burst - maksymalna liczba zapytań wysłanych naraz
+        rate_limit_scope - "process" albo "global" (limit wspólny dla procesów,
+                           domyślny w trybie execution_mode = "process")
+        rate_limit_file - plik stanu limitera globalnego
+    """
+    global _shared_limiter
+
+    with _shared_lock:
+        if _shared_limiter is not None:
+            return _shared_limiter
+
+        config = ConfigManager()
+        try:
+            rate = float(config.get("rate_limit_rps") or 0)
+        except (TypeError, ValueError):
+            rate = 0
+        if rate <= 0:
+            return None
+
+        burst = int(config.get("rate_limit_burst", 1) or 1)
+        default_scope = "global" if config.get("execution_mode") == "process" else "process"
+        scope = config.get("rate_limit_scope") or default_scope
+
+        if scope == "global":
+            _shared_limiter = FileTokenBucket(rate, burst, config.get("rate_limit_file") or None)
+        else:
+            _shared_limiter = TokenBucket(rate, burst)
+
+        logger.log_info(f"Limit zapytań: {rate}/s, burst {burst}, zakres {scope}")
+        return _shared_limiter
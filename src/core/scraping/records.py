@@ -0,0 +1,220 @@
+# src/core/scraping/records.py
+
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import sys
+
+from .data_parser import LandRegisterParser
+from .section_parser import SECTION_KEYS, empty_section
+
+# Pola o niewielu powtarzających się wartościach - jedna kopia tekstu na wszystkie rekordy
+CATEGORY_FIELDS = frozenset((
+    "rubryka", "rodzaj_wpisu", "rodzaj", "sposob_korzystania", "waluta", "polozenie", "obreb",
+))
+
+# Krotki nazw pól wpisów - wspólne dla wszystkich wpisów o tym samym układzie
+_FIELD_NAMES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _shared_names(names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Zwraca współdzieloną krotkę nazw pól (jedna kopia na układ wpisu)"""
+    shared = _FIELD_NAMES.get(names)
+    if shared is None:
+        shared = _FIELD_NAMES[names] = tuple(map(sys.intern, names))
+    return shared
+
+
+def _category(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class BasicInfo(NamedTuple):
+    """Podstawowe informacje o księdze"""
+    kw: Optional[str]
+    numer: Optional[str] = None
+    typ: Optional[str] = None
+    oznaczenie: Optional[str] = None
+    zapis: Optional[str] = None
+    zamkniecie: Optional[str] = None
+    polozenie: Optional[str] = None
+    wlasciciele: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, kw: Optional[str], info: Dict) -> "BasicInfo":
+        """Tworzy rekord ze słownika basic_info (klucze LandRegisterParser.BASIC_INFO_KEYS)"""
+        owners = info.get("Właściciel")
+        if owners is None:
+            owners = ()
+        elif isinstance(owners, str):
+            owners = (owners,)
+        return cls(
+            kw, info.get("Numer"), _category(info.get("Typ")), _category(info.get("Oznaczenie")),
+            info.get("Zapis"), info.get("Zamknięcie"), _category(info.get("Położenie")), tuple(owners)
+        )
+
+    def to_dict(self) -> Dict:
+        """Słownik basic_info w układzie LandRegisterParser.parse_basic_info"""
+        keys = LandRegisterParser.BASIC_INFO_KEYS
+        info = {key: value for key, value in zip(keys, self[1:7]) if value is not None}
+        if len(self.wlasciciele) == 1:
+            info[keys[-1]] = self.wlasciciele[0]
+        elif self.wlasciciele:
+            info[keys[-1]] = list(self.wlasciciele)
+        return info
+
+    def row(self) -> Dict:
+        """Płaski wiersz do CSV (właściciele rozdzieleni średnikiem)"""
+        return {**self._asdict(), "wlasciciele": "; ".join(self.wlasciciele)}
+
+
+class SectionEntry(NamedTuple):
+    """
+    Wpis działu (działka, prawo, właściciel, wpis w dziale III, hipoteka)
+
+    Pola wpisu są trzymane jako krotka wartości i współdzielona krotka nazw,
+    bo zestaw pól zależy od rodzaju wpisu i od wydruku.
+    """
+    kw: Optional[str]
+    dzial: str
+    lista: str
+    names: Tuple[str, ...]
+    values: Tuple[Any, ...]
+
+    @classmethod
+    def from_dict(cls, kw: Optional[str], section: str, collection: str, entry: Dict) -> "SectionEntry":
+        names = _shared_names(tuple(entry))
+        values = tuple(
+            _category(value) if name in CATEGORY_FIELDS else value
+            for name, value in zip(names, entry.values())
+        )
+        return cls(kw, sys.intern(section), sys.intern(collection), names, values)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Wartość pola wpisu"""
+        try:
+            return self.values[self.names.index(name)]
+        except ValueError:
+            return default
+
+    def to_dict(self) -> Dict:
+        """Pola wpisu jako słownik (jak w wyniku SectionRowAssembler)"""
+        return dict(zip(self.names, self.values))
+
+    def row(self) -> Dict:
+        """Płaski wiersz do CSV (jak LandRegisterParser.to_rows)"""
+        return {"kw": self.kw, "dzial": self.dzial, "lista": self.lista, **self.to_dict()}
+
+
+class KWRecord(NamedTuple):
+    """Dane jednej księgi - podstawowe informacje i wpisy wszystkich działów"""
+    basic_info: BasicInfo
+    entries: Tuple[SectionEntry, ...] = ()
+    sections: Tuple[str, ...] = ()
+
+    @property
+    def kw(self) -> Optional[str]:
+        return self.basic_info.kw
+
+    @classmethod
+    def from_data(cls, kw: Optional[str], data: Dict) -> "KWRecord":
+        """Tworzy rekord ze słownika LandRegisterParser.parse_document / ScrapingResult.data"""
+        sections = tuple(key for key in SECTION_KEYS if key in data)
+        entries = tuple(
+            SectionEntry.from_dict(kw, section, collection, entry)
+            for section in sections
+            for collection, items in (data[section] or {}).items()
+            if isinstance(items, list)
+            for entry in items
+        )
+        return cls(BasicInfo.from_dict(kw, data.get("basic_info") or {}), entries, sections)
+
+    def to_dict(self) -> Dict:
+        """Słownik w układzie LandRegisterParser.parse_document (do JSON)"""
+        data = {"basic_info": self.basic_info.to_dict()}
+        for section in self.sections:
+            data[section] = empty_section(section)
+        for entry in self.entries:
+            data[entry.dzial].setdefault(entry.lista, []).append(entry.to_dict())
+        return data
+
+    def rows(self) -> List[Dict]:
+        """Płaskie wiersze wpisów do CSV"""
+        return [entry.row() for entry in self.entries]
+
+    def csv_rows(self) -> List[Dict]:
+        """
+        Wiersze CSV księgi - każdy wpis razem z podstawowymi informacjami
+
+        Kolumny podstawowych informacji mają przedrostek "ksiega_", bo wpisy
+        mają pola o tych samych nazwach (numer, polozenie). Księga bez wpisów
+        daje jeden wiersz z samymi podstawowymi informacjami.
+        """
+        basic = {"kw": self.kw}
+        basic.update((f"ksiega_{name}", value) for name, value in self.basic_info.row().items() if name != "kw")
+        return [{**basic, **entry.row()} for entry in self.entries] or [basic]
+
+
+class RecordBatch:
+    """
+    Paczka rekordów KW z konwersją do JSON, CSV i układu kolumnowego
+
+    Rekordy są krotkami (NamedTuple) ze współdzielonymi nazwami pól
+    i wartościami kategorii, więc duża paczka KW zajmuje ok. dwa razy mniej
+    pamięci niż te same dane w zagnieżdżonych słownikach
+    (benchmarks/bench_records.py).
+    """
+
+    def __init__(self, records: Iterable[KWRecord] = ()):
+        self.records: List[KWRecord] = list(records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[KWRecord]:
+        return iter(self.records)
+
+    def append(self, record: KWRecord):
+        self.records.append(record)
+
+    def add(self, kw: Optional[str], data: Dict):
+        """Dodaje dane KW w postaci słownika"""
+        self.records.append(KWRecord.from_data(kw, data))
+
+    def iter_entries(self) -> Iterator[SectionEntry]:
+        for record in self.records:
+            yield from record.entries
+
+    def to_dicts(self) -> List[Dict]:
+        """Rekordy jako słowniki do JSON (z numerem KW)"""
+        return [{"kw": record.kw, **record.to_dict()} for record in self.records]
+
+    def basic_info_rows(self) -> List[Dict]:
+        """Płaskie wiersze podstawowych informacji do CSV"""
+        return [record.basic_info.row() for record in self.records]
+
+    def entry_rows(self) -> List[Dict]:
+        """Płaskie wiersze wpisów wszystkich działów do CSV"""
+        return [entry.row() for entry in self.iter_entries()]
+
+    def basic_info_columns(self) -> Dict[str, List]:
+        """Podstawowe informacje w układzie kolumnowym (np. dla pyarrow.table / pandas)"""
+        columns = dict(zip(BasicInfo._fields, map(list, zip(*(r.basic_info for r in self.records)))))
+        return columns or {name: [] for name in BasicInfo._fields}
+
+    def entry_columns(self) -> Dict[str, List]:
+        """
+        Wpisy w układzie kolumnowym - kolumny kw, dzial, lista i suma pól
+        wszystkich wpisów (brakujące pola to None)
+        """
+        entries = list(self.iter_entries())
+        columns: Dict[str, List] = {
+            "kw": [entry.kw for entry in entries],
+            "dzial": [entry.dzial for entry in entries],
+            "lista": [entry.lista for entry in entries],
+        }
+        for index, entry in enumerate(entries):
+            for name, value in zip(entry.names, entry.values):
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = [None] * len(entries)
+                column[index] = value
+        return columns
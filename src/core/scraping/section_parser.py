@@ -0,0 +1,264 @@
+# src/core/scraping/section_parser.py
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import re
+import unicodedata
+
+# Tytuły działów na wydruku treści -> klucz działu (dłuższe prefiksy najpierw)
+SECTION_TITLES = (
+    ("DZIAŁ I-O", "dzial_1o"),
+    ("DZIAŁ I-SP", "dzial_1s"),
+    ("DZIAŁ IV", "dzial_4"),
+    ("DZIAŁ III", "dzial_3"),
+    ("DZIAŁ II", "dzial_2"),
+)
+
+# Klucze działów w kolejności na wydruku
+SECTION_KEYS = ("dzial_1o", "dzial_1s", "dzial_2", "dzial_3", "dzial_4")
+
+# Wartość pustego pola na wydruku
+EMPTY_VALUES = ("", "---", "-")
+
+
+def _to_float(value: str) -> Optional[float]:
+    """Liczba w zapisie polskim ("1 234,56", "100.000,00", "0,1234 HA") -> float"""
+    match = re.search(r"-?\d[\d\s.]*(?:,\d+)?", value)
+    if not match:
+        return None
+    number = re.sub(r"\s", "", match.group()).rstrip(".")
+    if "," in number or re.fullmatch(r"-?\d{1,3}(?:\.\d{3})+", number):
+        # Kropki to separatory tysięcy, przecinek - separator dziesiętny
+        number = number.replace(".", "").replace(",", ".")
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+def _slug(label: str) -> str:
+    """Nazwa pola bez polskich znaków, np. "Obręb ewidencyjny" -> "obreb_ewidencyjny" """
+    text = unicodedata.normalize("NFKD", label.replace("ł", "l").replace("Ł", "L"))
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return re.sub(r"[^a-z0-9]+", "_", text).strip("_")
+
+
+@dataclass(frozen=True)
+class EntryType:
+    """
+    Rodzaj wpisu w dziale
+
+    Attributes:
+        collection: Klucz listy wpisów w słowniku działu (np. "działki")
+        keywords: Fragmenty nazwy rubryki/podrubryki, po których rozpoznawany jest rodzaj
+        fields: Nazwa pola na wydruku -> (nazwa w wyniku, konwersja wartości).
+                Pola spoza listy trafiają do wyniku pod nazwą z _slug().
+        kind: Wartość pola "rodzaj_wpisu" (np. rodzaj właściciela)
+    """
+    collection: str
+    keywords: Tuple[str, ...] = ()
+    fields: Dict[str, Tuple[str, Optional[Callable[[str], object]]]] = field(default_factory=dict)
+    kind: Optional[str] = None
+
+
+_OWNER_FIELDS = {
+    "Lista wskazań udziałów w prawie": ("udzial", None),
+    "Imię pierwsze": ("imie", None),
+    "Imię drugie": ("imie_drugie", None),
+    "Nazwisko / pierwszy człon nazwiska złożonego": ("nazwisko", None),
+    "Drugi człon nazwiska złożonego": ("nazwisko_drugi_czlon", None),
+    "Imię ojca": ("imie_ojca", None),
+    "Imię matki": ("imie_matki", None),
+    "PESEL": ("pesel", None),
+    "Nazwa": ("nazwa", None),
+    "Siedziba": ("siedziba", None),
+    "REGON": ("regon", None),
+}
+
+# Rodzaje wpisów w działach - sprawdzane po kolei, ostatni bez słów kluczowych jest domyślny
+SECTION_ENTRY_TYPES: Dict[str, List[EntryType]] = {
+    "dzial_1o": [
+        EntryType("działki", ("działka",), {
+            "Identyfikator działki": ("identyfikator", None),
+            "Numer działki": ("numer", None),
+            "Obręb ewidencyjny": ("obreb", None),
+            "Położenie": ("polozenie", None),
+            "Sposób korzystania": ("sposob_korzystania", None),
+            "Obszar": ("obszar_ha", _to_float),
+        }),
+        EntryType("budynki", ("budynek",)),
+        EntryType("lokale", ("lokal",)),
+        EntryType("inne"),
+    ],
+    "dzial_1s": [
+        EntryType("spis_praw", (), {
+            "Rodzaj prawa": ("rodzaj", None),
+            "Treść prawa": ("tresc", None),
+            "Numer księgi": ("numer_ksiegi", None),
+        }),
+    ],
+    "dzial_2": [
+        EntryType("udziały", ("udział",), {
+            "Numer udziału w prawie": ("numer", None),
+            "Wielkość udziału": ("wielkosc", None),
+        }),
+        EntryType("właściciele", ("osoba fizyczna",), _OWNER_FIELDS, "osoba fizyczna"),
+        EntryType("właściciele", ("osoba prawna", "inna osoba"), _OWNER_FIELDS, "osoba prawna"),
+        EntryType("właściciele", ("skarb państwa",), _OWNER_FIELDS, "skarb państwa"),
+        EntryType("właściciele", ("samorząd",), _OWNER_FIELDS, "jednostka samorządu terytorialnego"),
+        EntryType("inne"),
+    ],
+    "dzial_3": [
+        EntryType("wzmianki", ("wzmianki",)),
+        EntryType("wpisy", (), {
+            "Numer wpisu": ("numer", None),
+            "Rodzaj wpisu": ("rodzaj", None),
+            "Treść wpisu": ("tresc", None),
+        }),
+    ],
+    "dzial_4": [
+        EntryType("wzmianki", ("wzmianki",)),
+        EntryType("hipoteki", (), {
+            "Numer hipoteki": ("numer", None),
+            "Rodzaj hipoteki": ("rodzaj", None),
+            "Suma": ("suma", _to_float),
+            "Waluta": ("waluta", None),
+            "Wierzytelność": ("wierzytelnosc", None),
+        }),
+    ],
+}
+
+
+def empty_section(section: str) -> Dict[str, List[Dict]]:
+    """Słownik działu bez wpisów - z pustymi listami wszystkich rodzajów wpisów"""
+    return {entry_type.collection: [] for entry_type in SECTION_ENTRY_TYPES.get(section, [])}
+
+
+def _entry_type(section: str, group: str) -> Optional[EntryType]:
+    """Rodzaj wpisu dla rubryki `group` w dziale `section`"""
+    types = SECTION_ENTRY_TYPES.get(section)
+    if not types:
+        return None
+    group = group.lower()
+    for entry_type in types:
+        if any(keyword in group for keyword in entry_type.keywords):
+            return entry_type
+    return types[-1] if not types[-1].keywords else None
+
+
+class SectionRowAssembler:
+    """
+    Składa wiersze tabel wydruku treści w wpisy działów - jednym przejściem
+
+    Przyjmuje kolejne wiersze jako listy tekstów komórek (z HtmlPage.rows(),
+    skryptu przeglądarki albo parsera strumieniowego) i na bieżąco układa je
+    w słowniki działów:
+
+        wiersz z jedną komórką "DZIAŁ ..."          -> początek działu
+        wiersz z jedną komórką "Rubryka/Podrubryka" -> początek wpisu danego rodzaju
+        wiersz z co najmniej dwiema komórkami       -> pole wpisu (nazwa, treść) z dwóch
+                                                       ostatnich komórek
+
+    Powtórzenie nazwy pola w bieżącym wpisie zaczyna kolejny wpis (np. kolejna
+    działka w tej samej podrubryce). Wpisy są płaskimi słownikami gotowymi do
+    zapisu w CSV i JSON.
+    """
+
+    def __init__(self, default_section: Optional[str] = None):
+        """
+        Args:
+            default_section: Dział wierszy przed pierwszym tytułem działu
+                             (strona pojedynczego działu może nie mieć tytułu)
+        """
+        self.sections: Dict[str, Dict[str, List[Dict]]] = {}
+        self._section = default_section
+        self._group = ""
+        self._entry_type: Optional[EntryType] = None
+        self._entry: Optional[Dict] = None
+        self._labels: set = set()
+        if default_section:
+            self._start_section(default_section)
+
+    def _start_section(self, section: str):
+        self._finish_entry()
+        self._section = section
+        self._group = ""
+        self._entry_type = _entry_type(section, "")
+        if section not in self.sections:
+            self.sections[section] = empty_section(section)
+
+    def _finish_entry(self):
+        """Dodaje bieżący wpis do listy jego rodzaju"""
+        if self._entry and self._entry_type:
+            self.sections[self._section].setdefault(self._entry_type.collection, []).append(self._entry)
+        self._entry = None
+        self._labels = set()
+
+    def _new_entry(self):
+        self._finish_entry()
+        self._entry = {"rubryka": self._group}
+        if self._entry_type and self._entry_type.kind:
+            self._entry["rodzaj_wpisu"] = self._entry_type.kind
+
+    def feed(self, cells: List[str]):
+        """Przetwarza jeden wiersz tabeli"""
+        if len(cells) == 1:
+            text = cells[0]
+            upper = text.upper()
+            for prefix, section in SECTION_TITLES:
+                if upper.startswith(prefix):
+                    self._start_section(section)
+                    return
+            if self._section and (upper.startswith("RUBRYKA") or upper.startswith("PODRUBRYKA")):
+                self._finish_entry()
+                self._group = text
+                self._entry_type = _entry_type(self._section, text)
+            return
+
+        if len(cells) < 2 or not self._section or self._entry_type is None:
+            return
+
+        label, value = cells[-2], cells[-1]
+        if not label:
+            return
+        if self._entry is None or label in self._labels:
+            self._new_entry()
+        self._labels.add(label)
+
+        name, convert = self._entry_type.fields.get(label, (None, None))
+        value = None if value in EMPTY_VALUES else value
+        if value is not None and convert:
+            value = convert(value)
+        self._entry[name or _slug(label)] = value
+
+    def feed_rows(self, rows: Iterable[List[str]]) -> "SectionRowAssembler":
+        """Przetwarza wszystkie wiersze"""
+        for cells in rows:
+            self.feed(cells)
+        return self
+
+    def finish(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """Kończy ostatni wpis i zwraca słowniki działów"""
+        self._finish_entry()
+        return self.sections
+
+
+def assemble_sections(rows: Iterable[List[str]], default_section: Optional[str] = None) -> Dict[str, Dict[str, List[Dict]]]:
+    """Składa wiersze w słowniki działów (jedno przejście)"""
+    return SectionRowAssembler(default_section).feed_rows(rows).finish()
+
+
+def flatten_sections(data: Dict, kw_number: Optional[str] = None) -> List[Dict]:
+    """
+    Zamienia dane KW na płaskie wiersze (jeden wpis działu - jeden wiersz) do CSV
+
+    Każdy wiersz ma kolumny kw, dzial i lista oraz pola wpisu.
+    """
+    rows = []
+    for section in SECTION_KEYS:
+        for collection, entries in (data.get(section) or {}).items():
+            if not isinstance(entries, list):
+                continue
+            for entry in entries:
+                rows.append({"kw": kw_number, "dzial": section, "lista": collection, **entry})
+    return rows
@@ -0,0 +1,307 @@
+# src/core/scraping/stream_parser.py
+
+from collections import deque
+from html.parser import HTMLParser
+from io import StringIO
+from pathlib import Path
+from typing import Deque, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .html_backends import available_backends, normalize_text
+from .section_parser import SectionRowAssembler
+
+# Wielkość porcji czytanej ze źródła strony
+CHUNK_SIZE = 64 * 1024
+
+# Źródło strony: tekst, ścieżka pliku, otwarty plik tekstowy albo porcje tekstu
+StreamSource = Union[str, Path, IO[str], Iterable[str]]
+
+_threshold: Optional[int] = None
+
+
+class StreamingPageParser(HTMLParser):
+    """
+    Parser strony treści KW oparty na zdarzeniach (bez budowy drzewa) - bez dodatkowych zależności
+
+    Zbiera teksty pól div.left i teksty komórek td kolejnych wierszy tr -
+    tak jak HtmlPage.texts("div", "left") i HtmlPage.rows() - i oddaje je
+    zaraz po zamknięciu elementu. W pamięci jest tylko bieżący wiersz,
+    więc zużycie pamięci nie zależy od wielkości strony.
+
+    Tekst elementu jest liczony przez normalize_text(), jak w HtmlPage.
+    Niezamknięte td i tr są zamykane jak
+    w parserach HTML - przez kolejną komórkę, kolejny wiersz lub koniec tabeli.
+    Wiersze są oddawane w kolejności dokumentu (otwarcia tr), jak w HtmlPage.rows():
+    wiersze tabeli zagnieżdżonej w komórce czekają na zamknięcie wiersza, który je zawiera.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events: List[Tuple[str, object]] = []
+        self._table_depth = 0
+        # Otwarte wiersze: [głębokość tabeli, komórki, fragmenty bieżącej komórki lub None, zamknięty]
+        self._rows: List[list] = []
+        # Wiersze w kolejności otwarcia, czekające na zamknięcie wierszy zewnętrznych
+        self._pending: Deque[list] = deque()
+        # Otwarte div: fragmenty tekstu dla div.left, None dla pozostałych
+        self._divs: List[Optional[List[str]]] = []
+        self._skip = 0
+        # Tekst między znacznikami - parser może go podzielić na granicy porcji
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs):
+        self._flush_text()
+        if tag == "tr":
+            if self._rows and self._rows[-1][0] == self._table_depth:
+                self._end_row()
+            row = [self._table_depth, [], None, False]
+            self._rows.append(row)
+            self._pending.append(row)
+        elif tag == "td":
+            if self._rows:
+                row = self._rows[-1]
+                self._end_cell(row)
+                row[2] = []
+        elif tag == "table":
+            self._table_depth += 1
+        elif tag == "div":
+            classes = (dict(attrs).get("class") or "").split()
+            self._divs.append([] if "left" in classes else None)
+        elif tag in ("script", "style"):
+            self._skip += 1
+
+    def handle_endtag(self, tag: str):
+        self._flush_text()
+        if tag == "tr":
+            if self._rows and self._rows[-1][0] == self._table_depth:
+                self._end_row()
+        elif tag == "td":
+            if self._rows:
+                self._end_cell(self._rows[-1])
+        elif tag == "table":
+            while self._rows and self._rows[-1][0] == self._table_depth:
+                self._end_row()
+            self._table_depth = max(self._table_depth - 1, 0)
+        elif tag == "div":
+            if self._divs:
+                parts = self._divs.pop()
+                if parts is not None:
+                    self.events.append(("text", normalize_text(parts)))
+        elif tag in ("script", "style"):
+            self._skip = max(self._skip - 1, 0)
+
+    def handle_data(self, data: str):
+        if not self._skip:
+            self._text.append(data)
+
+    def handle_comment(self, data: str):
+        self._flush_text()
+
+    def _flush_text(self):
+        """Przekazuje zebrany tekst do otwartych komórek i pól div.left"""
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text = []
+        if text.isspace():
+            return
+        # Tekst należy też do komórek i pól zewnętrznych (zagnieżdżone tabele i div)
+        for row in self._rows:
+            if row[2] is not None:
+                row[2].append(text)
+        for parts in self._divs:
+            if parts is not None:
+                parts.append(text)
+
+    def _end_cell(self, row: list):
+        if row[2] is not None:
+            row[1].append(normalize_text(row[2]))
+            row[2] = None
+
+    def _end_row(self):
+        row = self._rows.pop()
+        self._end_cell(row)
+        row[3] = True
+        while self._pending and self._pending[0][3]:
+            cells = self._pending.popleft()[1]
+            if cells:
+                self.events.append(("row", cells))
+
+    def close(self):
+        super().close()
+        self._flush_text()
+        while self._rows:
+            self._end_row()
+
+    def drain(self) -> List[Tuple[str, object]]:
+        """Zwraca i usuwa zdarzenia zebrane od ostatniego wywołania"""
+        events, self.events = self.events, []
+        return events
+
+
+def _iter_chunks(source: StreamSource, chunk_size: int) -> Iterator[str]:
+    """Porcje tekstu źródła (plik jest czytany porcjami, nie w całości)"""
+    if isinstance(source, Path):
+        with open(source, encoding="utf-8", errors="replace") as f:
+            yield from _iter_chunks(f, chunk_size)
+    elif isinstance(source, str):
+        yield from _iter_chunks(StringIO(source), chunk_size)
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from source
+
+
+def _iter_events_stdlib(chunks: Iterable[str]) -> Iterator[Tuple[str, object]]:
+    parser = StreamingPageParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.drain()
+    parser.close()
+    yield from parser.drain()
+
+
+def _iter_events_lxml(chunks: Iterable[str]) -> Iterator[Tuple[str, object]]:
+    """
+    Zdarzenia z lxml.etree.HTMLPullParser (libxml2, porcjami)
+
+    Drzewo jest budowane przyrostowo, ale każdy zamknięty element poza
+    otwartym wierszem i polem div.left jest od razu usuwany. libxml2 trzyma
+    jednak cały wczytany tekst strony, więc pamięć rośnie z wielkością strony
+    (ok. 1x źródła zamiast kilkunastu x dla pełnego drzewa).
+    """
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    open_fields = 0
+    # Wiersze w kolejności otwarcia ([komórki] po zamknięciu) i stos otwartych wierszy
+    pending: Deque[list] = deque()
+    open_rows: List[list] = []
+
+    def handle(events):
+        nonlocal open_fields
+        for event, element in events:
+            tag = element.tag
+            is_field = tag == "div" and "left" in (element.get("class") or "").split()
+            if event == "start":
+                if tag == "tr":
+                    slot = []
+                    pending.append(slot)
+                    open_rows.append(slot)
+                open_fields += is_field
+                continue
+
+            if tag in ("script", "style"):
+                # Tekst skryptów i stylów nie należy do treści elementów
+                element.text = None
+            elif tag == "tr":
+                open_rows.pop().append([normalize_text(cell.itertext()) for cell in element if cell.tag == "td"])
+                # Wiersz zagnieżdżony czeka na zamknięcie wiersza, który go zawiera
+                while pending and pending[0]:
+                    cells = pending.popleft()[0]
+                    if cells:
+                        yield "row", cells
+            elif is_field:
+                open_fields -= 1
+                yield "text", normalize_text(element.itertext())
+
+            if not open_rows and not open_fields:
+                element.clear(keep_tail=True)
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from handle(parser.read_events())
+    parser.close()
+    yield from handle(parser.read_events())
+
+
+def iter_events(
+    source: StreamSource,
+    chunk_size: int = CHUNK_SIZE,
+    backend: Optional[str] = None
+) -> Iterator[Tuple[str, object]]:
+    """
+    Zdarzenia strony oddawane w trakcie czytania
+
+    Args:
+        source: Tekst strony, ścieżka pliku (Path), plik tekstowy lub porcje tekstu
+        chunk_size: Wielkość czytanej porcji
+        backend: "html.parser" (pamięć niezależna od wielkości strony) albo "lxml"
+                 (kilka razy szybszy, pamięć ok. 1x strony). None - lxml dla tekstu
+                 strony, który i tak jest w pamięci (gdy lxml jest zainstalowany),
+                 html.parser dla plików i porcji
+
+    Returns:
+        Iterator par ("text", tekst pola div.left) i ("row", teksty komórek wiersza)
+    """
+    if backend is None:
+        in_memory = isinstance(source, str) and "lxml" in available_backends()
+        backend = "lxml" if in_memory else "html.parser"
+    chunks = _iter_chunks(source, chunk_size)
+    if backend == "lxml":
+        return _iter_events_lxml(chunks)
+    return _iter_events_stdlib(chunks)
+
+
+def iter_rows(source: StreamSource, chunk_size: int = CHUNK_SIZE) -> Iterator[List[str]]:
+    """Teksty komórek td kolejnych wierszy tr, oddawane w trakcie czytania strony"""
+    for kind, value in iter_events(source, chunk_size):
+        if kind == "row":
+            yield value
+
+
+def stream_document(
+    source: StreamSource,
+    default_section: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Tuple[List[str], Dict[str, Dict[str, List[Dict]]]]:
+    """
+    Parsuje stronę strumieniowo jednym przejściem
+
+    Wiersze trafiają do SectionRowAssembler od razu po przeczytaniu - w pamięci
+    są tylko bieżący wiersz i złożone już wpisy.
+
+    Returns:
+        (teksty pól div.left, słowniki działów)
+    """
+    texts = []
+    assembler = SectionRowAssembler(default_section)
+    for kind, value in iter_events(source, chunk_size):
+        if kind == "row":
+            assembler.feed(value)
+        else:
+            texts.append(value)
+    return texts, assembler.finish()
+
+
+def get_stream_threshold() -> int:
+    """
+    Zwraca wielkość strony (w znakach), od której parser zamiast drzewa używa parsowania strumieniowego
+
+    Konfiguracja:
+        stream_parse_threshold_mb - próg w MB (0 - zawsze drzewo strony)
+    """
+    global _threshold
+    if _threshold is None:
+        from src.config.config_manager import ConfigManager
+
+        megabytes = float(ConfigManager().get("stream_parse_threshold_mb", 2) or 0)
+        _threshold = int(megabytes * 1024 * 1024) if megabytes > 0 else 0
+    return _threshold
+
+
+def should_stream(html: object) -> bool:
+    """Czy źródło strony należy parsować strumieniowo (tekst lub plik Path powyżej progu)"""
+    threshold = get_stream_threshold()
+    if not threshold:
+        return False
+    if isinstance(html, Path):
+        return html.stat().st_size > threshold
+    return isinstance(html, str) and len(html) > threshold
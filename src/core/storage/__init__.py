@@ -3,5 +3,9 @@
 from .storage_interface import StorageInterface, StorageResult
 from .file_storage import FileStorage
 from .storage_manager import StorageManager
+from .dead_letter_store import DeadLetterStore
+from .download_index import DownloadIndex, get_download_index, enabled_extensions
+from .task_journal import TaskJournal, TaskState, get_task_journal
 
-__all__ = ['StorageInterface', 'StorageResult', 'FileStorage', 'StorageManager']
\ No newline at end of file
+__all__ = ['StorageInterface', 'StorageResult', 'FileStorage', 'StorageManager', 'DeadLetterStore', 'TaskJournal', 'TaskState',
+           'get_task_journal', 'DownloadIndex', 'get_download_index', 'enabled_extensions']
\ No newline at end of file
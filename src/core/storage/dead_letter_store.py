@@ -0,0 +1,90 @@
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.utils import logger
+from src.utils.file_lock import file_lock
+
+
+class DeadLetterStore:
+    """
+    Magazyn zadań, które ostatecznie się nie powiodły
+
+    Każde zadanie to jedna linia JSON w pliku (dopisywanie jest tanie).
+    replay() zwraca zapisane numery KW i opróżnia magazyn, żeby można je
+    było pobrać ponownie. Zapis, odczyt i przepisanie pliku w replay() odbywają
+    się pod blokadą pliku (dead_letter.lock), więc wpis dopisany przez inny
+    proces w trakcie replay() nie ginie.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or Path(__file__).parent.parent.parent / "config" / "dead_letter.jsonl")
+        self.lock_path = self.path.with_suffix(".lock")
+        self._lock = threading.Lock()
+
+    def add(self, kw_number: str, error_type: Optional[str], error: Optional[str], attempts: int):
+        """Dopisuje zadanie do magazynu"""
+        entry = {
+            "kw_number": kw_number,
+            "error_type": error_type,
+            "error": error,
+            "attempts": attempts,
+            "time": datetime.now().isoformat(timespec="seconds"),
+        }
+        try:
+            with self._lock, file_lock(self.lock_path), open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            logger.log_error(f"Błąd podczas zapisu do magazynu nieudanych zadań: {e}")
+
+    def read_all(self) -> List[Dict]:
+        """Zwraca wszystkie zapisane zadania"""
+        with self._lock, file_lock(self.lock_path):
+            return self._read_entries()
+
+    def _read_entries(self) -> List[Dict]:
+        """Odczytuje wpisy z pliku (wywoływane pod blokadą)"""
+        if not self.path.exists():
+            return []
+
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.log_error(f"Pominięto uszkodzony wpis magazynu nieudanych zadań: {line}")
+        return entries
+
+    def replay(self, error_types: Optional[List[str]] = None) -> List[str]:
+        """
+        Zwraca numery KW do ponownego pobrania i usuwa je z magazynu
+
+        Args:
+            error_types: Tylko zadania z tymi rodzajami błędów (None - wszystkie)
+        """
+        # Odczyt i przepisanie pod jedną blokadą - inaczej wpis dopisany pomiędzy by zginął
+        with self._lock, file_lock(self.lock_path):
+            entries = self._read_entries()
+            # Podział w jednym przejściu - porównywanie całych wpisów z listą byłoby O(n²)
+            selected, remaining = [], []
+            for entry in entries:
+                matches = error_types is None or entry.get("error_type") in error_types
+                (selected if matches else remaining).append(entry)
+
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in remaining:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            tmp_path.replace(self.path)
+
+        # Każdy numer tylko raz, w kolejności zapisu
+        return list(dict.fromkeys(e["kw_number"] for e in selected))
+
+    def __len__(self) -> int:
+        return len(self.read_all())
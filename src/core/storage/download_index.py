@@ -0,0 +1,121 @@
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.utils import logger
+
+# Opcja konfiguracji -> rozszerzenie zapisywanego pliku
+SAVE_FORMATS = {"save_pdf": ".pdf", "save_html": ".html", "save_json": ".json"}
+
+
+def enabled_extensions(config) -> Tuple[str, ...]:
+    """Rozszerzenia plików włączonych formatów zapisu (wartości opcji mogą być tekstem "true"/"false")"""
+    return tuple(ext for key, ext in SAVE_FORMATS.items() if str(config.get(key, False)).lower() == "true")
+
+
+class DownloadIndex:
+    """
+    Indeks pobranych plików w katalogu zapisu
+
+    Zamiast sprawdzać istnienie każdego pliku osobnym stat() (kosztowne na
+    dyskach sieciowych przy milionach plików), katalog jest listowany jeden
+    raz przy pierwszym użyciu, a dalej indeks jest aktualizowany po każdym
+    zapisie. Kluczem jest nazwa pliku bez rozszerzenia (numer KW z kropkami).
+    """
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+        self._files: Dict[str, Set[str]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """Listuje katalog przy pierwszym użyciu (wywoływane pod blokadą)"""
+        if self._loaded:
+            return
+
+        files: Dict[str, Set[str]] = {}
+        try:
+            with os.scandir(self.base_path) as entries:
+                for entry in entries:
+                    stem, dot, ext = entry.name.rpartition(".")
+                    if dot and entry.is_file():
+                        files.setdefault(stem, set()).add(f".{ext}")
+        except FileNotFoundError:
+            pass
+
+        self._files = files
+        self._loaded = True
+        logger.log_info(f"Zindeksowano {len(files)} pobranych KW w {self.base_path}")
+
+    def refresh(self):
+        """Ponownie listuje katalog (np. po zmianach wykonanych poza programem)"""
+        with self._lock:
+            self._loaded = False
+            self._ensure_loaded()
+
+    def contains(self, filename: str, extension: Optional[str] = None) -> bool:
+        """
+        Sprawdza, czy plik jest w indeksie
+
+        Args:
+            filename: Nazwa pliku bez rozszerzenia
+            extension: Rozszerzenie z kropką (None - dowolne)
+        """
+        with self._lock:
+            self._ensure_loaded()
+            extensions = self._files.get(filename)
+            if not extensions:
+                return False
+            return extension is None or extension in extensions
+
+    def add(self, filename: str, extension: str):
+        """Dodaje zapisany plik do indeksu"""
+        with self._lock:
+            if self._loaded:
+                self._files.setdefault(filename, set()).add(extension)
+
+    def filter_missing(
+        self,
+        kw_numbers: Iterable[str],
+        extensions: Iterable[str] = (),
+        key: Optional[Callable[[str], str]] = None
+    ) -> List[str]:
+        """
+        Zwraca numery KW, których pobranie nie jest kompletne
+
+        Args:
+            kw_numbers: Numery KW
+            extensions: Wymagane rozszerzenia z kropką - KW jest pominięty tylko
+                        wtedy, gdy są wszystkie (puste - wystarczy dowolny plik)
+            key: Zamiana numeru KW na numer, pod którym zapisywane są pliki
+                 (np. z poprawioną cyfrą kontrolną)
+        """
+        required = set(extensions)
+        missing = []
+        with self._lock:
+            self._ensure_loaded()
+            for kw in kw_numbers:
+                found = self._files.get((key(kw) if key else kw).replace("/", "."))
+                if not found or not required <= found:
+                    missing.append(kw)
+        return missing
+
+
+_indexes: Dict[Path, DownloadIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_download_index(base_path: Optional[Path] = None) -> DownloadIndex:
+    """Zwraca indeks katalogu współdzielony w procesie"""
+    if base_path is None:
+        from src.config.config_manager import ConfigManager
+
+        base_path = ConfigManager().get("save_path")
+
+    path = Path(base_path).resolve()
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = DownloadIndex(path)
+        return _indexes[path]
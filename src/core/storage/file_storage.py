@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 import pandas as pd
 
 from .storage_interface import StorageInterface, StorageResult
+from .download_index import get_download_index
 from src.utils import logger
 from src.config.config_manager import ConfigManager
 
@@ -16,6 +17,11 @@ class FileStorage(StorageInterface):
         self.config = ConfigManager()
         self.base_path = Path(self.config.get("save_path"))
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.index = get_download_index(self.base_path)
+
+    def _should_skip(self, filename: str, extension: str) -> bool:
+        """Czy pominąć zapis, bo plik już istnieje i włączono opcję pomijania"""
+        return self.config.get("already_exist", False) and self.index.contains(filename, extension)
 
     def save_pdf(self, data: bytes, filename: str) -> StorageResult:
         """
@@ -29,7 +35,7 @@ class FileStorage(StorageInterface):
             file_path = self.base_path / f"{filename}.pdf"
 
             # Jeśli plik istnieje i jest włączona opcja pomijania
-            if file_path.exists() and self.config.get("already_exist", False):
+            if self._should_skip(filename, ".pdf"):
                 return StorageResult(
                     True,
                     "Plik już istnieje, pominięto",
@@ -39,6 +45,7 @@ class FileStorage(StorageInterface):
             with open(file_path, "wb") as f:
                 f.write(data)
 
+            self.index.add(filename, ".pdf")
             logger.log_info(f"Zapisano PDF: {file_path}")
             return StorageResult(True, "Zapisano PDF", file_path)
 
@@ -51,7 +58,7 @@ class FileStorage(StorageInterface):
         try:
             file_path = self.base_path / f"{filename}.html"
 
-            if file_path.exists() and self.config.get("already_exist", False):
+            if self._should_skip(filename, ".html"):
                 return StorageResult(
                     True,
                     "Plik już istnieje, pominięto",
@@ -61,6 +68,7 @@ class FileStorage(StorageInterface):
             with open(file_path, "w", encoding="utf-8") as f:
                 f.write(content)
 
+            self.index.add(filename, ".html")
             logger.log_info(f"Zapisano HTML: {file_path}")
             return StorageResult(True, "Zapisano HTML", file_path)
 
@@ -73,7 +81,7 @@ class FileStorage(StorageInterface):
         try:
             file_path = self.base_path / f"{filename}.json"
 
-            if file_path.exists() and self.config.get("already_exist", False):
+            if self._should_skip(filename, ".json"):
                 return StorageResult(
                     True,
                     "Plik już istnieje, pominięto",
@@ -83,6 +91,7 @@ class FileStorage(StorageInterface):
             with open(file_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
 
+            self.index.add(filename, ".json")
             logger.log_info(f"Zapisano JSON: {file_path}")
             return StorageResult(True, "Zapisano JSON", file_path)
 
@@ -95,7 +104,7 @@ class FileStorage(StorageInterface):
         try:
             file_path = self.base_path / f"{filename}.csv"
 
-            if file_path.exists() and self.config.get("already_exist", False):
+            if self._should_skip(filename, ".csv"):
                 return StorageResult(
                     True,
                     "Plik już istnieje, pominięto",
@@ -111,6 +120,7 @@ class FileStorage(StorageInterface):
                 quoting=csv.QUOTE_ALL
             )
 
+            self.index.add(filename, ".csv")
             logger.log_info(f"Zapisano CSV: {file_path}")
             return StorageResult(True, "Zapisano CSV", file_path)
 
@@ -120,9 +130,7 @@ class FileStorage(StorageInterface):
 
     def file_exists(self, filename: str) -> bool:
         """Sprawdza czy plik istnieje"""
-        # Sprawdza wszystkie możliwe rozszerzenia
-        extensions = [".pdf", ".html", ".json", ".csv"]
-        return any((self.base_path / f"{filename}{ext}").exists() for ext in extensions)
+        return self.index.contains(filename)
 
     def get_file_path(self, filename: str) -> Path:
         """Zwraca pełną ścieżkę do pliku"""
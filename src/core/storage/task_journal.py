@@ -0,0 +1,242 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils import logger
+
+
+class TaskState:
+    """Stany numeru KW w dzienniku zadań"""
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    RETRY = "retry"
+    DONE = "done"
+    FAILED = "failed"
+
+    # Stany końcowe - KW w tych stanach nie są wznawiane
+    TERMINAL = (DONE, FAILED)
+
+
+class TaskJournal:
+    """
+    Trwały dziennik zadań w SQLite (tryb WAL)
+
+    Zapisuje listy zadań (joby) oraz stan każdego numeru KW, dzięki czemu
+    po awarii można wznowić pracę od miejsca przerwania. Zmiany stanów są
+    buforowane i zapisywane w paczkach (co `batch_size` zmian lub co
+    `flush_interval` sekund) jedną transakcją, więc koszt dziennika jest
+    pomijalny względem czasu pobrania KW.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            name TEXT,
+            type TEXT,
+            params TEXT,
+            created_at REAL,
+            finished_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS kw_tasks (
+            job_id TEXT NOT NULL,
+            kw_number TEXT NOT NULL,
+            state TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error_type TEXT,
+            error TEXT,
+            updated_at REAL,
+            PRIMARY KEY (job_id, kw_number)
+        );
+        CREATE INDEX IF NOT EXISTS kw_tasks_state ON kw_tasks (job_id, state);
+        CREATE INDEX IF NOT EXISTS kw_tasks_order ON kw_tasks (job_id);
+    """
+
+    def __init__(self, path: Optional[Path] = None, batch_size: int = 500, flush_interval: float = 1.0):
+        self.path = Path(path or Path(__file__).parent.parent.parent / "config" / "task_journal.db")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(self.SCHEMA)
+        self._connection.commit()
+
+        self._lock = threading.Lock()
+        self._buffer: List[Tuple] = []
+        self._stop_event = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    # --- Joby ---
+
+    def save_job(self, job_id: str, name: str = "", job_type: str = "list", params: Optional[Dict] = None):
+        """Zapisuje (lub aktualizuje) opis joba"""
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO jobs (job_id, name, type, params, created_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (job_id) DO UPDATE SET name = excluded.name, type = excluded.type, params = excluded.params
+                """,
+                (job_id, name, job_type, json.dumps(params or {}, ensure_ascii=False), time.time())
+            )
+            self._connection.commit()
+
+    def add_job(self, job_id: str, kw_numbers: List[str], name: str = "", job_type: str = "list",
+                params: Optional[Dict] = None):
+        """
+        Zapisuje joba razem z numerami KW w stanie "pending"
+
+        Numery już obecne w jobie nie są nadpisywane (ponowne dodanie tej
+        samej listy nie cofa postępu).
+        """
+        self.save_job(job_id, name, job_type, params)
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO kw_tasks (job_id, kw_number, state, updated_at) VALUES (?, ?, ?, ?)",
+                ((job_id, kw, TaskState.PENDING, now) for kw in kw_numbers)
+            )
+            self._connection.execute("UPDATE jobs SET finished_at = NULL WHERE job_id = ?", (job_id,))
+            self._connection.commit()
+
+    def finish_job(self, job_id: str):
+        """Oznacza joba jako zakończonego (nie będzie wznawiany)"""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET finished_at = ? WHERE job_id = ? AND finished_at IS NULL", (time.time(), job_id)
+            )
+            self._connection.commit()
+
+    def get_unfinished_jobs(self) -> Dict[str, Dict]:
+        """Zwraca niezakończone joby: job_id -> opis"""
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT job_id, name, type, params FROM jobs WHERE finished_at IS NULL ORDER BY created_at"
+            ).fetchall()
+        return {
+            job_id: {"name": name, "type": job_type, "params": json.loads(params or "{}")}
+            for job_id, name, job_type, params in rows
+        }
+
+    def iter_pending(self, job_id: str, chunk_size: int = 10000) -> Iterator[str]:
+        """
+        Zwraca (porcjami) numery KW joba, które nie są jeszcze w stanie końcowym
+
+        Numery są zwracane w kolejności dodania do joba (rowid), czyli w kolejności
+        listy podanej przez użytkownika.
+        """
+        self.flush()
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    """
+                    SELECT rowid, kw_number FROM kw_tasks
+                    WHERE job_id = ? AND rowid > ? AND state NOT IN (?, ?)
+                    ORDER BY rowid LIMIT ?
+                    """,
+                    (job_id, last, *TaskState.TERMINAL, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for _, kw_number in rows:
+                yield kw_number
+            last = rows[-1][0]
+
+    def get_job_counts(self, job_id: str) -> Dict[str, int]:
+        """Zwraca liczbę KW joba w poszczególnych stanach"""
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT state, COUNT(*) FROM kw_tasks WHERE job_id = ? GROUP BY state", (job_id,)
+            ).fetchall()
+        return dict(rows)
+
+    # --- Stany KW ---
+
+    def record(self, job_id: Optional[str], kw_number: str, state: str, attempts: int = 0,
+               error_type: Optional[str] = None, error: Optional[str] = None):
+        """Zapisuje zmianę stanu KW (buforowane)"""
+        if job_id is None:
+            return
+
+        with self._lock:
+            self._buffer.append((state, attempts, error_type, error, time.time(), job_id, kw_number))
+            full = len(self._buffer) >= self.batch_size
+
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Zapisuje zbuforowane zmiany jedną transakcją"""
+        with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+
+            try:
+                self._connection.executemany(
+                    """
+                    INSERT INTO kw_tasks (state, attempts, error_type, error, updated_at, job_id, kw_number)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (job_id, kw_number) DO UPDATE SET
+                        state = excluded.state, attempts = excluded.attempts,
+                        error_type = excluded.error_type, error = excluded.error,
+                        updated_at = excluded.updated_at
+                    """,
+                    batch
+                )
+                self._mark_finished_jobs({row[5] for row in batch})
+                self._connection.commit()
+            except sqlite3.Error as e:
+                self._connection.rollback()
+                self._buffer = batch + self._buffer
+                logger.log_error(f"Błąd zapisu dziennika zadań: {e}")
+
+    def _mark_finished_jobs(self, job_ids):
+        """Oznacza jako zakończone joby, w których wszystkie KW są w stanie końcowym"""
+        now = time.time()
+        for job_id in job_ids:
+            remaining = self._connection.execute(
+                "SELECT 1 FROM kw_tasks WHERE job_id = ? AND state NOT IN (?, ?) LIMIT 1",
+                (job_id, *TaskState.TERMINAL)
+            ).fetchone()
+            if remaining is None:
+                self._connection.execute(
+                    "UPDATE jobs SET finished_at = ? WHERE job_id = ? AND finished_at IS NULL", (now, job_id)
+                )
+
+    def _flush_loop(self):
+        """Okresowy zapis bufora w wątku tła"""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Zapisuje bufor i zamyka bazę"""
+        self._stop_event.set()
+        self._flusher.join()
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+
+_shared_journal: Optional[TaskJournal] = None
+_shared_lock = threading.Lock()
+
+
+def get_task_journal() -> TaskJournal:
+    """Zwraca dziennik zadań współdzielony w procesie"""
+    global _shared_journal
+
+    with _shared_lock:
+        if _shared_journal is None:
+            from src.config.config_manager import ConfigManager
+
+            path = ConfigManager().get("journal_path") or None
+            _shared_journal = TaskJournal(path)
+        return _shared_journal
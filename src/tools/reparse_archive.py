@@ -0,0 +1,299 @@
+"""
+Ponowne parsowanie zapisanych stron KW bez scrapowania.
+
+Przechodzi po katalogu z plikami .html zapisanymi przez FileStorage.save_html,
+parsuje je LandRegisterParser w puli procesów i zapisuje jeden zbiorczy plik
+JSON Lines albo katalog plików Parquet. W pamięci jest tylko ograniczona
+liczba paczek plików naraz, niezależnie od wielkości archiwum.
+
+Przetwarzanie można przerwać i wznowić - pliki obecne już w wyniku
+(pole "source") są pomijane, a niedokończona ostatnia linia JSONL jest
+obcinana. Pliki z błędem parsowania nie trafiają do wyniku, więc kolejne
+uruchomienie spróbuje ponownie.
+
+Z opcją --stream pliki są czytane porcjami i parsowane strumieniowo
+(LandRegisterParser.parse_stream) - pamięć procesu nie zależy od wielkości
+pojedynczej strony. Bez niej strumieniowo parsowane są tylko pliki większe
+niż próg stream_parse_threshold_mb.
+
+Uruchomienie (z katalogu głównego projektu):
+    python -m src.tools.reparse_archive pobrane/ --output kw.jsonl --workers 8
+    python -m src.tools.reparse_archive pobrane/ --output kw_parquet/ --format parquet
+    python -m src.tools.reparse_archive pobrane/ --output kw.jsonl --stream
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from src.core.scraping.data_parser import LandRegisterParser
+from src.core.scraping.section_parser import SECTION_KEYS
+from src.core.scraping.stream_parser import should_stream
+
+
+# Numer KW w polu "Numer" podstawowych informacji
+KW_NUMBER_PATTERN = re.compile(r"[A-Z0-9]{4}/\d{8}/\d")
+
+
+def _kw_number(data: Dict, path: Path) -> str:
+    """Numer KW z podstawowych informacji strony; nazwa pliku tylko, gdy strona go nie zawiera"""
+    match = KW_NUMBER_PATTERN.search(str(data.get("basic_info", {}).get("Numer") or ""))
+    return match.group() if match else path.stem.replace(".", "/")
+
+
+def parse_file(path: Path, backend: Optional[str] = None, stream: bool = False) -> Dict:
+    """Parsuje jeden zapisany plik - rekord z nazwą pliku, numerem KW i danymi"""
+    if stream or should_stream(path):
+        data = LandRegisterParser.parse_stream(path, SECTION_KEYS)
+    else:
+        html = path.read_text(encoding="utf-8", errors="replace")
+        data = LandRegisterParser.parse_document(LandRegisterParser.parse_page(html, backend), SECTION_KEYS)
+    return {
+        "source": path.name,
+        "kw": _kw_number(data, path),
+        **data,
+    }
+
+
+def _parse_batch(
+    paths: List[Path],
+    backend: Optional[str],
+    as_lines: bool,
+    stream: bool = False
+) -> Tuple[list, List[Tuple[str, str]], int]:
+    """
+    Parsuje paczkę plików w procesie roboczym
+
+    Returns:
+        (rekordy lub gotowe linie JSON, błędy (plik, komunikat), liczba bajtów)
+    """
+    results, errors, size = [], [], 0
+    for path in paths:
+        try:
+            size += path.stat().st_size
+            record = parse_file(path, backend, stream)
+            results.append(json.dumps(record, ensure_ascii=False) + "\n" if as_lines else record)
+        except Exception as e:
+            errors.append((path.name, str(e)))
+    return results, errors, size
+
+
+def iter_html_files(directory: Path) -> Iterator[Path]:
+    """Pliki .html katalogu (jedno listowanie, bez stat() na plik)"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".html") and entry.is_file():
+                yield Path(entry.path)
+
+
+class JsonLinesWriter:
+    """Zbiorczy plik JSON Lines dopisywany paczkami"""
+
+    as_lines = True
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def done_sources(self) -> Set[str]:
+        """Pliki obecne w wyniku; obcina niedokończoną ostatnią linię"""
+        if not self.path.exists():
+            return set()
+
+        done = set()
+        valid_size = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    done.add(json.loads(line)["source"])
+                except (ValueError, KeyError):
+                    break
+                valid_size += len(line)
+
+        if valid_size < self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_size)
+        return done
+
+    def write(self, lines: List[str]):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(lines))
+        self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class ParquetWriter:
+    """
+    Katalog plików Parquet (part-NNNNN.parquet) zapisywanych co `part_size` rekordów
+
+    Dane podstawowe i działy mają zmienną strukturę, więc są zapisywane jako
+    kolumny tekstowe z JSON; source i kw są zwykłymi kolumnami.
+    """
+
+    as_lines = False
+
+    def __init__(self, path: Path, part_size: int = 50_000):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Zapis Parquet wymaga pakietu pyarrow - zainstaluj: pip install pyarrow")
+
+        self.path = path
+        self.part_size = part_size
+        self._buffer: List[Dict] = []
+        self._parts = len(list(path.glob("part-*.parquet"))) if path.exists() else 0
+
+    def done_sources(self) -> Set[str]:
+        import pyarrow.parquet as pq
+
+        done = set()
+        for part in sorted(self.path.glob("part-*.parquet")) if self.path.exists() else []:
+            done.update(pq.read_table(part, columns=["source"]).column("source").to_pylist())
+        return done
+
+    def write(self, records: List[Dict]):
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.part_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = {
+            "source": [r["source"] for r in self._buffer],
+            "kw": [r["kw"] for r in self._buffer],
+        }
+        for key in ("basic_info",) + SECTION_KEYS:
+            columns[key] = [json.dumps(r.get(key), ensure_ascii=False) for r in self._buffer]
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._parts += 1
+        # Zapis do pliku tymczasowego - przerwany zapis nie zostawia uszkodzonej części
+        target = self.path / f"part-{self._parts:05d}.parquet"
+        tmp = target.with_suffix(".tmp")
+        pq.write_table(pa.table(columns), tmp)
+        tmp.replace(target)
+        self._buffer = []
+
+    def close(self):
+        self._flush()
+
+
+def reparse(
+    directory: Path,
+    writer,
+    workers: Optional[int] = None,
+    batch_size: int = 64,
+    backend: Optional[str] = None,
+    report_every: float = 5.0,
+    stream: bool = False
+) -> Dict:
+    """
+    Parsuje wszystkie pliki .html katalogu i zapisuje wyniki
+
+    Args:
+        directory: Katalog z zapisanymi stronami
+        writer: JsonLinesWriter lub ParquetWriter
+        workers: Liczba procesów (None - liczba rdzeni)
+        batch_size: Liczba plików w jednej paczce dla procesu
+        backend: Backend parsowania (None - z konfiguracji)
+        report_every: Co ile sekund wypisywać postęp
+        stream: Parsowanie strumieniowe (pamięć niezależna od wielkości strony)
+
+    Returns:
+        Podsumowanie: liczba plików, pominiętych, błędów, czas i pliki/s
+    """
+    done = writer.done_sources()
+    files = [path for path in iter_html_files(directory) if path.name not in done]
+    files.sort()
+    batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+    workers = workers or os.cpu_count() or 1
+    print(f"Do przetworzenia: {len(files)} plików ({len(done)} pominiętych - już w wyniku)")
+
+    processed = failed = total_bytes = 0
+    start = last_report = time.perf_counter()
+    # Ograniczona liczba paczek w toku - pamięć nie zależy od wielkości archiwum
+    max_pending = workers * 2
+    pending = set()
+    batch_iter = iter(batches)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(pending) < max_pending:
+                batch = next(batch_iter, None)
+                if batch is None:
+                    break
+                pending.add(executor.submit(_parse_batch, batch, backend, writer.as_lines, stream))
+            if not pending:
+                break
+
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results, errors, size = future.result()
+                writer.write(results)
+                processed += len(results)
+                failed += len(errors)
+                total_bytes += size
+                for name, message in errors:
+                    print(f"Błąd parsowania {name}: {message}", file=sys.stderr)
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                last_report = now
+                rate = (processed + failed) / (now - start)
+                print(f"{processed + failed}/{len(files)} plików, {rate:.0f} plików/s, błędy: {failed}")
+
+    writer.close()
+    elapsed = time.perf_counter() - start
+    summary = {
+        "files": processed,
+        "skipped": len(done),
+        "errors": failed,
+        "seconds": round(elapsed, 2),
+        "files_per_second": round((processed + failed) / elapsed, 1) if elapsed else None,
+        "mb_per_second": round(total_bytes / 1024 / 1024 / elapsed, 2) if elapsed else None,
+    }
+    print(
+        f"Gotowe: {processed} plików w {elapsed:.1f}s ({summary['files_per_second']} plików/s, "
+        f"{summary['mb_per_second']} MB/s), błędy: {failed}"
+    )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path, help="katalog z zapisanymi plikami .html")
+    parser.add_argument("--output", type=Path, required=True, help="plik .jsonl albo katalog Parquet")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--batch-size", type=int, default=64, help="liczba plików w paczce dla procesu")
+    parser.add_argument("--part-size", type=int, default=50_000, help="rekordów w jednym pliku Parquet")
+    parser.add_argument("--backend", choices=("selectolax", "lxml", "bs4"), default=None)
+    parser.add_argument("--stream", action="store_true", help="parsowanie strumieniowe bez drzewa strony")
+    args = parser.parse_args()
+
+    if args.format == "parquet":
+        writer = ParquetWriter(args.output, args.part_size)
+    else:
+        writer = JsonLinesWriter(args.output)
+    reparse(args.directory, writer, args.workers, args.batch_size, args.backend, stream=args.stream)
+
+
+if __name__ == "__main__":
+    main()
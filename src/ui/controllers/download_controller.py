@@ -4,6 +4,8 @@ from typing import List, Optional
 import flet as ft
 from dataclasses import dataclass
 import threading
+import time
+import uuid
 #kam
 from src.core.agent import WorkDistributor
 from src.utils import logger
@@ -14,7 +16,7 @@ class DownloadTask:
     """Reprezentacja zadania pobierania"""
     name: str
     path: str
-    type: str = "list"  # "list", "generator" lub "clipboard"
+    type: str = "list"  # "list", "generator", "clipboard" lub "resume" (przerwany job z dziennika)
     status: str = "pending"
     progress: float = 0
     message: str = "Oczekuje na rozpoczęcie"
@@ -22,12 +24,39 @@ class DownloadTask:
     # Dodajemy parametry dla generatora
     generator_params: dict = None
 
+    # Szeregowanie względem innych zadań (patrz TaskScheduler)
+    priority: int = 0
+    weight: float = 1.0
+    job_id: Optional[str] = None
+
 class DownloadController(BaseController):
     def __init__(self, page: ft.Page):
         super().__init__(page)
         self.tasks: List[DownloadTask] = []
         self.distributor = WorkDistributor()
         self.processing_thread: Optional[threading.Thread] = None
+        self._load_interrupted_tasks()
+
+    def _load_interrupted_tasks(self):
+        """Dodaje zadania przerwane w poprzedniej sesji (z dziennika zadań) - do wznowienia przyciskiem Rozpocznij"""
+        try:
+            jobs = self.distributor.get_interrupted_jobs()
+        except Exception as e:
+            logger.log_error(f"Nie udało się odczytać przerwanych zadań: {e}")
+            return
+
+        for job_id, job in jobs.items():
+            params = job.get("params", {})
+            self.tasks.append(DownloadTask(
+                name=job.get("name") or f"Przerwane zadanie {job_id[:8]}",
+                path="",
+                type="resume",
+                status="interrupted",
+                message=f"Przerwane - {job['pending']} KW do pobrania",
+                priority=params.get("priority", 0),
+                weight=params.get("weight", 1.0),
+                job_id=job_id
+            ))
 
     def add_file_task(self):
         """Dodaje zadanie z pliku"""
@@ -68,27 +97,93 @@ class DownloadController(BaseController):
 
     def remove_task(self, task: DownloadTask):
         """Usuwa zadanie"""
+        if task.type == "resume" and task.status == "interrupted":
+            # Przerwany job nie będzie już proponowany do wznowienia
+            self.distributor.cancel_job(task.job_id)
         if task in self.tasks:
             self.tasks.remove(task)
             self.update()
 
     def start_task(self, task: DownloadTask):
-        """Rozpoczyna wykonywanie zadania"""
+        """Rozpoczyna wykonywanie zadania w osobnym wątku"""
+        if task.status == "paused" and task.job_id:
+            self.distributor.resume_job(task.job_id)
+            task.status = "running"
+            self.update()
+            return
+
+        if task.status == "running":
+            return
+
+        if task.status == "stopped" or not task.job_id:
+            # Anulowany job nie przyjmuje już zadań - ponowne uruchomienie to nowy job
+            task.job_id = str(uuid.uuid4())
+        task.status = "running"
         if task.type == "generator":
-            self.process_generator_task(task)
+            target = self.process_generator_task
+        elif task.type == "resume":
+            target = self.process_resume_task
         else:
-            # Implementacja dla innych typów zadań
-            pass
+            target = self.process_list_task
+        threading.Thread(target=target, args=(task,), daemon=True).start()
 
     def stop_task(self, task: DownloadTask):
-        """Zatrzymuje wykonywanie zadania"""
-        # Implementacja zatrzymywania zadania
-        pass
+        """Zatrzymuje wykonywanie zadania (usuwa oczekujące numery KW)"""
+        # job_id jest nadawany przy starcie, więc anulowanie działa także przed dodaniem numerów KW
+        task.status = "stopped"
+        if task.job_id:
+            self.distributor.cancel_job(task.job_id)
+        self.update()
 
     def pause_task(self, task: DownloadTask):
         """Wstrzymuje wykonywanie zadania"""
-        # Implementacja wstrzymywania zadania
-        pass
+        if task.job_id:
+            self.distributor.pause_job(task.job_id)
+        task.status = "paused"
+        self.update()
+
+    def show_schedule_dialog(self, task: DownloadTask):
+        """Pokazuje dialog priorytetu i wagi zadania (szeregowanie względem innych zadań)"""
+        priority_input = ft.TextField(
+            label="Priorytet",
+            value=str(task.priority),
+            hint_text="wyższy - obsługiwane w pierwszej kolejności"
+        )
+        weight_input = ft.TextField(
+            label="Waga",
+            value=str(task.weight),
+            hint_text="udział w agentach przy równym priorytecie, np. 2"
+        )
+
+        def save_schedule(e):
+            try:
+                task.priority = int(priority_input.value or 0)
+                task.weight = max(float((weight_input.value or "1").replace(",", ".")), 0.01)
+            except ValueError:
+                weight_input.error_text = "Podaj liczbę"
+                self.page.update()
+                return
+
+            if task.job_id and task.status in ("running", "paused"):
+                self.distributor.set_job(task.job_id, task.weight, task.priority)
+            dlg.open = False
+            self.page.update()
+            self.update()
+
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Szeregowanie zadania"),
+            content=ft.Column(controls=[priority_input, weight_input], tight=True, spacing=10),
+            actions=[
+                ft.TextButton("Anuluj", on_click=lambda e: setattr(dlg, 'open', False)),
+                ft.TextButton("Zapisz", on_click=save_schedule),
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+
+        self.page.open(dlg)
+        dlg.open = True
+        self.page.update()
 
     def update(self):
         """Aktualizuje widok"""
@@ -225,31 +320,83 @@ class DownloadController(BaseController):
             task.progress = 0.5
             self.update()
 
-            # Rozpoczęcie pobierania
-            self.distributor.start_processing(kw_numbers)
+            self._download(task, kw_numbers, progress_offset=0.5)
 
-            # Monitorowanie postępu
-            total = len(kw_numbers)
-            while True:
-                progress = self.distributor.get_progress()
-                completed = progress["completed"] + progress["failed"]
+        except Exception as e:
+            task.status = "failed"
+            task.message = f"Błąd: {str(e)}"
+            logger.log_error(f"Błąd podczas przetwarzania zadania generatora: {e}")
 
-                task.progress = 0.5 + (completed / total) * 0.5
-                task.message = f"Przetworzono: {completed}/{total}"
-                self.update()
+        finally:
+            self.update()
+
+    def process_list_task(self, task: DownloadTask):
+        """Przetwarza zadanie z listy (plik lub schowek)"""
+        try:
+            with open(task.path, "r", encoding="utf-8") as file:
+                kw_numbers = [line.strip() for line in file if line.strip()]
+
+            self._download(task, kw_numbers)
+
+        except Exception as e:
+            task.status = "failed"
+            task.message = f"Błąd: {str(e)}"
+            logger.log_error(f"Błąd podczas przetwarzania listy {task.name}: {e}")
 
-                if completed == total:
-                    break
+        finally:
+            self.update()
 
-                time.sleep(1)
+    def process_resume_task(self, task: DownloadTask):
+        """Wznawia przerwany job z dziennika zadań - pobiera tylko nieprzetworzone numery KW"""
+        try:
+            if not self.distributor.resume(task.job_id):
+                task.status = "completed"
+                task.message = "Zakończono. Brak numerów KW do pobrania"
+                return
 
-            task.status = "completed"
-            task.message = f"Zakończono. Pobrano {progress['completed']}/{total} KW"
+            self.distributor.set_job(task.job_id, task.weight, task.priority)
+            self._monitor(task)
 
         except Exception as e:
             task.status = "failed"
             task.message = f"Błąd: {str(e)}"
-            logger.log_error(f"Błąd podczas przetwarzania zadania generatora: {e}")
+            logger.log_error(f"Błąd podczas wznawiania zadania {task.name}: {e}")
 
         finally:
             self.update()
+
+    def _download(self, task: DownloadTask, kw_numbers: List[str], progress_offset: float = 0):
+        """Przekazuje numery KW jako osobny job i monitoruje jego postęp"""
+        if task.status == "stopped":
+            return
+        task.job_id = task.job_id or str(uuid.uuid4())
+        self.distributor.start_processing(
+            kw_numbers,
+            job_id=task.job_id,
+            name=task.name,
+            weight=task.weight,
+            priority=task.priority
+        )
+        self._monitor(task, progress_offset)
+
+    def _monitor(self, task: DownloadTask, progress_offset: float = 0):
+        """Monitoruje postęp joba zadania do jego zakończenia lub zatrzymania"""
+        while True:
+            progress = self.distributor.get_job_progress(task.job_id)
+            if progress is None or task.status == "stopped":
+                return
+
+            total = progress["total"]
+            completed = progress["completed"] + progress["failed"]
+
+            task.progress = progress_offset + (completed / total if total else 1) * (1 - progress_offset)
+            task.message = f"Przetworzono: {completed}/{total}"
+            self.update()
+
+            if completed >= total:
+                break
+
+            time.sleep(1)
+
+        task.status = "completed"
+        task.message = f"Zakończono. Pobrano {progress['completed']}/{total} KW"
@@ -38,9 +38,10 @@ class SettingsController(BaseController):
             self.config.set("save_path", str(path))
             self.update()
 
-    def change_threads(self, value: int):
+    def change_threads(self, value):
         """Zmienia liczbę wątków"""
-        self.config.set("threads", value)
+        # Suwak przekazuje wartość jako tekst, np. "8.0"
+        self.config.set("threads", int(float(value)))
         self.update()
 
     def toggle_setting(self, key: str, value: bool):
@@ -12,7 +12,8 @@ class TaskCard(ft.Container):
         on_delete: Callable,
         on_start: Callable,
         on_stop: Callable,
-        on_pause: Callable
+        on_pause: Callable,
+        on_schedule: Optional[Callable] = None
     ):
         super().__init__()
 
@@ -48,6 +49,12 @@ class TaskCard(ft.Container):
                     tooltip="Zatrzymaj",
                     on_click=lambda _: on_stop()
                 ),
+                ft.IconButton(
+                    icon=ft.icons.TUNE,
+                    tooltip="Priorytet i waga",
+                    on_click=lambda _: on_schedule(),
+                    visible=on_schedule is not None
+                ),
                 ft.IconButton(
                     icon=ft.icons.DELETE_OUTLINE,
                     tooltip="Usuń",
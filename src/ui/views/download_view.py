@@ -94,7 +94,8 @@ class DownloadView(BaseView):
                 on_delete=lambda t=task: self.controller.remove_task(t),
                 on_start=lambda t=task: self.controller.start_task(t),
                 on_stop=lambda t=task: self.controller.stop_task(t),
-                on_pause=lambda t=task: self.controller.pause_task(t)
+                on_pause=lambda t=task: self.controller.pause_task(t),
+                on_schedule=lambda t=task: self.controller.show_schedule_dialog(t)
             )
             self.tasks_column.controls.append(card)  # Najpierw dodajemy do strony
             card.update_progress(task.progress, task.message)  # Potem aktualizujemy
@@ -129,10 +130,11 @@ class DownloadView(BaseView):
         for task in self.controller.tasks:
             card = TaskCard(
                 title=task.name,
-                on_delete=lambda: self.controller.remove_task(task),
-                on_start=lambda: self.controller.start_task(task),
-                on_stop=lambda: self.controller.stop_task(task),
-                on_pause=lambda: self.controller.pause_task(task)
+                on_delete=lambda t=task: self.controller.remove_task(t),
+                on_start=lambda t=task: self.controller.start_task(t),
+                on_stop=lambda t=task: self.controller.stop_task(t),
+                on_pause=lambda t=task: self.controller.pause_task(t),
+                on_schedule=lambda t=task: self.controller.show_schedule_dialog(t)
             )
             card.update_progress(task.progress, task.message)
             self.tasks_column.controls.append(card)
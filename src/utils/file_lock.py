@@ -0,0 +1,50 @@
+# src/utils/file_lock.py
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+import os
+
+
+def lock_file(file):
+    """Zakłada wyłączną blokadę na pliku (Windows i systemy uniksowe)"""
+    if os.name == "nt":
+        import msvcrt
+        file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    else:
+        import fcntl
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+
+def unlock_file(file):
+    """Zdejmuje blokadę założoną przez lock_file"""
+    if os.name == "nt":
+        import msvcrt
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Blokada międzyprocesowa na pliku blokady `path`
+
+    Chroni operacje, które muszą być niepodzielne dla wszystkich procesów
+    (np. odczyt i przepisanie pliku). Nie chroni przed wątkami tego samego
+    procesu na Windows - do tego potrzebna jest dodatkowo threading.Lock.
+    """
+    with open(path, "a+b") as lock:
+        lock_file(lock)
+        try:
+            yield
+        finally:
+            unlock_file(lock)
@@ -0,0 +1,77 @@
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence
+
+# Domyślne granice kubełków histogramu (w sekundach)
+DEFAULT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+class TimingHistogram:
+    """Histogram czasów (np. oczekiwania) bezpieczny dla wielu wątków"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Dodaje pomiar"""
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._count += 1
+            self._total += seconds
+            if seconds > self._max:
+                self._max = seconds
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Przybliżony percentyl - górna granica kubełka, w którym wypada"""
+        with self._lock:
+            if not self._count:
+                return None
+            rank = p / 100 * self._count
+            seen = 0
+            for i, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank and count:
+                    return self.buckets[i] if i < len(self.buckets) else self._max
+            return self._max
+
+    def snapshot(self) -> Dict:
+        """Zwraca stan histogramu jako słownik"""
+        labels: List[str] = [f"<={b}s" for b in self.buckets] + [f">{self.buckets[-1]}s"]
+        with self._lock:
+            count, total, maximum = self._count, self._total, self._max
+            counts = dict(zip(labels, self._counts))
+
+        return {
+            "count": count,
+            "total": round(total, 4),
+            "avg": round(total / count, 4) if count else None,
+            "max": round(maximum, 4),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "buckets": counts,
+        }
+
+    @classmethod
+    def merged(cls, snapshots: Sequence[Dict], buckets: Sequence[float] = DEFAULT_BUCKETS) -> Dict:
+        """Łączy snapshoty histogramów o tych samych granicach (np. z kilku procesów) w jeden"""
+        histogram = cls(buckets)
+        for snapshot in snapshots:
+            for i, count in enumerate(snapshot["buckets"].values()):
+                histogram._counts[i] += count
+            histogram._count += snapshot["count"]
+            histogram._total += snapshot["total"]
+            histogram._max = max(histogram._max, snapshot["max"])
+        return histogram.snapshot()
+
+    def reset(self):
+        """Zeruje histogram"""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._count = 0
+            self._total = 0.0
+            self._max = 0.0
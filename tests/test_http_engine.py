@@ -0,0 +1,130 @@
+"""
+Silnik HTTP (HttpScrapingEngine) na lokalnym serwerze z nagranymi stronami
+eKW (benchmarks/ekw_standin_server.py).
+"""
+
+from pathlib import Path
+
+import pytest
+
+from ekw_sample_pages import sample_page
+from ekw_standin_server import SECTION_FILES, serve
+from src.core.scraping import FailureType
+from src.core.scraping.data_parser import LandRegisterParser
+from src.core.scraping.http_scraper import ContentUnavailableError, HttpScrapingEngine
+from src.core.scraping.land_register_scraper import LandRegisterScraper
+from src.core.scraping.proxy_pool import ProxyPool
+
+pytest.importorskip("aiohttp")
+
+KW_NUMBER = "WA1M/00012345/1"
+MISSING_KW_NUMBER = "WA1M/00099999/3"
+
+SEARCH_PAGE = """<html><body><form method="post" action="wyszukiwanieKW">
+<input type="hidden" name="token" value="abc">
+<input id="kodWydzialuInput" name="kodWydzialu">
+<input id="numerKsiegiWieczystej" name="numerKw">
+<input id="cyfraKontrolna" name="cyfraKontrolna">
+<button id="wyszukaj" name="wyszukaj" value="Wyszukaj">Wyszukaj</button>
+</form></body></html>"""
+
+RESULT_PAGE = """<html><body>
+<div class="left">{kw}</div><div class="left">NIERUCHOMOŚĆ GRUNTOWA</div><div class="left">WARSZAWA</div>
+<form method="post" action="wynik"><input type="submit" name="przyciskWydrukZwykly" value="Przeglądanie aktualnej treści KW"></form>
+</body></html>"""
+
+CONTENT_PAGE = """<html><body><form method="post" action="tresc">
+<input type="hidden" name="token" value="abc">{buttons}
+</form></body></html>"""
+
+SECTIONS = {file.removesuffix(".html"): label for label, file in SECTION_FILES.items()}
+
+
+def _section_page(key: str) -> str:
+    return sample_page(2, seed=sum(map(ord, key)))
+
+
+@pytest.fixture(scope="module")
+def recordings(tmp_path_factory) -> Path:
+    """Katalog nagranych stron w układzie ekw_standin_server dla jednej KW"""
+    path = tmp_path_factory.mktemp("nagrania")
+    (path / "wyszukiwanie.html").write_text(SEARCH_PAGE, encoding="utf-8")
+
+    kw_dir = path / KW_NUMBER.replace("/", ".")
+    kw_dir.mkdir()
+    (kw_dir / "wynik.html").write_text(RESULT_PAGE.format(kw=KW_NUMBER), encoding="utf-8")
+    buttons = "".join(f'<input type="submit" name="dzial" value="{label}">' for label in SECTIONS.values())
+    (kw_dir / "tresc.html").write_text(CONTENT_PAGE.format(buttons=buttons), encoding="utf-8")
+    for key in SECTIONS:
+        (kw_dir / f"{key}.html").write_text(_section_page(key), encoding="utf-8")
+    return path
+
+
+@pytest.fixture(scope="module")
+def server(recordings):
+    server = serve(recordings)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def engine(server):
+    engine = HttpScrapingEngine(base_url=server.base_url, max_connections=10, max_concurrency=10)
+    engine.rate_limiter = None
+    engine.proxy_pool = None
+    yield engine
+    engine.close()
+
+
+def test_scrape_register_returns_recorded_data(engine):
+    data, page_source = engine.scrape_register(KW_NUMBER, SECTIONS)
+
+    assert data["basic_info"] == LandRegisterParser.parse_basic_info(RESULT_PAGE.format(kw=KW_NUMBER))
+    for key in SECTIONS:
+        assert data[key] == LandRegisterParser.parse_section(key, _section_page(key))
+    assert data["dzial_4"]["hipoteki"]
+    assert page_source == _section_page("dzial_4")
+
+
+def test_missing_register_raises_content_unavailable(engine):
+    with pytest.raises(ContentUnavailableError):
+        engine.scrape_register(MISSING_KW_NUMBER, SECTIONS)
+
+
+def test_scraper_maps_missing_register_to_no_content(engine, tmp_path):
+    scraper = LandRegisterScraper()
+    scraper.engine = "http"
+    scraper.config = {**{key: True for key in SECTIONS}, "save_path": str(tmp_path)}
+    scraper._http_engine = engine
+
+    result = scraper.scrape_register(MISSING_KW_NUMBER)
+    assert not result.success
+    assert result.error_type == FailureType.NO_CONTENT
+
+    result = scraper.scrape_register(KW_NUMBER)
+    assert result.success, result.message
+
+
+def test_requests_go_through_proxy_and_results_are_reported(engine, server):
+    # Serwer zastępczy nie patrzy na ścieżkę zapytania, więc obsłuży też zapytania jako proxy.
+    # Adres strony jest nieosiągalny bez proxy (domena .invalid).
+    host, port = server.server_address[:2]
+    proxy = f"{host}:{port}"
+    engine.proxy_pool = ProxyPool([proxy])
+    engine.base_url = "http://ekw.invalid/eukw_prz/KsiegiWieczyste/wyszukiwanieKW"
+
+    data, _ = engine.scrape_register(KW_NUMBER, SECTIONS)
+
+    assert data["dzial_4"]["hipoteki"]
+    assert engine.proxy_pool.get_stats()[proxy]["requests"] == 1
+
+
+def test_failing_proxy_is_reported(engine):
+    engine.proxy_pool = ProxyPool(["127.0.0.1:1"])
+
+    with pytest.raises(Exception):
+        engine.scrape_register(KW_NUMBER, SECTIONS)
+
+    stats = engine.proxy_pool.get_stats()["127.0.0.1:1"]
+    assert stats["requests"] == 1
+    assert stats["failures"] == 1
@@ -0,0 +1,32 @@
+"""Wiersze CSV księgi (KWRecord.csv_rows) - wpisy razem z podstawowymi informacjami."""
+
+from ekw_sample_pages import sample_page
+from src.core.scraping.data_parser import LandRegisterParser
+from src.core.scraping.records import BasicInfo, KWRecord
+from src.core.scraping.section_parser import SECTION_KEYS
+
+KW = "WA1M/00012345/1"
+
+
+def _document() -> dict:
+    return LandRegisterParser.parse_document(LandRegisterParser.parse_page(sample_page(2)), SECTION_KEYS)
+
+
+def test_every_entry_row_carries_basic_info():
+    record = KWRecord.from_data(KW, _document())
+    rows = record.csv_rows()
+
+    assert len(rows) == len(record.entries) > 0
+    for row, entry_row in zip(rows, record.rows()):
+        assert row["ksiega_numer"] == "WA1M/00012345/6"
+        assert row["ksiega_wlasciciele"] == "JAN KOWALSKI"
+        # Pola wpisu o nazwach pól podstawowych informacji (numer, polozenie) nie są nadpisywane
+        assert {key: row[key] for key in entry_row} == entry_row
+
+
+def test_record_without_entries_gives_basic_info_row():
+    record = KWRecord.from_data(KW, {"basic_info": _document()["basic_info"]})
+
+    rows = record.csv_rows()
+    assert len(rows) == 1
+    assert set(rows[0]) == {"kw"} | {f"ksiega_{name}" for name in BasicInfo._fields if name != "kw"}
@@ -0,0 +1,239 @@
+"""
+Nagrywanie sesji przeglądarki (RecordingAdapter) i odtwarzanie jej przez
+LandRegisterScraper (ReplayAdapter) bez przeglądarki i sieci.
+"""
+
+from typing import Any, Callable, List
+
+import lxml.html
+import pytest
+
+from ekw_sample_pages import sample_page
+from src.core.drivers import FixtureStore, RecordingAdapter, ReplayAdapter, WebDriverAdapter
+from src.core.scraping.data_parser import LandRegisterParser
+from src.core.scraping.html_backends import available_backends, parse_html
+from src.core.scraping.land_register_scraper import LandRegisterScraper
+
+KW_NUMBERS = ["WA1M/00012345/1", "WA1M/00054321/3"]
+
+FORM_PAGE = """<html><body><form>
+<input id="kodWydzialuInput"><input id="numerKsiegiWieczystej"><input id="cyfraKontrolna">
+<button id="wyszukaj">Wyszukaj</button>
+</form></body></html>"""
+
+SECTION_BUTTONS = "".join(
+    f'<input type="submit" value="{label}">' for label in LandRegisterScraper.SECTIONS.values()
+)
+
+
+def _content_page(kw_number: str, section: str = "") -> str:
+    """Strona treści KW z przyciskami działów (`section` - etykieta otwartego działu)"""
+    seed = sum(map(ord, kw_number))
+    return sample_page(3, seed).replace(
+        "<body>",
+        f'<body><p>{kw_number} {section}</p><input name="przyciskWydrukZwykly">{SECTION_BUTTONS}',
+        1,
+    )
+
+
+class _FakeElement:
+    def __init__(self, browser: "FakeEkwBrowser", element):
+        self.browser = browser
+        self.element = element
+        self.generation = browser.generation
+
+    @property
+    def text(self) -> str:
+        return self.element.text_content()
+
+    def get_attribute(self, name: str):
+        return self.element.get(name)
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def clear(self):
+        self.browser.inputs[self.element.get("id")] = ""
+
+    def send_keys(self, value: str):
+        key = self.element.get("id")
+        self.browser.inputs[key] = self.browser.inputs.get(key, "") + value
+
+    def click(self):
+        self.browser.click(self.element)
+
+
+class FakeEkwBrowser(WebDriverAdapter):
+    """Przeglądarka w pamięci udająca formularz wyszukiwania i treść KW w eKW"""
+
+    def __init__(self):
+        self.history: List[tuple] = []
+        self.url = "about:blank"
+        self.html = "<html></html>"
+        self.generation = 0
+        self.inputs = {}
+        self.source_reads = 0
+
+    def _load(self, url: str, html: str):
+        self.history.append((self.url, self.html))
+        self.url, self.html = url, html
+        self.generation += 1
+        self.inputs = {}
+
+    def click(self, element):
+        if element.get("id") == "wyszukaj":
+            kw_number = "/".join(self.inputs.get(key, "") for key in (
+                "kodWydzialuInput", "numerKsiegiWieczystej", "cyfraKontrolna"
+            ))
+            self._load(f"{LandRegisterScraper.BASE_URL}/tresc?kw={kw_number}", _content_page(kw_number))
+        else:
+            label = element.get("value")
+            kw_number = self.url.split("kw=")[1].split("&")[0]
+            self._load(f"{LandRegisterScraper.BASE_URL}/tresc?kw={kw_number}&dzial={label}", _content_page(kw_number, label))
+
+    def initialize(self, options) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+    def get(self, url: str) -> None:
+        self._load(url, FORM_PAGE)
+
+    def find_element(self, by: str, value: str, timeout: int = 10) -> Any:
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise TimeoutError(f"Brak elementu {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by: str, value: str) -> list:
+        xpath = {"ID": f"//*[@id='{value}']", "NAME": f"//*[@name='{value}']"}.get(by, value)
+        return [_FakeElement(self, element) for element in lxml.html.document_fromstring(self.html).xpath(xpath)]
+
+    def get_page_source(self) -> str:
+        self.source_reads += 1
+        return self.html
+
+    def save_screenshot(self, filename: str) -> None:
+        pass
+
+    def execute_script(self, script: str, *args) -> Any:
+        if script == LandRegisterScraper.EXTRACT_SCRIPT:
+            page = parse_html(self.html, "lxml")
+            return {"basic_info": page.texts("div", "left"), "rows": page.rows()}
+        if script == "return document.readyState":
+            return "complete"
+        if script.startswith("window.history.go"):
+            for _ in range(-args[0]):
+                self.url, self.html = self.history.pop()
+            self.generation += 1
+            return None
+        raise NotImplementedError(script)
+
+    def back(self) -> None:
+        self.execute_script("window.history.go(arguments[0])", -1)
+
+    def get_current_url(self) -> str:
+        return self.url
+
+    def wait_until(self, condition: Callable[[], Any], timeout: float) -> Any:
+        # Strona "ładuje się" dopiero przy drugim sprawdzeniu warunku
+        condition()
+        result = condition()
+        if not result:
+            raise TimeoutError("Warunek niespełniony")
+        return result
+
+    def is_stale(self, element: Any) -> bool:
+        return element.generation != self.generation
+
+
+def _scraper(driver: WebDriverAdapter, tmp_path) -> LandRegisterScraper:
+    scraper = LandRegisterScraper()
+    scraper.config = {**{key: True for key in LandRegisterScraper.SECTIONS}, "save_path": str(tmp_path)}
+    scraper.same_window = True
+    scraper.parallel_sections = False
+    scraper.rate_limiter = None
+    scraper.proxy_pool = None
+    scraper.driver = driver
+    return scraper
+
+
+def _expected(kw_number: str, backend: str = "lxml") -> dict:
+    page = LandRegisterParser.parse_page(_content_page(kw_number), backend)
+    data = {"basic_info": LandRegisterParser.parse_basic_info(page)}
+    for key in LandRegisterScraper.SECTIONS:
+        data[key] = LandRegisterParser.parse_section(key, page)
+    return data
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Katalog z sesją nagraną na FakeEkwBrowser i liczba pobrań źródła strony"""
+    fixture_path = tmp_path / "nagranie"
+    browser = FakeEkwBrowser()
+    scraper = _scraper(RecordingAdapter(browser, FixtureStore(fixture_path)), tmp_path)
+
+    results = [scraper.scrape_register(kw_number) for kw_number in KW_NUMBERS]
+    scraper.close()
+
+    assert all(result.success for result in results), [result.message for result in results]
+    return fixture_path, results, browser
+
+
+def test_recorded_session_replays_through_scraper(recording, tmp_path):
+    fixture_path, recorded, _ = recording
+    scraper = _scraper(ReplayAdapter(FixtureStore(fixture_path)), tmp_path)
+
+    for kw_number, recorded_result in zip(KW_NUMBERS, recorded):
+        result = scraper.scrape_register(kw_number)
+        assert result.success, result.message
+        assert result.data == recorded_result.data == _expected(kw_number)
+        assert result.data["dzial_4"]["hipoteki"]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_replayed_data_matches_every_parser_backend(recording, tmp_path, backend):
+    fixture_path, _, _ = recording
+    scraper = _scraper(ReplayAdapter(FixtureStore(fixture_path)), tmp_path)
+
+    for kw_number in KW_NUMBERS:
+        assert scraper.scrape_register(kw_number).data == _expected(kw_number, backend)
+
+
+def test_replay_raises_for_unrecorded_number(recording, tmp_path):
+    fixture_path, _, _ = recording
+    scraper = _scraper(ReplayAdapter(FixtureStore(fixture_path)), tmp_path)
+
+    result = scraper.scrape_register("WA1M/00099999/3")
+    assert not result.success
+    assert "Brak nagrania" in result.message
+
+
+def test_recording_reads_page_source_once_per_navigation(recording):
+    fixture_path, _, browser = recording
+    # Nawigacje: formularz, po jednej KW wynik i pięć działów, powrót do formularza
+    navigations = 1 + len(KW_NUMBERS) * (1 + len(LandRegisterScraper.SECTIONS)) + (len(KW_NUMBERS) - 1)
+    assert browser.source_reads <= navigations
+    assert len(FixtureStore(fixture_path).states) == navigations - (len(KW_NUMBERS) - 1)
+
+
+def test_consecutive_back_calls_walk_back_through_history(recording):
+    fixture_path, _, _ = recording
+    driver = ReplayAdapter(FixtureStore(fixture_path))
+
+    driver.get(LandRegisterScraper.BASE_URL)
+    for element_id, value in zip(("kodWydzialuInput", "numerKsiegiWieczystej", "cyfraKontrolna"), KW_NUMBERS[0].split("/")):
+        element = driver.find_element("ID", element_id)
+        element.clear()
+        element.send_keys(value)
+    driver.find_element("ID", "wyszukaj").click()
+    result_url = driver.get_current_url()
+    driver.find_element("XPATH", "//input[@value='Dział I-O']").click()
+    assert "dzial=" in driver.get_current_url()
+
+    driver.back()
+    assert driver.get_current_url() == result_url
+    driver.back()
+    assert driver.get_current_url() == LandRegisterScraper.BASE_URL
+    assert driver.find_elements("ID", "kodWydzialuInput")
@@ -0,0 +1,17 @@
+import pytest
+
+from src.core.scraping.section_parser import _to_float
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1 234,56", 1234.56),
+    ("1\xa0234,56 PLN", 1234.56),
+    ("100.000,00", 100000.0),
+    ("1.234.567,89 PLN", 1234567.89),
+    ("100.000", 100000.0),
+    ("0,1234 HA", 0.1234),
+    ("12.5", 12.5),
+    ("---", None),
+])
+def test_to_float_polish_notation(value, expected):
+    assert _to_float(value) == expected
@@ -0,0 +1,138 @@
+"""
+Jeden sposób liczenia tekstu elementu we wszystkich backendach parsera,
+w parserze strumieniowym i w skryptach przeglądarki (EXTRACT_SCRIPT).
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from ekw_sample_pages import sample_page
+from src.core.scraping.html_backends import available_backends, normalize_text, parse_html
+from src.core.scraping.land_register_scraper import LandRegisterScraper
+from src.core.scraping.stream_parser import iter_events
+
+# Przypadki brzegowe: <br> między fragmentami, komentarze, &nbsp;, skrypty i zagnieżdżone znaczniki
+EDGE_PAGE = """<html><head><script>var ignored = 1;</script></head><body>
+<div class="left wide">ul. Polna<br>12 <!-- komentarz --> <b>lok.</b>
+   3<style>p { color: red }</style></div>
+<div class="left">WA1M/00012345/6</div>
+<table>
+<tr><td> 100&nbsp;000,00 <script>var x = 1;</script>PLN</td><td>JAN<span>KOWALSKI</span>  </td></tr>
+<tr><td>1.</td><td>Położenie</td><td>WOJ.\tMAZOWIECKIE,\n POW. WARSZAWA</td></tr>
+</table>
+</body></html>"""
+
+PAGES = {"sample": sample_page(10), "edge": EDGE_PAGE}
+
+# Minimalny DOM dla skryptów przeglądarki: węzły z childNodes/nodeType/nodeName
+# i querySelectorAll dla selektorów używanych w EXTRACT_SCRIPT
+NODE_RUNNER = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const build = (data, parent) => {
+    if (data.type !== 1) return {nodeType: data.type, nodeName: '#text', nodeValue: data.value, parentNode: parent};
+    const node = {nodeType: 1, nodeName: data.name.toUpperCase(), classes: data.classes, parentNode: parent};
+    node.childNodes = data.children.map(child => build(child, node));
+    node.querySelectorAll = selector => query(node, selector);
+    return node;
+};
+const descendants = node => node.childNodes.filter(n => n.nodeType === 1).flatMap(n => [n, ...descendants(n)]);
+const query = (node, selector) => {
+    if (selector === ':scope > td') return node.childNodes.filter(n => n.nodeName === 'TD');
+    const [name, cls] = selector.split('.');
+    return descendants(node).filter(n => n.nodeName === name.toUpperCase() && (!cls || n.classes.includes(cls)));
+};
+const document = build(input.tree, null);
+const run = new Function('document', input.script);
+process.stdout.write(JSON.stringify(run(document)));
+"""
+
+
+def _dom_json(element) -> dict:
+    """Drzewo lxml jako węzły DOM (tekst i tail jako osobne węzły tekstowe)"""
+    children = []
+    if element.text:
+        children.append({"type": 3, "value": element.text})
+    for child in element:
+        if isinstance(child.tag, str):
+            children.append(_dom_json(child))
+        else:
+            children.append({"type": 8, "value": child.text or ""})
+        if child.tail:
+            children.append({"type": 3, "value": child.tail})
+    return {
+        "type": 1,
+        "name": element.tag,
+        "classes": (element.get("class") or "").split(),
+        "children": children,
+    }
+
+
+def _expected(html: str):
+    page = parse_html(html, "bs4")
+    return page.texts("div", "left"), page.rows()
+
+
+def test_normalize_text_joins_fragments_with_space():
+    assert normalize_text(["ul. Polna", "12 ", "\n lok.\xa03 "]) == "ul. Polna 12 lok. 3"
+    assert normalize_text([]) == ""
+
+
+@pytest.mark.parametrize("page", PAGES)
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_match(page, backend):
+    html = PAGES[page]
+    result = parse_html(html, backend)
+    assert (result.texts("div", "left"), result.rows()) == _expected(html)
+
+
+@pytest.mark.parametrize("page", PAGES)
+@pytest.mark.parametrize("backend", ["html.parser", "lxml"])
+def test_stream_parser_matches(page, backend):
+    if backend == "lxml":
+        pytest.importorskip("lxml")
+    html = PAGES[page]
+    events = list(iter_events(html, chunk_size=7, backend=backend))
+    texts = [value for kind, value in events if kind == "text"]
+    rows = [value for kind, value in events if kind == "row"]
+    assert (texts, rows) == _expected(html)
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_extract_script_matches(page):
+    lxml_html = pytest.importorskip("lxml.html")
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("brak node.js")
+
+    html = PAGES[page]
+    payload = {
+        "tree": _dom_json(lxml_html.document_fromstring(html)),
+        "script": LandRegisterScraper.EXTRACT_SCRIPT,
+    }
+    output = subprocess.run(
+        [node, "-e", NODE_RUNNER],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output)
+    assert (result["basic_info"], result["rows"]) == tuple(map(list, _expected(html)))
+
+
+NESTED_PAGE = """<html><body><table>
+<tr><td>zewnętrzny</td><td><table><tr><td>wewnętrzny 1</td></tr><tr><td>wewnętrzny 2</td></tr></table></td></tr>
+<tr><td>kolejny</td></tr>
+</table></body></html>"""
+
+
+@pytest.mark.parametrize("backend", ["html.parser", "lxml"])
+def test_stream_parser_keeps_document_order_of_nested_rows(backend):
+    if backend == "lxml":
+        pytest.importorskip("lxml")
+    rows = [value for kind, value in iter_events(NESTED_PAGE, chunk_size=5, backend=backend) if kind == "row"]
+    assert rows == parse_html(NESTED_PAGE, "bs4").rows()
+    assert rows[0][0] == "zewnętrzny"